@@ -0,0 +1 @@
+"""Performance benchmarks for grade forecast (run with `python -m benchmarks`)."""
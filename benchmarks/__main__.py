@@ -0,0 +1,260 @@
+"""Time the hot paths of grade forecast on synthetic courses of increasing size.
+
+Usage:
+    python -m benchmarks                                  # run and save results
+    python -m benchmarks --compare out/benchmarks/x.json  # also fail on regressions
+
+Results are saved as JSON keyed by "<benchmark>[n=<tasks>]" so runs from
+different commits can be compared. A benchmark regresses when its median time
+exceeds the baseline's by more than --threshold (a fraction).
+"""
+
+import argparse
+import atexit
+from collections.abc import Callable
+import datetime as dt
+import json
+import os
+from pathlib import Path
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+from loguru import logger
+
+from gf.classes import Course
+from gf.classes.visualization import clear_render_cache
+from gf.config import PROJ_ROOT
+from gf.synthetic import make_synthetic_course
+
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000]
+OUTPUT_DIR = PROJ_ROOT / "out" / "benchmarks"
+
+# Minimum wall time spent per measurement, and number of measurements per benchmark
+MIN_MEASURE_SECONDS = 0.05
+REPEATS = 5
+# Most calls per measurement, for operations too fast to reach the minimum time
+MAX_MEASURE_CALLS = 1_000_000
+
+
+def measure(func: Callable[[], Any], setup: Callable[[], Any] | None = None) -> dict:
+    """Time a function, calling it enough times per measurement to be measurable.
+
+    Args:
+        func: The operation to time
+        setup: Called (untimed) before every call of func
+
+    Returns:
+        dict: Median and minimum seconds per call, and calls per measurement
+    """
+    number = 1
+    while True:
+        elapsed = _timed(func, setup, number)
+        if elapsed >= MIN_MEASURE_SECONDS or number >= MAX_MEASURE_CALLS:
+            break
+        number *= 10
+
+    samples = [elapsed / number] + [
+        _timed(func, setup, number) / number for _ in range(REPEATS - 1)
+    ]
+    return {"median_s": statistics.median(samples), "min_s": min(samples), "number": number}
+
+
+def _timed(func: Callable[[], Any], setup: Callable[[], Any] | None, number: int) -> float:
+    total = 0.0
+    for _ in range(number):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        total += time.perf_counter() - start
+    return total
+
+
+def model_benchmarks(course: Course) -> dict[str, Callable[[], Any]]:
+    """The model operations to time on a course."""
+    last_task = course.grading_groups[-1].tasks[-1]
+    return {
+        "get_grade": course.get_grade,
+        "get_current_grade": course.get_current_grade,
+        "get_expected_grade": course.get_expected_grade,
+        "get_letter_grade": course.get_letter_grade,
+        "get_task": lambda: course.get_task(last_task.name),
+        "get_parent": lambda: course.get_parent(last_task.name),
+        "Course.__str__": lambda: str(course),
+    }
+
+
+def plot_benchmarks(course: Course) -> dict[str, Callable[[], Any]]:
+    """The plotting operations to time on a course."""
+    # Imported here so runs that skip the plots don't pay for matplotlib
+    import matplotlib.pyplot as plt  # noqa: PLC0415
+
+    from gf.cli.plotting import plot_course_grade_vs_grade  # noqa: PLC0415
+
+    last_task = course.grading_groups[-1].tasks[-1]
+
+    def plot() -> None:
+        line = plot_course_grade_vs_grade(course, last_task.name)
+        plt.close(line.figure)
+
+    return {"plot_course_grade_vs_grade": plot}
+
+
+def cli_benchmarks(course: Course) -> dict[str, Callable[[], Any]]:
+    """The CLI commands to time, run against only the synthetic course.
+
+    Commands write to a throwaway ledger and run without the result cache, so
+    timing them never touches the user's grade history or cached results.
+    """
+    # Imported here since the CLI loads every course config
+    from typer.testing import CliRunner  # noqa: PLC0415
+
+    from gf.cli import main  # noqa: PLC0415
+
+    main.courses[:] = [course]
+    main.course_aliases.clear()
+    main.course_aliases[course.name] = "syn"
+    ledger_dir = Path(tempfile.mkdtemp(prefix="gf-benchmark-ledger-"))
+    atexit.register(shutil.rmtree, ledger_dir, ignore_errors=True)
+    main.LEDGER_DIR = ledger_dir  # Read by the commands when they run
+    runner = CliRunner(env={"GF_LEDGER_DIR": str(ledger_dir), "GF_NO_CACHE": "1"})
+    last_task = course.grading_groups[-1].tasks[-1].name
+
+    commands = {
+        "list": ["list"],
+        "summary": ["summary"],
+        "summary --format jsonl": ["summary", "--format", "jsonl"],
+        "course": ["course", "syn"],
+        "course --details": ["course", "syn", "--details"],
+        "tasks": ["tasks", "syn"],
+        "compare": ["compare", "syn"],
+        "report": ["report"],
+        "update": ["update", "syn", last_task, "90"],
+    }
+    return {
+        f"cli {name}": (lambda args=args: runner.invoke(main.app, args))
+        for name, args in commands.items()
+    }
+
+
+def run(sizes: list[int], *, include_cli: bool, max_slow_size: int) -> dict[str, dict]:
+    """Run every benchmark at every size.
+
+    Args:
+        sizes: Task counts of the synthetic courses
+        include_cli: Also time CLI commands
+        max_slow_size: Largest size to run the slow (plot, render, CLI) benchmarks at
+
+    Returns:
+        dict: Timing results keyed by "<benchmark>[n=<tasks>]"
+    """
+    slow = {"plot_course_grade_vs_grade", "Course.__str__"}
+    results = {}
+    for n in sizes:
+        course = make_synthetic_course(n)
+        benchmarks = model_benchmarks(course)
+        if include_cli and n <= max_slow_size:
+            try:
+                benchmarks.update(plot_benchmarks(course))
+                benchmarks.update(cli_benchmarks(course))
+            except ImportError as e:
+                logger.warning(f"Skipping plot and CLI benchmarks, gf.cli can't be imported: {e}")
+                include_cli = False
+
+        for name, func in benchmarks.items():
+            if n > max_slow_size and (name in slow or name.startswith("cli ")):
+                continue
+            # Rendering is cached by version, so time cold renders
+            setup = (
+                clear_render_cache if name == "Course.__str__" or name.startswith("cli ") else None
+            )
+            key = f"{name}[n={n}]"
+            results[key] = measure(func, setup)
+            logger.info(f"{key}: {results[key]['median_s'] * 1e3:.3f} ms")
+    return results
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[str]:
+    """List the benchmarks that got slower than the baseline by more than threshold."""
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        ratio = result["median_s"] / baseline[key]["median_s"]
+        if ratio > 1 + threshold:
+            regressions.append(f"{key}: {ratio:.2f}x slower")
+    return regressions
+
+
+def git_commit() -> str:
+    git = shutil.which("git")
+    if git is None:
+        return "unknown"
+    try:
+        return subprocess.check_output(  # noqa: S603 - a fixed git command
+            [git, "rev-parse", "--short", "HEAD"], cwd=PROJ_ROOT, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument(
+        "--output", type=Path, help="Results file (default: out/benchmarks/<commit>.json)"
+    )
+    parser.add_argument("--compare", type=Path, help="Baseline results file to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Allowed slowdown (0.2 = 20%%)"
+    )
+    parser.add_argument(
+        "--no-cli", action="store_true", help="Skip plotting and CLI command benchmarks"
+    )
+    parser.add_argument(
+        "--max-slow-size",
+        type=int,
+        default=10_000,
+        help="Largest size for plot, render and CLI benchmarks",
+    )
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = run(args.sizes, include_cli=not args.no_cli, max_slow_size=args.max_slow_size)
+    report = {
+        "meta": {
+            "commit": commit,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": dt.datetime.now(dt.UTC).isoformat(),
+        },
+        "results": results,
+    }
+
+    output = args.output or OUTPUT_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    logger.info(f"Saved results to {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            logger.error(regression)
+        if regressions:
+            sys.exit(1)
+        logger.info(f"No regressions beyond {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
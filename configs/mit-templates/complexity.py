@@ -105,6 +105,7 @@ complexity = Course(
             late_policy="No late days.",
             expected_grade=0.75,
             base_grade=0,
+            drop_lowest=1,
         ),
         GradingGroup(
             name="Midterm",
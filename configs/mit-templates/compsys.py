@@ -88,6 +88,7 @@ computer_systems = Course(
             late_policy="Lowest grade dropped",
             expected_grade=0.80,
             base_grade=0,
+            drop_lowest=1,
         ),
         GradingGroup(
             name="Design Project",
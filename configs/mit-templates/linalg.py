@@ -80,6 +80,7 @@ linear_algebra = Course(
             late_policy="6 free late days (max 3 per assignment), -50% per day after",
             expected_grade=0.85,
             base_grade=0,
+            drop_lowest=1,
         ),
         GradingGroup(
             name="Midterm 1",
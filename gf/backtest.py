@@ -0,0 +1,345 @@
+"""Backtests of grade forecasts against historical grade timelines.
+
+A backtest replays the grade events of a ledger (see gf.ledger) student by
+student. After each event, and once before the first one, it records the
+forecasts a student would have seen: the expected, min-work and current
+grades. It compares them with the student's final outcome, which is the
+grade once the last event is in (tasks never graded count as 0).
+
+Replays are vectorized. Each course's events become one grade matrix with
+a row per step, built by forward-filling every student's events in a
+single pass. The compiled plan (see gf.classes.compiled) then evaluates
+every step at once. Courses and chunks of students are replayed on a
+process pool. Metrics are kept as sums, so the chunks' results add up to
+the same report as a serial replay.
+
+Alongside the course-level errors, a backtest checks each grading group's
+``expected_grade`` assumptions against the grades the students actually
+got.
+"""
+
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from gf.classes import Course
+from gf.cohort import letter_grades
+from gf.ledger import GradeLedger
+
+# Forecasts recorded at every step
+FORECASTS = ("expected_grade", "min_work_grade", "current_grade")
+
+# Steps are binned by the fraction of the course's weight graded so far
+PROGRESS_BINS = 10
+
+# Expected grade forecasts are binned by value for calibration
+CALIBRATION_BINS = 10
+
+# Steps replayed at a time, bounding the size of the grade matrices
+BACKTEST_CHUNK_STEPS = 1 << 14
+
+
+@dataclass
+class Timeline:
+    """A course's grade events as columns, in timestamp order."""
+
+    course: Course
+    students: list[str] = field(default_factory=list)
+    student: list[int] = field(default_factory=list)  # Index into students
+    task: list[int] = field(default_factory=list)  # Position in the compiled plan
+    grade: list[float] = field(default_factory=list)  # NaN clears a grade
+
+
+@dataclass
+class CourseBacktest:
+    """Sums of forecast errors for one course.
+
+    Each error array holds (sum of errors, sum of absolute errors, sum of
+    squared errors), so results of different chunks of students add up.
+    """
+
+    course: Course
+    students: int
+    steps: np.ndarray  # (PROGRESS_BINS,) steps per progress bin
+    errors: np.ndarray  # (len(FORECASTS), PROGRESS_BINS, 3)
+    letter_hits: np.ndarray  # (len(FORECASTS), PROGRESS_BINS) forecasts with the final letter
+    calibration: np.ndarray  # (CALIBRATION_BINS, 3) steps, sum of forecasts, sum of outcomes
+    # Group -> (graded tasks, sum of grades, sum of errors, sum of absolute errors)
+    groups: dict[str, np.ndarray]
+
+    def __add__(self, other: "CourseBacktest") -> "CourseBacktest":
+        return CourseBacktest(
+            self.course,
+            self.students + other.students,
+            self.steps + other.steps,
+            self.errors + other.errors,
+            self.letter_hits + other.letter_hits,
+            self.calibration + other.calibration,
+            {name: self.groups[name] + other.groups[name] for name in self.groups},
+        )
+
+
+def load_timelines(
+    ledgers: Iterable[GradeLedger], courses: Sequence[Course]
+) -> tuple[dict[str, Timeline], dict[str, int]]:
+    """Read the grade events of courses from ledgers.
+
+    Args:
+        ledgers: Ledgers to read (students are told apart by ledger)
+        courses: Courses to replay; events of other courses are skipped
+
+    Returns:
+        tuple: Timelines by course name, and the number of events skipped per
+            unknown course or task name
+    """
+    plans = {course.name: course.compile() for course in courses}
+    timelines = {course.name: Timeline(course) for course in courses}
+    skipped: dict[str, int] = {}
+    for i, ledger in enumerate(ledgers):
+        ids: dict[tuple[str, str], int] = {}
+        for event in ledger.events():
+            plan = plans.get(event.course)
+            column = plan.index.get(event.task) if plan is not None else None
+            if column is None:
+                key = event.course if plan is None else f"{event.course}: {event.task}"
+                skipped[key] = skipped.get(key, 0) + 1
+                continue
+            timeline = timelines[event.course]
+            student = ids.get((event.course, event.student))
+            if student is None:
+                student = ids[event.course, event.student] = len(timeline.students)
+                timeline.students.append(f"{i}:{event.student}")
+            timeline.student.append(student)
+            timeline.task.append(column)
+            timeline.grade.append(np.nan if event.grade is None else event.grade)
+    return {name: timeline for name, timeline in timelines.items() if timeline.student}, skipped
+
+
+def replay_states(
+    n_tasks: int, student: np.ndarray, task: np.ndarray, grade: np.ndarray, n_students: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Grade matrix of every step of every student's timeline.
+
+    Args:
+        n_tasks: Number of tasks in the plan
+        student: Student of each event (0 to n_students - 1)
+        task: Plan position of each event's task
+        grade: Grade of each event (NaN clears a grade)
+        n_students: Number of students
+
+    Returns:
+        tuple: The (steps, tasks) grade matrix, with each student's steps in
+            order and a first step before any event, and each step's student
+    """
+    # Each student's events in order, after an empty first step
+    order = np.argsort(student, kind="stable")
+    counts = np.bincount(student, minlength=n_students)
+    starts = np.concatenate(([0], np.cumsum(counts + 1)[:-1]))
+    n_steps = len(student) + n_students
+    rows = np.empty(len(student), dtype=np.int64)
+    # An event's row is its position among the sorted events, shifted by one empty
+    # first step for its student and each student before it
+    rows[order] = np.arange(len(student)) + np.repeat(np.arange(1, n_students + 1), counts)
+    step_student = np.repeat(np.arange(n_students), counts + 1)
+
+    # Forward-fill: each cell takes the latest event for its task up to its step
+    last = np.full((n_steps, n_tasks), -1, dtype=np.int64)
+    last[rows, task] = rows
+    np.maximum.accumulate(last, axis=0, out=last)
+    values = np.full((n_steps, n_tasks), np.nan)
+    values[rows, task] = grade
+    # Events of earlier students don't carry over
+    carried = last >= starts[step_student][:, np.newaxis]
+    states = np.where(carried, values[np.maximum(last, 0), np.arange(n_tasks)], np.nan)
+    return states, step_student
+
+
+def backtest_students(
+    course: Course, student: np.ndarray, task: np.ndarray, grade: np.ndarray, n_students: int
+) -> CourseBacktest:
+    """Replay a group of students' timelines in one course and sum up the forecast errors."""
+    plan = course.compile()
+    states, step_student = replay_states(len(plan), student, task, grade, n_students)
+    last_steps = np.cumsum(np.bincount(step_student, minlength=n_students)) - 1
+    finals = states[last_steps]
+    outcome = plan.get_true_grade(finals)
+    final_letters = letter_grades(course, outcome)
+
+    total_weight = plan.task_weights.sum()
+    graded_weight = (~np.isnan(states)) @ plan.task_weights
+    progress = graded_weight / total_weight if total_weight else np.zeros(len(states))
+    progress_bin = np.minimum((progress * PROGRESS_BINS).astype(int), PROGRESS_BINS - 1)
+    step_outcome = outcome[step_student]
+    step_letters = final_letters[step_student]
+
+    forecasts = {
+        "expected_grade": plan.get_expected_grade(states),
+        "min_work_grade": plan.get_grade(states),
+        "current_grade": plan.get_current_grade(states),
+    }
+    errors = np.zeros((len(FORECASTS), PROGRESS_BINS, 3))
+    letter_hits = np.zeros((len(FORECASTS), PROGRESS_BINS))
+    for k, name in enumerate(FORECASTS):
+        error = forecasts[name] - step_outcome
+        for j, values in enumerate((error, np.abs(error), error**2)):
+            errors[k, :, j] = np.bincount(progress_bin, values, minlength=PROGRESS_BINS)
+        hits = letter_grades(course, forecasts[name]) == step_letters
+        letter_hits[k] = np.bincount(progress_bin, hits, minlength=PROGRESS_BINS)
+
+    expected = forecasts["expected_grade"]
+    calibration_bin = np.clip((expected * CALIBRATION_BINS).astype(int), 0, CALIBRATION_BINS - 1)
+    calibration = np.stack(
+        [
+            np.bincount(calibration_bin, minlength=CALIBRATION_BINS),
+            np.bincount(calibration_bin, expected, minlength=CALIBRATION_BINS),
+            np.bincount(calibration_bin, step_outcome, minlength=CALIBRATION_BINS),
+        ],
+        axis=1,
+    ).astype(float)
+
+    # Each group's expected grade assumption against the grades its tasks actually got
+    groups = {}
+    for name, tasks in plan.groups.items():
+        graded = finals[:, tasks]
+        mask = ~np.isnan(graded)
+        error = np.where(mask, plan.expected[tasks] - graded, 0.0)
+        groups[name] = np.array(
+            [mask.sum(), np.nansum(graded), error.sum(), np.abs(error).sum()], dtype=float
+        )
+
+    return CourseBacktest(
+        course,
+        n_students,
+        np.bincount(progress_bin, minlength=PROGRESS_BINS).astype(float),
+        errors,
+        letter_hits,
+        calibration,
+        groups,
+    )
+
+
+def _chunks(timeline: Timeline, chunk_steps: int) -> Iterator[tuple[Any, ...]]:
+    """Work items replaying groups of whole students with about ``chunk_steps`` steps each."""
+    student = np.asarray(timeline.student, dtype=np.int64)
+    task = np.asarray(timeline.task, dtype=np.int64)
+    grade = np.asarray(timeline.grade, dtype=float)
+    n_students = len(timeline.students)
+    steps = np.bincount(student, minlength=n_students) + 1
+    # Students whose cumulative steps fall in the same multiple of chunk_steps share a chunk
+    chunk_of = (np.cumsum(steps) - 1) // chunk_steps
+    event_chunk = chunk_of[student]
+    for chunk in np.unique(chunk_of):
+        members = np.flatnonzero(chunk_of == chunk)
+        selected = event_chunk == chunk
+        yield (
+            timeline.course,
+            student[selected] - members[0],
+            task[selected],
+            grade[selected],
+            len(members),
+        )
+
+
+def _run(item: tuple[Any, ...]) -> CourseBacktest:
+    return backtest_students(*item)
+
+
+def run_backtest(
+    timelines: Iterable[Timeline], jobs: int = 1, chunk_steps: int = BACKTEST_CHUNK_STEPS
+) -> list[CourseBacktest]:
+    """Replay timelines and sum up the forecast errors of each course.
+
+    Args:
+        timelines: Timelines to replay (see load_timelines)
+        jobs: Worker processes (1 replays in this process)
+        chunk_steps: Steps replayed at a time
+
+    Returns:
+        list[CourseBacktest]: One result per timeline, in order
+    """
+    indices, items = [], []
+    for i, timeline in enumerate(timelines):
+        for item in _chunks(timeline, chunk_steps):
+            indices.append(i)
+            items.append(item)
+    if jobs <= 1 or len(items) <= 1:
+        results = [_run(item) for item in items]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(items))) as executor:
+            results = list(executor.map(_run, items))
+
+    totals: dict[int, CourseBacktest] = {}
+    for i, result in zip(indices, results, strict=True):
+        totals[i] = totals[i] + result if i in totals else result
+    return [totals[i] for i in sorted(totals)]
+
+
+def _metrics(errors: np.ndarray, steps: float) -> dict[str, float | None]:
+    if not steps:
+        return {"bias": None, "mae": None, "rmse": None}
+    return {
+        "bias": errors[0] / steps,
+        "mae": errors[1] / steps,
+        "rmse": float(np.sqrt(errors[2] / steps)),
+    }
+
+
+def course_records(results: Iterable[CourseBacktest]) -> Iterator[dict[str, Any]]:
+    """Error metrics of each forecast in each course, over all steps and per progress bin."""
+    for result in results:
+        for k, forecast in enumerate(FORECASTS):
+            steps = result.steps.sum()
+            yield {
+                "course": result.course.name,
+                "forecast": forecast,
+                "progress": None,
+                "students": result.students,
+                "steps": int(steps),
+                **_metrics(result.errors[k].sum(axis=0), steps),
+                "letter_accuracy": result.letter_hits[k].sum() / steps if steps else None,
+            }
+            for b in range(PROGRESS_BINS):
+                steps = result.steps[b]
+                yield {
+                    "course": result.course.name,
+                    "forecast": forecast,
+                    "progress": b / PROGRESS_BINS,
+                    "students": result.students,
+                    "steps": int(steps),
+                    **_metrics(result.errors[k, b], steps),
+                    "letter_accuracy": result.letter_hits[k, b] / steps if steps else None,
+                }
+
+
+def group_records(results: Iterable[CourseBacktest]) -> Iterator[dict[str, Any]]:
+    """Each group's expected grade assumption against the grades actually received."""
+    for result in results:
+        for group in result.course.grading_groups:
+            n, grades, errors, abs_errors = result.groups[group.name]
+            yield {
+                "course": result.course.name,
+                "group": group.name,
+                "expected_grade": group.expected_grade,
+                "graded_tasks": int(n),
+                "mean_grade": grades / n if n else None,
+                "bias": errors / n if n else None,
+                "mae": abs_errors / n if n else None,
+            }
+
+
+def calibration_records(results: Iterable[CourseBacktest]) -> Iterator[dict[str, Any]]:
+    """Mean final outcome for each band of expected grade forecasts."""
+    for result in results:
+        for b, (steps, forecasts, outcomes) in enumerate(result.calibration):
+            if steps:
+                yield {
+                    "course": result.course.name,
+                    "forecast_low": b / CALIBRATION_BINS,
+                    "forecast_high": (b + 1) / CALIBRATION_BINS,
+                    "steps": int(steps),
+                    "mean_forecast": forecasts / steps,
+                    "mean_outcome": outcomes / steps,
+                }
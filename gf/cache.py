@@ -0,0 +1,369 @@
+"""Persistent, content-addressed cache of computed results.
+
+Courses get Merkle-style content hashes: a task is hashed from its fields, a
+grading group from its settings and the hashes of its tasks, and a course
+from its settings and the hashes of its groups. Results computed from an
+object are stored on disk under its hash, so a later invocation finds them
+again as long as the content is unchanged. Changing a task changes the
+hashes of its group and course only, so the other groups' entries stay
+valid.
+
+Grading functions are hashed from their bytecode and everything else they
+read: defaults, closure cells, the globals they reference, the arguments of
+a ``functools.partial``, and the source file of functions defined outside
+gf (such as in a course config). Objects whose functions depend on state
+that can't be hashed stably (e.g. a callable object) get no cache key, and
+their results are always recomputed.
+
+Entries are small JSON files under ``CACHE_DIR`` (``GF_CACHE_DIR``), one
+directory per kind of result. Reading an entry refreshes its modification
+time, and once the cache grows past ``CACHE_MAX_BYTES`` the least recently
+used entries are evicted.
+"""
+
+from collections.abc import Callable, Iterable
+from enum import Enum
+from functools import partial
+import hashlib
+import json
+import os
+from pathlib import Path
+from types import BuiltinFunctionType, CellType, CodeType, FunctionType, ModuleType
+from typing import Any, TypeVar, Union
+from weakref import WeakKeyDictionary
+
+from gf.classes import Course, GradingGroup, Task
+from gf.classes.task import Versioned
+from gf.config import CACHE_DIR, CACHE_MAX_BYTES
+from gf.profiling import count
+
+# Type of a cached result
+T = TypeVar("T")
+
+# Bump to invalidate the entries written by older versions of the computations
+CACHE_FORMAT = 1
+
+# After eviction the cache is trimmed down to this fraction of its maximum size
+EVICTION_TARGET = 0.8
+
+# Values whose repr describes them completely
+_PLAIN_TYPES = (type(None), bool, int, float, complex, str, bytes, Enum)
+
+# Source files of the gf package, whose code tokens already cover any change
+_GF_DIR = Path(__file__).resolve().parent
+
+# Source file -> ((mtime, size), digest)
+_file_digests: dict[str, tuple[tuple[int, int], str]] = {}
+
+# Object -> (version, digest), so unchanged objects are only hashed once per process
+_digests: "WeakKeyDictionary[Any, tuple[int, str]]" = WeakKeyDictionary()
+
+
+def _digest(*parts: object) -> str:
+    return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+
+def _code_token(code: CodeType) -> str:
+    """Hash of a function's bytecode and constants (nested functions included)."""
+    consts = tuple(
+        _code_token(const) if isinstance(const, CodeType) else const for const in code.co_consts
+    )
+    return _digest(code.co_code, consts, code.co_names)
+
+
+class UncacheableError(Exception):
+    """Raised when an object's content can't be hashed stably across processes."""
+
+
+def _code_names(code: CodeType) -> set[str]:
+    """Global (and attribute) names used by a function's code, nested functions included."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def _file_token(filename: str) -> str | None:
+    """Hash of a source file outside gf, or None for gf's own and unreadable files."""
+    path = Path(filename)
+    try:
+        if path.resolve().is_relative_to(_GF_DIR):
+            return None
+        stat = path.stat()
+    except OSError:
+        return None
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _file_digests.get(filename)
+    if cached is None or cached[0] != stamp:
+        cached = _file_digests[filename] = (
+            stamp,
+            hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest(),
+        )
+    return cached[1]
+
+
+def _cell_contents(cell: CellType) -> object:
+    try:
+        return cell.cell_contents
+    except ValueError:  # A variable the enclosing function hasn't assigned yet
+        return "<empty cell>"
+
+
+def _value_token(value: object, seen: set[int]) -> object:  # noqa: PLR0911
+    """Stable description of a value a grading function depends on."""
+    if isinstance(value, _PLAIN_TYPES):
+        return value
+    if isinstance(value, (tuple, list)):
+        return type(value).__name__, tuple(_value_token(item, seen) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return "set", tuple(sorted(repr(_value_token(item, seen)) for item in value))
+    if isinstance(value, dict):
+        return "dict", tuple(
+            sorted((repr(_value_token(k, seen)), _value_token(v, seen)) for k, v in value.items())
+        )
+    if isinstance(value, ModuleType):
+        return "module", value.__name__
+    if isinstance(value, type):
+        return "class", value.__module__, value.__qualname__
+    if callable(value):
+        return _function_token(value, seen)
+    msg = f"can't hash a {type(value).__qualname__}"
+    raise UncacheableError(msg)
+
+
+def _function_token(function: Callable, seen: set[int] | None = None) -> str:
+    """Stable identity of a grading function and the state it reads, across processes.
+
+    Raises:
+        UncacheableError: If the function depends on state that can't be hashed
+    """
+    seen = set() if seen is None else seen
+    if isinstance(function, partial):
+        return _digest(
+            "partial",
+            _function_token(function.func, seen),
+            _value_token(function.args, seen),
+            _value_token(function.keywords, seen),
+        )
+    name = f"{getattr(function, '__module__', '')}.{getattr(function, '__qualname__', '')}"
+    if isinstance(function, BuiltinFunctionType):
+        return name
+    if not isinstance(function, FunctionType):
+        msg = f"can't hash the state of {function!r}"
+        raise UncacheableError(msg)
+    if id(function) in seen:  # Recursion
+        return name
+    seen.add(id(function))
+
+    code = function.__code__
+    cells = tuple(_cell_contents(cell) for cell in function.__closure__ or ())
+    referenced = sorted(_code_names(code) & function.__globals__.keys())
+    return _digest(
+        name,
+        _code_token(code),
+        _value_token(function.__defaults__, seen),
+        _value_token(function.__kwdefaults__, seen),
+        _value_token(cells, seen),
+        tuple(
+            (global_name, _value_token(function.__globals__[global_name], seen))
+            for global_name in referenced
+        ),
+        _file_token(code.co_filename),
+    )
+
+
+def _memoized(obj: Versioned, compute: Callable[[], str]) -> str:
+    version = obj.get_version()
+    try:
+        cached = _digests.get(obj)
+    except TypeError:  # Not weak-referenceable (e.g. StudentCourse)
+        return compute()
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    digest = compute()
+    _digests[obj] = (version, digest)
+    return digest
+
+
+def task_digest(task: Task) -> str:
+    """Content hash of a task's fields."""
+    return _digest(task.name, task.grade, task.base_grade, task.expected_grade, task.pst)
+
+
+def group_digest(group: GradingGroup) -> str:
+    """Content hash of a grading group's settings and tasks."""
+    return _memoized(
+        group,
+        lambda: _digest(
+            "group",
+            CACHE_FORMAT,
+            group.name,
+            group.weight,
+            group.default_pst,
+            group.base_grade,
+            group.expected_grade,
+            group.late_policy,
+            group.drop_lowest,
+            _function_token(group.grading_function),
+            _function_token(group.true_grading_function),
+            _function_token(group.expected_grading_function),
+            tuple(task_digest(task) for task in group.tasks),
+        ),
+    )
+
+
+def course_digest(course: Course) -> str:
+    """Content hash of a course's settings and grading groups."""
+    return _memoized(
+        course,
+        lambda: _digest(
+            "course",
+            CACHE_FORMAT,
+            course.name,
+            course.care_factor,
+            tuple(course.grading_boundaries.items()),
+            tuple(course.grade_utils.items()),
+            course.late_policy,
+            course.credits,
+            tuple(group_digest(group) for group in course.grading_groups),
+        ),
+    )
+
+
+class ResultCache:
+    """Size-bounded on-disk cache of JSON-serializable results, keyed by content hash."""
+
+    def __init__(self, directory: Path, max_bytes: int = CACHE_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._size: int | None = None  # Bytes on disk, once scanned
+
+    def _path(self, kind: str, key: str) -> Path:
+        return self.directory / kind / f"{key}.json"
+
+    def get(self, kind: str, key: str) -> Any | None:  # noqa: ANN401 - like json.load
+        """Look up a result, or None if it is not cached."""
+        path = self._path(kind, key)
+        try:
+            with path.open() as f:
+                value = json.load(f)
+            os.utime(path)  # Mark as recently used
+        except (OSError, ValueError):
+            count("result_cache.miss")
+            return None
+        count("result_cache.hit")
+        return value
+
+    def put(self, kind: str, key: str, value: object) -> None:
+        """Store a result, evicting old entries if the cache grows too large."""
+        path = self._path(kind, key)
+        data = json.dumps(value).encode()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename, so concurrent readers never see a partial entry
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            tmp.replace(path)
+        except OSError:
+            return
+        if self._size is None:
+            self._size = sum(size for _, _, size in self._entries())
+        else:
+            self._size += len(data)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def get_or_compute(self, kind: str, key: str | None, compute: Callable[[], T]) -> T:
+        """Return the cached result, computing and storing it if missing.
+
+        A key of None (see cache_key) always computes the result.
+        """
+        if key is None:
+            count("result_cache.uncacheable")
+            return compute()
+        value = self.get(kind, key)
+        if value is None:
+            value = compute()
+            self.put(kind, key, value)
+        return value
+
+    def _entries(self) -> Iterable[tuple[Path, float, int]]:
+        """(path, last use, size) of every entry."""
+        if not self.directory.is_dir():
+            return
+        for kind in os.scandir(self.directory):
+            if not kind.is_dir():
+                continue
+            for entry in os.scandir(kind.path):
+                if entry.name.endswith(".json"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    yield Path(entry.path), stat.st_mtime, stat.st_size
+
+    def evict(self, max_bytes: int | None = None) -> int:
+        """Delete the least recently used entries until the cache fits.
+
+        Args:
+            max_bytes: Size to fit in (defaults to a fraction of the maximum size)
+
+        Returns:
+            int: Number of entries deleted
+        """
+        if max_bytes is None:
+            max_bytes = int(self.max_bytes * EVICTION_TARGET)
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        removed = 0
+        for path, _, size in entries:
+            if total <= max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self._size = total
+        return removed
+
+    def clear(self) -> int:
+        """Delete every entry, returning how many there were."""
+        return self.evict(max_bytes=0)
+
+    def stats(self) -> dict[str, Any]:
+        """Number of entries and bytes used, overall and per kind of result."""
+        kinds: dict[str, dict[str, int]] = {}
+        for path, _, size in self._entries():
+            kind = kinds.setdefault(path.parent.name, {"entries": 0, "bytes": 0})
+            kind["entries"] += 1
+            kind["bytes"] += size
+        return {
+            "directory": str(self.directory),
+            "max_bytes": self.max_bytes,
+            "entries": sum(kind["entries"] for kind in kinds.values()),
+            "bytes": sum(kind["bytes"] for kind in kinds.values()),
+            "kinds": kinds,
+        }
+
+
+def get_cache() -> ResultCache | None:
+    """The cache configured by GF_CACHE_DIR, or None if caching is disabled (GF_NO_CACHE)."""
+    if os.environ.get("GF_NO_CACHE"):
+        return None
+    return ResultCache(CACHE_DIR, CACHE_MAX_BYTES)
+
+
+def cache_key(obj: Union[Course, GradingGroup], *parts: Union[str, int, None]) -> str | None:
+    """Key for a result derived from a course or group and other parameters (e.g. a width).
+
+    Returns:
+        str or None: The key, or None if the object's content can't be hashed
+    """
+    try:
+        digest = course_digest(obj) if isinstance(obj, Course) else group_digest(obj)
+    except UncacheableError:
+        return None
+    return _digest(digest, *parts)
@@ -1,20 +1,37 @@
 from .course import Course
+from .frontier import Frontier, FrontierMetric, build_frontier
 from .grading_functions import (
     default_expected_raw_grading_function,
     default_raw_grading_function,
     default_true_raw_grading_function,
 )
 from .grading_group import GradingGroup
+from .scenario import Scenario, compare_scenarios
+from .schedule import StudySchedule, build_schedule, schedule_courses
 from .task import Task
+from .template import CourseTemplate, StudentCourse
+from .term import Term, get_cumulative_gpa
 from .visualization import create_grading_group_display, grading_group_to_string
 
 __all__ = [
     "Course",
+    "CourseTemplate",
+    "Frontier",
+    "FrontierMetric",
     "GradingGroup",
+    "Scenario",
+    "StudentCourse",
+    "StudySchedule",
     "Task",
+    "Term",
+    "build_frontier",
+    "build_schedule",
+    "compare_scenarios",
     "create_grading_group_display",
     "default_expected_raw_grading_function",
     "default_raw_grading_function",
     "default_true_raw_grading_function",
+    "get_cumulative_gpa",
     "grading_group_to_string",
+    "schedule_courses",
 ]
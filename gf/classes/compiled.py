@@ -0,0 +1,250 @@
+"""Courses compiled to numpy kernels, for grading many students at once."""
+
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+import math
+from typing import TYPE_CHECKING, Union
+
+import numpy as np
+
+from .grading_functions import is_linear_grading, kept_count
+from .task import Task
+from .template import TaskSpec
+
+if TYPE_CHECKING:
+    from .course import Course
+
+# Grade vectors hold one grade per task in plan order, NaN meaning ungraded.
+# Matrices hold one such vector per row.
+GradeArray = np.ndarray
+
+
+@dataclass(frozen=True)
+class Kernel:
+    """A group that is not a plain average of its task grades.
+
+    Groups with custom grading functions are evaluated on Task objects.
+    Groups dropping their lowest grades are evaluated on the whole matrix at
+    once, by sorting each row.
+    """
+
+    tasks: slice  # Position of the group's tasks in the plan
+    specs: tuple[TaskSpec, ...]
+    weight: float
+    grading_function: Callable
+    true_grading_function: Callable
+    drop_lowest: int = 0
+
+    def _evaluate_dropping(self, grades: GradeArray, kind: str) -> np.ndarray:
+        block = grades[:, self.tasks]
+        ungraded = np.isnan(block)
+        if kind == "current":
+            # Ungraded tasks sort below every grade and count as 0 if kept
+            fallback = -1.0
+        elif kind == "true":
+            fallback = 0.0
+        else:
+            attribute = "expected_grade" if kind == "expected" else "base_grade"
+            fallback = np.array([getattr(spec, attribute) for spec in self.specs], dtype=float)
+        filled = np.where(ungraded, fallback, block)
+        kept = kept_count(block.shape[1], self.drop_lowest)
+        top = np.sort(filled, axis=1)[:, block.shape[1] - kept :]
+        return np.maximum(top, 0).sum(axis=1) / kept * self.weight
+
+    def evaluate(self, grades: GradeArray, kind: str = "grade") -> np.ndarray:
+        """Weighted contribution of the group for each row of a grade matrix.
+
+        Args:
+            grades: Grade matrix
+            kind: "grade" (min-work), "true" (no work) or, for dropping groups,
+                "expected" or "current"
+        """
+        if self.drop_lowest:
+            return self._evaluate_dropping(grades, kind)
+        function = self.true_grading_function if kind == "true" else self.grading_function
+        results = []
+        for row in grades[:, self.tasks].tolist():
+            tasks = []
+            for spec, grade in zip(self.specs, row, strict=True):
+                task = object.__new__(Task)
+                task.__dict__.update(
+                    name=spec.name,
+                    grade=None if math.isnan(grade) else grade,
+                    base_grade=spec.base_grade,
+                    expected_grade=spec.expected_grade,
+                    pst=spec.pst,
+                )
+                tasks.append(task)
+            results.append(function(tasks) * self.weight)
+        return np.asarray(results, dtype=float)
+
+
+class CompiledCourse:
+    """A frozen evaluation plan for a course's grades.
+
+    With the default grading functions every grade is a weighted sum of task
+    grades, with a task weighing ``group.weight / len(group.tasks)``. The plan
+    flattens the tasks into vectors:
+    - ``task_weights``: each task's weight;
+    - ``linear_weights``: the same, but zero for groups with custom grading
+      functions or dropping their lowest grades;
+    - ``average_weights``: the same, but zero only for groups dropping their
+      lowest grades (the expected and current grades of the other groups are
+      plain averages);
+    - ``base`` and ``expected``: the fallbacks used for ungraded tasks.
+    Evaluating a grade vector is then a dot product plus a precomputed
+    offset. Groups with custom grading functions or dropping their lowest
+    grades are evaluated by their own Kernel.
+
+    The plan only depends on the course structure, not on its grades. Get
+    one from ``Course.compile()``, which reuses it until the structure
+    changes.
+    """
+
+    def __init__(self, course: "Course") -> None:
+        self.structure_version = course.get_structure_version()
+        names: list[str] = []
+        task_weights: list[float] = []
+        linear: list[bool] = []
+        dropping: list[bool] = []
+        specs: list[TaskSpec] = []
+        self.kernels: list[Kernel] = []
+        # Group name -> position of its tasks in the plan (the first group with a name wins)
+        self.groups: dict[str, slice] = {}
+
+        for group in course.grading_groups:
+            n = len(group.tasks)
+            start = len(names)
+            group_specs = tuple(
+                TaskSpec(task.name, task.base_grade, task.expected_grade, task.pst)
+                for task in group.tasks
+            )
+            self.groups.setdefault(group.name, slice(start, start + n))
+            if not n:
+                # Like Course.get_grade, an empty group contributes nothing
+                continue
+            is_linear = is_linear_grading(
+                group.grading_function, group.true_grading_function, group.drop_lowest
+            )
+            names.extend(spec.name for spec in group_specs)
+            specs.extend(group_specs)
+            task_weights.extend([group.weight / n] * n)
+            linear.extend([is_linear] * n)
+            dropping.extend([bool(group.drop_lowest)] * n)
+            if not is_linear:
+                self.kernels.append(
+                    Kernel(
+                        slice(start, start + n),
+                        group_specs,
+                        group.weight,
+                        group.grading_function,
+                        group.true_grading_function,
+                        group.drop_lowest,
+                    )
+                )
+
+        self.names = tuple(names)
+        # Like Course.get_task, the first task with a given name wins
+        self.index: dict[str, int] = {}
+        for i, name in enumerate(names):
+            self.index.setdefault(name, i)
+
+        self.task_weights = np.asarray(task_weights, dtype=float)
+        self.linear_weights = np.where(linear, self.task_weights, 0.0)
+        self.average_weights = np.where(dropping, 0.0, self.task_weights)
+        self.base = np.asarray([spec.base_grade for spec in specs], dtype=float)
+        self.expected = np.asarray([spec.expected_grade for spec in specs], dtype=float)
+        self.base_offset = float(self.linear_weights @ self.base)
+        self.expected_offset = float(self.average_weights @ self.expected)
+        for array in (
+            self.task_weights,
+            self.linear_weights,
+            self.average_weights,
+            self.base,
+            self.expected,
+        ):
+            array.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def grades_of(
+        self, course: "Course", overrides: Mapping[str, float | None] | None = None
+    ) -> GradeArray:
+        """Extract a course's grades as a vector, optionally overriding some of them.
+
+        Args:
+            course: A course with the structure this plan was compiled from
+            overrides: Grades to use instead of the course's, by task name
+
+        Returns:
+            np.ndarray: Grades in plan order (NaN for ungraded)
+        """
+        grades = np.fromiter(
+            (
+                np.nan if task.grade is None else task.grade
+                for group in course.grading_groups
+                for task in group.tasks
+            ),
+            dtype=float,
+            count=len(self.names),
+        )
+        for name, grade in (overrides or {}).items():
+            grades[self.index[name]] = np.nan if grade is None else grade
+        return grades
+
+    def kernel(self, tasks: slice) -> Kernel | None:
+        """The kernel evaluating the group at a position, if the group needs one."""
+        return next((kernel for kernel in self.kernels if kernel.tasks == tasks), None)
+
+    def _kernels(self, grades: GradeArray, kind: str = "grade") -> Union[float, np.ndarray]:
+        # Only dropping groups differ from a plain average for expected and current grades
+        kernels = [
+            kernel for kernel in self.kernels if kernel.drop_lowest or kind in ("grade", "true")
+        ]
+        if not kernels:
+            return 0.0
+        matrix = np.atleast_2d(grades)
+        total = sum(kernel.evaluate(matrix, kind) for kernel in kernels)
+        return float(total[0]) if grades.ndim == 1 else total
+
+    def get_grade(self, grades: GradeArray) -> Union[float, np.ndarray]:
+        """Min-work grade (ungraded tasks at their base grade) of a grade vector or matrix."""
+        gained = np.nan_to_num(grades - self.base)
+        return self.base_offset + gained @ self.linear_weights + self._kernels(grades)
+
+    def get_current_grade(self, grades: GradeArray) -> Union[float, np.ndarray]:
+        """Grade earned on graded tasks only (see Course.get_current_grade)."""
+        return np.nan_to_num(grades) @ self.average_weights + self._kernels(grades, "current")
+
+    def get_true_grade(self, grades: GradeArray) -> Union[float, np.ndarray]:
+        """Grade assuming no more work is done (ungraded tasks count as 0)."""
+        return np.nan_to_num(grades) @ self.linear_weights + self._kernels(grades, "true")
+
+    def get_expected_grade(self, grades: GradeArray) -> Union[float, np.ndarray]:
+        """Expected grade (ungraded tasks at their expected grade)."""
+        gained = np.nan_to_num(grades - self.expected)
+        return (
+            self.expected_offset + gained @ self.average_weights + self._kernels(grades, "expected")
+        )
+
+    def sweep(self, grades: GradeArray, task: str, values: Sequence[float]) -> np.ndarray:
+        """Min-work grade for each value of one task's grade, others held fixed.
+
+        Args:
+            grades: Grade vector of the other tasks
+            task: Name of the task to vary
+            values: Grades to try for the task
+
+        Returns:
+            np.ndarray: The min-work grade for each value
+        """
+        i = self.index[task]
+        values = np.asarray(values, dtype=float)
+        if self.linear_weights[i] or not self.task_weights[i]:
+            without = np.array(grades, dtype=float)
+            without[i] = self.base[i]
+            return self.get_grade(without) + (values - self.base[i]) * self.linear_weights[i]
+        matrix = np.tile(grades, (len(values), 1))
+        matrix[:, i] = values
+        return self.get_grade(matrix)
@@ -1,21 +1,27 @@
 import math
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Union
 
 from rich import box
-from rich.console import Console, Group
+from rich.console import Group
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
 from .grading_group import GradingGroup
-from .task import Task
+from .task import Task, next_version
+from .visualization import render_to_string
 
+if TYPE_CHECKING:
+    from .compiled import CompiledCourse
+    from .scenario import Scenario
+
+# Adjacent letters share an edge; get_letter_grade picks the first match, the higher letter
 default_grading_boundaries = {
     "A": (90, 100),
-    "B": (80, 89.9999),
-    "C": (70, 79.9999),
-    "D": (60, 69.9999),
-    "F": (0, 59.9999),
+    "B": (80, 90),
+    "C": (70, 80),
+    "D": (60, 70),
+    "F": (0, 60),
 }
 
 default_grade_utils = {
@@ -27,6 +33,12 @@ default_grade_utils = {
 }
 
 
+# Course attributes whose changes invalidate anything computed from the course
+COURSE_FIELDS = frozenset(
+    {"name", "care_factor", "grading_groups", "grading_boundaries", "grade_utils", "credits"}
+)
+
+
 def sigmoid(x: float) -> float:
     return 1 / (1 + math.exp(-x))
 
@@ -41,14 +53,66 @@ class Course:
         grading_groups: list[GradingGroup],
         grading_boundaries: dict[str, tuple[float, float]] = default_grading_boundaries,
         grade_utils: dict[str, float] = default_grade_utils,
-        late_policy: Optional[str] = None,
-    ):
+        late_policy: str | None = None,
+        *,
+        credits: float = 12,  # noqa: A002 - the same name as the credits attribute
+    ) -> None:
         self.name = name
         self.care_factor = care_factor
         self.grading_groups = grading_groups
         self.grading_boundaries = grading_boundaries
         self.grade_utils = grade_utils
         self.late_policy = late_policy
+        # Units the course is worth (MIT courses are usually 12)
+        self.credits = credits
+
+    def __setattr__(self, key: str, value: object) -> None:
+        super().__setattr__(key, value)
+        if key in COURSE_FIELDS:
+            super().__setattr__("_version", next_version())
+
+    def get_version(self) -> int:
+        """Version stamp that changes whenever the course or anything in it changes."""
+        return max(
+            self._version,
+            max((group.get_version() for group in self.grading_groups), default=0),
+        )
+
+    def get_structure_version(self) -> int:
+        """Version stamp that changes whenever anything but a task grade changes."""
+        return max(
+            self._version,
+            max((group.get_structure_version() for group in self.grading_groups), default=0),
+        )
+
+    def compile(self) -> "CompiledCourse":
+        """Compile the course's structure into a CompiledCourse evaluation plan.
+
+        The plan is cached and reused until the structure (anything but a task
+        grade) changes.
+
+        Returns:
+            CompiledCourse: The plan
+        """
+        from .compiled import CompiledCourse  # noqa: PLC0415 - circular import
+
+        plan = self.__dict__.get("_plan")
+        if plan is None or plan.structure_version != self.get_structure_version():
+            plan = self._plan = CompiledCourse(self)
+        return plan
+
+    def scenario(self, name: str | None = None) -> "Scenario":
+        """Branch off a what-if scenario that records changes without modifying this course.
+
+        Args:
+            name: Name of the scenario (defaults to the course name)
+
+        Returns:
+            Scenario: The new scenario
+        """
+        from .scenario import Scenario  # noqa: PLC0415 - circular import
+
+        return Scenario(self, name)
 
     def get_grade(self) -> float:
         """Calculate the current grade based on completed and base grades."""
@@ -64,7 +128,7 @@ class Course:
         # Check if any tasks have been completed
         completed_tasks = [task for task in all_tasks if task.grade is not None]
         if not completed_tasks:
-            return 0  # No tasks completed yet
+            return 0.0  # No tasks completed yet
 
         # Calculate the current grade based on completed assignments
         total_contribution = 0
@@ -81,13 +145,18 @@ class Course:
         """Calculate the expected grade based on expected grades."""
         return sum(group.get_expected_contribution() for group in self.grading_groups)
 
-    def get_letter_grade(self, grade: Optional[float] = None) -> str:
-        """Convert a numerical grade to a letter grade."""
+    def get_letter_grade(self, grade: float | None = None) -> str:
+        """Convert a numerical grade (0-1) to a letter grade.
+
+        Grading boundaries are expressed in percent, so the grade is scaled
+        before being compared against them.
+        """
         if grade is None:
             grade = self.get_grade()
 
+        percent = grade * 100
         for letter, (lower, upper) in self.grading_boundaries.items():
-            if lower <= grade <= upper:
+            if lower <= percent <= upper:
                 return letter
         return "?"
 
@@ -136,6 +205,10 @@ class Course:
 
     def __str__(self) -> str:
         """Returns a Rich-formatted string representation of the course."""
+        return render_to_string(self, "course", self.create_display)
+
+    def create_display(self) -> Panel:
+        """Create a rich panel summarizing the course's grading groups and grades."""
         # Create table for grading groups
         group_table = Table(box=box.SIMPLE, show_header=True, padding=(0, 2))
         group_table.add_column("Grading Group", style="cyan")
@@ -186,14 +259,9 @@ class Course:
         # Combine everything in a panel
         content = Group(group_table, Text("\n"), grade_summary)
 
-        panel = Panel(
+        return Panel(
             content,
             title=f"[bold cyan]{self.name.upper()}[/bold cyan] [yellow](care factor = {self.care_factor})[/yellow]",
             border_style="blue",
             box=box.ROUNDED,
         )
-
-        # Convert to string representation
-        console = Console(record=True)
-        console.print(panel)
-        return console.export_text()
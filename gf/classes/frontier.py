@@ -0,0 +1,205 @@
+"""Study frontiers: the best grade or GPA reachable with each number of study hours."""
+
+from bisect import bisect_right
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Union
+
+from .course import Course, sigmoid
+from .term import DEFAULT_GRADE_POINTS, gpa
+
+
+class FrontierMetric(StrEnum):
+    """What the study frontier trades hours against."""
+
+    grade = "grade"  # Credit-weighted mean min-work grade
+    gpa = "gpa"  # Term GPA of the min-work letter grades
+    utility = "utility"  # Sum of the courses' raw utilities
+
+
+@dataclass(frozen=True, eq=False)
+class StudySegment:
+    """The hours needed to complete one ungraded task, and what they earn.
+
+    Working on a task raises its grade linearly from its base grade to 1 over
+    its ``pst`` hours, so the course grade rises at the task's MGPH.
+    """
+
+    course: Course
+    task: str
+    hours: float
+    gain: float  # Course grade gained by completing the task
+    rate: float  # Credit-weighted MGPH, the order segments are worked on in
+
+
+@dataclass(frozen=True)
+class FrontierPoint:
+    """A point on the frontier: the value reached after some hours of the plan.
+
+    The plan behind it is the first ``segments`` segments of the frontier,
+    followed by ``partial`` hours of the next one.
+    """
+
+    hours: float
+    value: float
+    segments: int
+    partial: float = 0.0
+
+
+def study_segments(courses: Iterable[Course]) -> list[StudySegment]:
+    """The study segments of every ungraded task with a predicted study time."""
+    segments = []
+    for course in courses:
+        for group in course.grading_groups:
+            for task in group.tasks:
+                if task.grade is not None or not task.pst or task.pst < 0:
+                    continue
+                mgph = course.get_marginal_grade_per_hour(task)
+                if mgph > 0:
+                    segments.append(
+                        StudySegment(
+                            course, task.name, task.pst, mgph * task.pst, mgph * course.credits
+                        )
+                    )
+    return segments
+
+
+class Frontier:
+    """Pareto frontier of total study hours against a forecast metric.
+
+    Built by sorting every task's study segment by credit-weighted MGPH and
+    sweeping them once, in O(T log T) for T tasks. With the default grading
+    functions the grade metric is linear in each segment, so the sorted
+    sweep is the exact frontier. GPA and utility only change when a course
+    crosses a grade boundary, so their points are those crossings along the
+    same sweep. Every point maps back to a concrete plan with ``plan``.
+    """
+
+    def __init__(
+        self,
+        courses: Sequence[Course],
+        segments: Sequence[StudySegment],
+        points: Sequence[FrontierPoint],
+        metric: FrontierMetric,
+    ) -> None:
+        self.courses = courses
+        self.segments = segments
+        self.points = points
+        self.metric = metric
+        self._hours = [point.hours for point in points]
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def at(self, hours: float) -> FrontierPoint:
+        """The best point reachable within a budget of study hours.
+
+        The grade grows linearly within a segment, so for the grade metric the
+        budget's leftover hours are spent on the next segment.
+        """
+        i = max(bisect_right(self._hours, hours) - 1, 0)
+        point = self.points[i]
+        if self.metric != FrontierMetric.grade or i + 1 == len(self.points):
+            return point
+        following = self.points[i + 1]
+        fraction = (hours - point.hours) / (following.hours - point.hours)
+        return FrontierPoint(
+            hours,
+            point.value + fraction * (following.value - point.value),
+            point.segments,
+            hours - point.hours,
+        )
+
+    def plan(self, point: Union[FrontierPoint, float]) -> list[tuple[StudySegment, float]]:
+        """The study plan reaching a point (or the best point within a budget of hours).
+
+        Returns:
+            list: (segment, hours to spend on it) pairs, in the order to work on them
+        """
+        if not isinstance(point, FrontierPoint):
+            point = self.at(point)
+        plan = [(segment, segment.hours) for segment in self.segments[: point.segments]]
+        if point.partial:
+            plan.append((self.segments[point.segments], point.partial))
+        return plan
+
+    def step(self, point: FrontierPoint) -> StudySegment | None:
+        """The segment being worked on when a point is reached (None for the start)."""
+        if point.partial:
+            return self.segments[point.segments]
+        return self.segments[point.segments - 1] if point.segments else None
+
+
+def _contribution(
+    metric: FrontierMetric, grade_points: Mapping[str, float]
+) -> Callable[[Course, float], float]:
+    """A course's credit-weighted contribution to the metric at a given grade."""
+    if metric == FrontierMetric.grade:
+        return lambda course, grade: course.credits * grade
+    # Grades can overshoot 1 when a course's weights add up to more than 1,
+    # which would fall outside every grading boundary
+    if metric == FrontierMetric.gpa:
+        return lambda course, grade: (
+            course.credits * grade_points.get(course.get_letter_grade(min(grade, 1.0)), 0.0)
+        )
+    return lambda course, grade: sigmoid(
+        course.grade_utils.get(course.get_letter_grade(min(grade, 1.0)), 0) * course.care_factor
+    )
+
+
+def build_frontier(
+    courses: Iterable[Course],
+    metric: Union[FrontierMetric, str] = FrontierMetric.grade,
+    grade_points: Mapping[str, float] | None = None,
+) -> Frontier:
+    """Compute the study hours versus metric frontier over a set of courses.
+
+    Args:
+        courses: Courses taken together
+        metric: What to trade hours against (see FrontierMetric)
+        grade_points: Points per letter for the GPA metric
+
+    Returns:
+        Frontier: Points where the metric improves, starting at zero hours
+    """
+    metric = FrontierMetric(metric)
+    courses = list(courses)
+    contribution = _contribution(metric, grade_points or DEFAULT_GRADE_POINTS)
+    scale = 1.0
+    if metric != FrontierMetric.utility:
+        scale = gpa(1.0, sum(course.credits for course in courses))
+
+    segments = sorted(study_segments(courses), key=lambda segment: -segment.rate)
+    grades = {id(course): course.get_grade() for course in courses}
+    # Grade boundaries as fractions, so crossings can be found within a segment
+    thresholds = {
+        id(course): sorted(lower / 100 for lower, _ in course.grading_boundaries.values())
+        for course in courses
+    }
+    total = sum(contribution(course, grades[id(course)]) for course in courses)
+
+    points = [FrontierPoint(0.0, total * scale, 0)]
+    hours = 0.0
+    for i, segment in enumerate(segments):
+        course = segment.course
+        start = grades[id(course)]
+        end = start + segment.gain
+        before = contribution(course, start)
+        if metric != FrontierMetric.grade:
+            for threshold in thresholds[id(course)]:
+                if start < threshold < end:
+                    after = contribution(course, threshold)
+                    if after > before:
+                        total += after - before
+                        before = after
+                        partial = segment.hours * (threshold - start) / segment.gain
+                        points.append(FrontierPoint(hours + partial, total * scale, i, partial))
+
+        grades[id(course)] = end
+        hours += segment.hours
+        after = contribution(course, end)
+        total += after - before
+        if after > before:
+            points.append(FrontierPoint(hours, total * scale, i + 1))
+    return Frontier(courses, segments, points, metric)
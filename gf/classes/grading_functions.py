@@ -1,3 +1,6 @@
+from collections.abc import Callable, Iterable
+from heapq import nlargest
+
 from .task import Task
 
 
@@ -54,3 +57,42 @@ def default_expected_raw_grading_function(tasks: list[Task]) -> float:
             task.grade if task.grade is not None else task.expected_grade for task in tasks
         ) / len(tasks)
     return 0
+
+
+def kept_count(n_tasks: int, drop_lowest: int) -> int:
+    """Number of tasks that count in a group dropping its lowest grades (at least one)."""
+    return max(n_tasks - drop_lowest, 1)
+
+
+def drop_lowest_raw_grade(grades: Iterable[float], n_tasks: int, drop_lowest: int) -> float:
+    """Average of the highest grades of a group that drops its lowest ones.
+
+    Args:
+        grades: Effective grades of the tasks (only the graded ones for a current grade,
+            in which case fewer than ``n_tasks``)
+        n_tasks: Number of tasks in the group
+        drop_lowest: Number of lowest grades dropped
+
+    Returns:
+        float: Sum of the kept grades over the number of kept tasks, or 0 if no tasks
+    """
+    if not n_tasks:
+        return 0
+    kept = kept_count(n_tasks, drop_lowest)
+    return sum(nlargest(kept, grades)) / kept
+
+
+def is_linear_grading(
+    grading_function: Callable, true_grading_function: Callable, drop_lowest: int = 0
+) -> bool:
+    """Whether a group's grade is a plain average of its task grades.
+
+    True for the default grading functions, unless the group drops its lowest
+    grades. Compiled plans and templates can then treat the group as a
+    weighted sum instead of calling the functions.
+    """
+    return (
+        grading_function is default_raw_grading_function
+        and true_grading_function is default_true_raw_grading_function
+        and not drop_lowest
+    )
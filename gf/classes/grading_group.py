@@ -1,15 +1,63 @@
-from typing import Callable, Optional, Union
+from collections.abc import Iterable, Mapping, Sequence
+import math
+from typing import Any, Callable, Union
+
+import numpy as np
 
 from .grading_functions import (
     default_expected_raw_grading_function,
     default_raw_grading_function,
     default_true_raw_grading_function,
+    is_linear_grading,
+    kept_count,
+)
+from .order_statistics import TopSum
+from .task import Task, is_proper_fraction, next_version
+
+# Grading group attributes whose changes invalidate anything computed from the group
+GROUP_FIELDS = frozenset(
+    {
+        "name",
+        "weight",
+        "default_pst",
+        "base_grade",
+        "expected_grade",
+        "grading_function",
+        "true_grading_function",
+        "expected_grading_function",
+        "tasks",
+        "drop_lowest",
+    }
 )
-from .task import Task, is_proper_fraction
+
+# Value each task contributes to a dropping group's order statistics, per kind of
+# grade (None leaves the task out)
+DROP_VALUES: dict[str, Callable[[Task], float | None]] = {
+    "grade": lambda task: task.grade if task.grade is not None else task.base_grade,
+    "true": lambda task: task.grade if task.grade is not None else 0,
+    "expected": lambda task: task.grade if task.grade is not None else task.expected_grade,
+    "current": lambda task: task.grade,
+}
+
+
+def _update_order(order: dict[str, TopSum], task: Task) -> None:
+    """Set a task's values in the order statistics of a dropping group."""
+    for kind, value_of in DROP_VALUES.items():
+        value = value_of(task)
+        if value is None:
+            order[kind].discard(task)
+        else:
+            order[kind].set(task, value)
 
 
 class GradingGroup:
-    """A group of tasks with a weight that contributes to a course grade."""
+    """A group of tasks with a weight that contributes to a course grade.
+
+    With ``drop_lowest`` set, only the highest ``len(tasks) - drop_lowest``
+    grades count (at least one). The group then keeps each kind of grade in
+    a TopSum, which its tasks update as their grades change, so a
+    ``set_grade`` costs O(log n) instead of re-sorting the group.
+    """
 
     def __init__(
         self,
@@ -18,12 +66,14 @@ class GradingGroup:
         tasks: Union[list[Task], Task, int],
         default_pst: float = 5,
         base_grade: float = 0.5,
-        expected_grade: Optional[float] = None,
-        late_policy: Optional[str] = None,
+        expected_grade: float | None = None,
+        late_policy: str | None = None,
         grading_function: Callable = default_raw_grading_function,
         true_grading_function: Callable = default_true_raw_grading_function,
         expected_grading_function: Callable = default_expected_raw_grading_function,
-    ):
+        *,
+        drop_lowest: int = 0,
+    ) -> None:
         assert isinstance(name, str)
         assert is_proper_fraction(weight)
         assert isinstance(default_pst, (float, int))
@@ -43,6 +93,14 @@ class GradingGroup:
         self.true_grading_function = true_grading_function
         self.expected_grading_function = expected_grading_function
 
+        if not isinstance(drop_lowest, int) or drop_lowest < 0:
+            msg = f"drop_lowest must be a non-negative integer, got {drop_lowest!r}"
+            raise ValueError(msg)
+        if drop_lowest and not is_linear_grading(grading_function, true_grading_function):
+            msg = "drop_lowest cannot be combined with a custom grading function"
+            raise ValueError(msg)
+        self.drop_lowest = drop_lowest
+
         if expected_grade is None:
             expected_grade = base_grade
         self.expected_grade = expected_grade
@@ -56,12 +114,244 @@ class GradingGroup:
         self.tasks = tasks
 
         for task in self.tasks:
-            if task.pst is None:
-                task.pst = default_pst
-            if task.base_grade is None:
-                task.base_grade = base_grade
-            if task.expected_grade is None:
-                task.expected_grade = expected_grade
+            self._apply_task_defaults(task)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        name: str,
+        weight: float,
+        names: Sequence[str],
+        *,
+        grades: Sequence[float | None] | None = None,
+        base_grades: Sequence[float | None] | None = None,
+        expected_grades: Sequence[float | None] | None = None,
+        psts: Sequence[float | None] | None = None,
+        **kwargs: Any,
+    ) -> "GradingGroup":
+        """Build a group from per-task arrays, validating them all at once.
+
+        This is the bulk equivalent of passing a list of ``Task`` objects. The
+        whole batch is checked with array operations, and every invalid value
+        is reported in a single ValueError. The tasks are then created without
+        running ``Task.__init__`` or the group's per-task default filling.
+
+        Args:
+            name: Name of the group
+            weight: Weight of the group
+            names: Task names
+            grades: Task grades (None or NaN for ungraded)
+            base_grades: Task base grades (None or NaN for the group's base grade)
+            expected_grades: Task expected grades (None or NaN for the group's)
+            psts: Task study times (None or NaN for the group's default pst)
+            **kwargs: Other GradingGroup arguments (default_pst, base_grade, ...)
+
+        Returns:
+            GradingGroup: The new group
+
+        Raises:
+            ValueError: If any value is invalid, listing all of them
+        """
+        group = cls(name, weight, tasks=[], **kwargs)
+        n = len(names)
+
+        def column(values: Sequence[float | None] | None, label: str) -> np.ndarray:
+            if values is None:
+                return np.full(n, np.nan)
+            array = np.array(values, dtype=float)  # None becomes NaN
+            if array.shape != (n,):
+                msg = f"{label} has {array.size} values for {n} tasks"
+                raise ValueError(msg)
+            return array
+
+        grade = column(grades, "grades")
+        base = column(base_grades, "base_grades")
+        expected = column(expected_grades, "expected_grades")
+        pst = column(psts, "psts")
+
+        errors = [
+            f"task #{i + 1}: name {task_name!r} is not a string"
+            for i, task_name in enumerate(names)
+            if not isinstance(task_name, str)
+        ]
+        for label, values, valid in [
+            ("grade", grade, (grade >= 0) & (grade <= 1)),
+            ("base_grade", base, (base >= 0) & (base <= 1)),
+            ("expected_grade", expected, (expected >= 0) & (expected <= 1)),
+            ("pst", pst, pst >= 0),
+        ]:
+            errors.extend(
+                f"task {names[i]!r}: {label} {values[i]} is out of range"
+                for i in np.flatnonzero(~(valid | np.isnan(values)))
+            )
+        if errors:
+            msg = f"{len(errors)} invalid values in grading group {name!r}:\n" + "\n".join(errors)
+            raise ValueError(msg)
+
+        # Fill in the group defaults for the whole batch
+        base = np.where(np.isnan(base), group.base_grade, base)
+        expected = np.where(np.isnan(expected), group.expected_grade, expected)
+        pst = np.where(np.isnan(pst), group.default_pst, pst)
+
+        stamp = next_version()
+        tasks = []
+        for task_name, g, b, e, p in zip(
+            names, grade.tolist(), base.tolist(), expected.tolist(), pst.tolist(), strict=True
+        ):
+            task = object.__new__(Task)
+            task.__dict__.update(
+                name=task_name,
+                grade=None if math.isnan(g) else g,  # NaN means ungraded
+                base_grade=b,
+                pst=p,
+                expected_grade=e,
+                _version=stamp,
+                _structure_version=stamp,
+            )
+            tasks.append(task)
+        group.tasks = tasks
+        return group
+
+    @classmethod
+    def from_records(
+        cls, name: str, weight: float, records: Iterable[Mapping[str, Any]], **kwargs: Any
+    ) -> "GradingGroup":
+        """Build a group from task records, validating them all at once.
+
+        Args:
+            name: Name of the group
+            weight: Weight of the group
+            records: Mappings with a ``name`` and optional ``grade``, ``base_grade``,
+                ``expected_grade`` and ``pst`` keys
+            **kwargs: Other GradingGroup arguments (default_pst, base_grade, ...)
+
+        Returns:
+            GradingGroup: The new group
+        """
+        records = list(records)
+        return cls.from_arrays(
+            name,
+            weight,
+            [record["name"] for record in records],
+            grades=[record.get("grade") for record in records],
+            base_grades=[record.get("base_grade") for record in records],
+            expected_grades=[record.get("expected_grade") for record in records],
+            psts=[record.get("pst") for record in records],
+            **kwargs,
+        )
+
+    def __setattr__(self, key: str, value: object) -> None:
+        super().__setattr__(key, value)
+        if key in GROUP_FIELDS:
+            super().__setattr__("_version", next_version())
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Copies and pickles rebuild their own order statistics on first use
+        state = self.__dict__.copy()
+        state.pop("_order", None)
+        return state
+
+    def _order_key(self) -> tuple[int, tuple[Task, ...]]:
+        """The group's version stamp and its tasks, which the order statistics reflect.
+
+        The tasks are part of the key because replacing one in place
+        (``group.tasks[i] = task``) does not change the group's version.
+        """
+        return self._version, tuple(self.tasks)
+
+    def _get_order(self) -> dict[str, TopSum]:
+        """The order statistics of a dropping group, (re)built if missing or out of date."""
+        key = self._order_key()
+        cached = self.__dict__.get("_order")
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        if cached is not None:
+            for task in set(cached[0][1]).difference(self.tasks):
+                task.remove_listener(self)
+        kept = kept_count(len(self.tasks), self.drop_lowest)
+        order = {}
+        for kind, value_of in DROP_VALUES.items():
+            values = ((task, value_of(task)) for task in self.tasks)
+            order[kind] = TopSum(kept, ((t, v) for t, v in values if v is not None))
+        for task in self.tasks:
+            task.add_listener(self)
+        self.__dict__["_order"] = (key, order)
+        return order
+
+    def task_changed(self, task: Task) -> None:
+        """Update the order statistics after a change to one of the group's tasks."""
+        cached = self.__dict__.get("_order")
+        # Every task of the group has a "true" value; others are no longer in the group
+        if cached is not None and task in cached[1]["true"]:
+            _update_order(cached[1], task)
+
+    def _kept_average(self, kind: str) -> float:
+        """Average of the kept grades of a dropping group, for a kind of grade."""
+        if not self.tasks:
+            return 0
+        top = self._get_order()[kind]
+        return top.total / top.keep
+
+    def swap_task(self, task: Task, copy: Task) -> None:
+        """Replace a task with an equal copy, without changing the group's version."""
+        cached = self.__dict__.get("_order")
+        up_to_date = cached is not None and cached[0] == self._order_key()
+        self.tasks[self.tasks.index(task)] = copy
+        if up_to_date:
+            order = cached[1]
+            task.remove_listener(self)
+            for top in order.values():
+                top.discard(task)
+            _update_order(order, copy)
+            copy.add_listener(self)
+            self.__dict__["_order"] = (self._order_key(), order)
+
+    def _apply_task_defaults(self, task: Task) -> None:
+        """Fill in a task's unset fields from the group defaults."""
+        if task.pst is None:
+            task.pst = self.default_pst
+        if task.base_grade is None:
+            task.base_grade = self.base_grade
+        if task.expected_grade is None:
+            task.expected_grade = self.expected_grade
+
+    def get_version(self) -> int:
+        """Version stamp that changes whenever the group or any of its tasks change."""
+        return max(self._version, max((task.get_version() for task in self.tasks), default=0))
+
+    def get_structure_version(self) -> int:
+        """Version stamp that changes whenever anything but a task grade changes."""
+        return max(
+            self._version,
+            max((task.get_structure_version() for task in self.tasks), default=0),
+        )
+
+    def add_task(self, task: Task) -> None:
+        """Append a task to the group, filling in its defaults.
+
+        Args:
+            task (Task): Task to add
+        """
+        assert isinstance(task, Task)
+        self._apply_task_defaults(task)
+        self.tasks.append(task)
+        self._version = next_version()
+
+    def remove_task(self, task: Union[Task, str]) -> Task:
+        """Remove a task from the group.
+
+        Args:
+            task (Task|str): Task object or task name
+
+        Returns:
+            Task: The removed task
+        """
+        if isinstance(task, str):
+            task = self.get_task(task)
+        self.tasks.remove(task)
+        self._version = next_version()
+        task.remove_listener(self)
+        return task
 
     def __str__(self) -> str:
         """Returns a Rich-formatted string representation of the grading group."""
@@ -93,6 +383,8 @@ class GradingGroup:
 
     def get_raw_contribution(self) -> float:
         """Calculate the raw grade contribution before weighting."""
+        if self.drop_lowest:
+            return self._kept_average("grade")
         return self.grading_function(self.tasks)
 
     def get_contribution(self) -> float:
@@ -113,7 +405,7 @@ class GradingGroup:
         assert isinstance(task, Task)
 
         grade = task.grade if task.grade is not None else task.base_grade
-        total_tasks = len(self.tasks)
+        total_tasks = kept_count(len(self.tasks), self.drop_lowest)
         return self.weight * (grade / total_tasks)
 
     def get_max_task_contribution(self, task: Union[Task, str]) -> float:
@@ -130,7 +422,7 @@ class GradingGroup:
         assert isinstance(task, Task)
 
         grade = 1
-        total_tasks = len(self.tasks)
+        total_tasks = kept_count(len(self.tasks), self.drop_lowest)
         return self.weight * (grade / total_tasks)
 
     def get_task(self, name: str) -> Task:
@@ -164,7 +456,7 @@ class GradingGroup:
         assert isinstance(task, Task)
 
         weight = self.weight
-        total_tasks = len(self.tasks)
+        total_tasks = kept_count(len(self.tasks), self.drop_lowest)
         return weight * (task.get_marginal_grade_per_hour() / total_tasks)
 
     def get_current_raw_contribution(self) -> float:
@@ -184,6 +476,10 @@ class GradingGroup:
         For the current grade calculation, we want this to represent the
         actual grade earned on completed work.
         """
+        if self.drop_lowest:
+            # Graded tasks fill the kept slots, highest first
+            return self._kept_average("current") * self.weight
+
         completed_tasks = [task for task in self.tasks if task.grade is not None]
         if not completed_tasks:
             return 0
@@ -200,6 +496,8 @@ class GradingGroup:
 
     def get_true_raw_contribution(self) -> float:
         """Calculate raw contribution assuming no work done."""
+        if self.drop_lowest:
+            return self._kept_average("true")
         return self.true_grading_function(self.tasks)
 
     def get_true_contribution(self) -> float:
@@ -208,6 +506,8 @@ class GradingGroup:
 
     def get_expected_raw_contribution(self) -> float:
         """Returns the expected raw grade (before weight) for this grading group."""
+        if self.drop_lowest:
+            return self._kept_average("expected")
         if not self.tasks:
             return 0
 
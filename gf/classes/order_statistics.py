@@ -0,0 +1,115 @@
+"""Running sums of the largest values of a multiset, for groups dropping their lowest grades."""
+
+from collections.abc import Hashable, Iterable
+from heapq import heapify, heappop, heappush
+from itertools import count
+
+# Rebuild the heaps once stale entries outnumber live ones by this much
+_COMPACT_SLACK = 32
+
+
+class TopSum:
+    """Sum of the ``keep`` largest values of a keyed multiset, under O(log n) updates.
+
+    The values are split between a min-heap of the kept (largest) values and a
+    max-heap of the others. Replacing or removing a value leaves its heap
+    entry in place; stale entries are recognized by their sequence number and
+    discarded when they reach the top of a heap. Each update moves at most a
+    couple of entries between the heaps.
+    """
+
+    def __init__(self, keep: int, items: Iterable[tuple[Hashable, float]] = ()) -> None:
+        self.keep = keep
+        self.total = 0.0
+        # key -> (value, sequence number, whether it is kept)
+        self._entries: dict[Hashable, tuple[float, int, bool]] = {}
+        self._kept: list[tuple[float, int, Hashable]] = []
+        self._others: list[tuple[float, int, Hashable]] = []  # Negated values
+        self._n_kept = 0
+        self._sequence = count()
+        for key, value in items:
+            self._entries[key] = (value, next(self._sequence), False)
+        self._rebuild()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def _rebuild(self) -> None:
+        """Split the entries between fresh heaps (O(n log n))."""
+        ranked = sorted(self._entries.items(), key=lambda item: item[1][0], reverse=True)
+        self._kept, self._others = [], []
+        self.total = 0.0
+        for i, (key, (value, sequence, _)) in enumerate(ranked):
+            kept = i < self.keep
+            self._entries[key] = (value, sequence, kept)
+            if kept:
+                self._kept.append((value, sequence, key))
+                self.total += value
+            else:
+                self._others.append((-value, sequence, key))
+        heapify(self._kept)
+        heapify(self._others)
+        self._n_kept = len(self._kept)
+
+    def _peek(self, heap: list[tuple[float, int, Hashable]]) -> tuple[float, int, Hashable] | None:
+        """The top live entry of a heap, after discarding stale ones."""
+        while heap:
+            _, sequence, key = heap[0]
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == sequence:
+                return heap[0]
+            heappop(heap)
+        return None
+
+    def _demote(self) -> None:
+        value, sequence, key = heappop(self._kept)
+        self._entries[key] = (value, sequence, False)
+        heappush(self._others, (-value, sequence, key))
+        self.total -= value
+        self._n_kept -= 1
+
+    def _promote(self) -> None:
+        negated, sequence, key = heappop(self._others)
+        self._entries[key] = (-negated, sequence, True)
+        heappush(self._kept, (-negated, sequence, key))
+        self.total -= negated
+        self._n_kept += 1
+
+    def _rebalance(self) -> None:
+        while self._n_kept > self.keep and self._peek(self._kept):
+            self._demote()
+        while self._n_kept < self.keep and self._peek(self._others):
+            self._promote()
+        while (
+            self._peek(self._kept)
+            and self._peek(self._others)
+            and -self._others[0][0] > self._kept[0][0]
+        ):
+            self._demote()
+            self._promote()
+        if len(self._kept) + len(self._others) > 2 * len(self._entries) + _COMPACT_SLACK:
+            self._rebuild()
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None and entry[2]:
+            self.total -= entry[0]
+            self._n_kept -= 1
+
+    def set(self, key: Hashable, value: float) -> None:
+        """Add a value, or replace the value stored under a key."""
+        self._remove(key)
+        sequence = next(self._sequence)
+        self._entries[key] = (value, sequence, True)
+        heappush(self._kept, (value, sequence, key))
+        self.total += value
+        self._n_kept += 1
+        self._rebalance()
+
+    def discard(self, key: Hashable) -> None:
+        """Remove the value stored under a key, if any."""
+        self._remove(key)
+        self._rebalance()
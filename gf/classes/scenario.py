@@ -0,0 +1,121 @@
+"""Copy-on-write what-if branches of a course."""
+
+from collections.abc import Iterable
+import copy
+from typing import TYPE_CHECKING, Any, Self
+
+from .course import Course
+from .task import TASK_FIELDS, Task
+
+if TYPE_CHECKING:
+    from .grading_group import GradingGroup
+
+
+class Scenario(Course):
+    """A what-if branch of a course that never modifies the course it came from.
+
+    A scenario starts out sharing every grading group and task with its base.
+    The first change to a task copies that task and the list of tasks in its
+    group (both shallow copies). Everything else stays shared, so a branch
+    costs O(size of the groups it touches) instead of a deepcopy of the
+    whole course. All of Course's ``get_*`` methods work on it unchanged.
+
+    Scenarios nest: ``scenario.scenario()`` branches off the scenario.
+    Changes are recorded in ``deltas``, which include the base's deltas when
+    nested. Changes must go through ``set_grade`` or ``update_task``: tasks
+    returned by ``get_task`` may still be shared with the base.
+
+    Example:
+        with course.scenario("Ace the final") as s:
+            s.set_grade("Final", 1.0)
+            s.get_grade()
+    """
+
+    def __init__(self, base: Course, name: str | None = None) -> None:
+        # Shares the base's attributes; grading_groups gets its own list so that
+        # copied groups can be swapped in
+        self.__dict__.update(base.__dict__)
+        self.name = name if name is not None else base.name
+        self.grading_groups = list(base.grading_groups)
+        self.base = base
+        self.deltas: dict[str, dict[str, Any]] = {
+            task: dict(fields) for task, fields in getattr(base, "deltas", {}).items()
+        }
+        self._owned_groups: dict[int, GradingGroup] = {}
+        self._owned_tasks: dict[int, Task] = {}
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        # Nothing to undo: the base course was never modified
+        return None
+
+    def _own_task(self, name: str) -> Task:
+        """Return this scenario's own copy of a task, copying it (and its group) on first write."""
+        task = self.get_task(name)
+        if id(task) in self._owned_tasks:
+            return task
+
+        group = self.get_parent(task)
+        if id(group) not in self._owned_groups:
+            index = self.grading_groups.index(group)
+            group = copy.copy(group)
+            group.tasks = list(group.tasks)
+            self.grading_groups[index] = group
+            self._owned_groups[id(group)] = group
+
+        owned = copy.copy(task)
+        group.swap_task(task, owned)
+        self._owned_tasks[id(owned)] = owned
+        return owned
+
+    def update_task(self, name: str, **fields: Any) -> None:
+        """Change fields of a task in this scenario only.
+
+        Args:
+            name: Name of the task
+            **fields: New values for any of the task's fields (see TASK_FIELDS)
+        """
+        unknown = set(fields) - TASK_FIELDS
+        if unknown:
+            msg = f"Unknown task fields: {', '.join(sorted(unknown))}"
+            raise ValueError(msg)
+        task = self._own_task(name)
+        for field, value in fields.items():
+            setattr(task, field, value)
+        self.deltas.setdefault(name, {}).update(fields)
+
+    def set_grade(self, name: str, grade: float | None) -> None:
+        """Set (or, with None, clear) a task's grade in this scenario only."""
+        if grade is not None:
+            self._own_task(name).set_grade(grade)
+            self.deltas.setdefault(name, {})["grade"] = grade
+        else:
+            self.update_task(name, grade=None)
+
+
+def compare_scenarios(scenarios: Iterable[Course]) -> list[dict[str, Any]]:
+    """Evaluate courses or scenarios side by side.
+
+    Args:
+        scenarios: Scenarios (or plain courses) to compare
+
+    Returns:
+        list[dict]: One record per scenario with its name, deltas and grades
+    """
+    records = []
+    for scenario in scenarios:
+        grade = scenario.get_grade()
+        records.append(
+            {
+                "scenario": scenario.name,
+                "deltas": getattr(scenario, "deltas", {}),
+                "min_work_grade": grade,
+                "expected_grade": scenario.get_expected_grade(),
+                "current_grade": scenario.get_current_grade(),
+                "no_work_grade": scenario.get_true_grade(),
+                "letter_grade": scenario.get_letter_grade(grade),
+            }
+        )
+    return records
@@ -0,0 +1,178 @@
+"""Day-by-day study schedules that respect task due dates.
+
+The schedule turns the predicted study time (``pst``) of every ungraded
+task into blocks of hours on days, never exceeding a per-day cap. Each
+day, the hours go to the released task with the earliest due date, and
+ties go to the task with the higher credit-weighted MGPH (the rate the
+study frontier uses). Tasks without a due date come last.
+
+A single sweep over the days does this with a heap of released tasks, so
+a schedule takes O((T + D) log T) for T tasks over D days. Days with
+nothing released are skipped in one step.
+"""
+
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import date
+import heapq
+from math import inf
+from typing import Union
+
+from .course import Course
+
+# Hours left below this are rounding error rather than work
+_EPSILON = 1e-9
+_DAYS_PER_WEEK = 7
+
+
+@dataclass(frozen=True, eq=False)
+class StudyItem:
+    """The remaining study time of one ungraded task."""
+
+    course: Course
+    task: str
+    hours: float
+    rate: float  # Credit-weighted MGPH, the tie-break between equal due dates
+    due: date | None = None
+    release: date | None = None
+
+
+@dataclass(frozen=True)
+class StudyBlock:
+    """Hours spent on one task on one day."""
+
+    day: date
+    item: StudyItem
+    hours: float
+
+
+@dataclass
+class StudySchedule:
+    """The blocks of a schedule in day order, and when each task gets done."""
+
+    start: date
+    blocks: list[StudyBlock] = field(default_factory=list)
+    finished: dict[StudyItem, date] = field(default_factory=dict)
+    # Hours left when the schedule ran out of days
+    unscheduled: dict[StudyItem, float] = field(default_factory=dict)
+
+    @property
+    def late(self) -> list[StudyItem]:
+        """Tasks finished after their due date."""
+        return [
+            item
+            for item, day in self.finished.items()
+            if item.due and day.toordinal() > item.due.toordinal()
+        ]
+
+    def hours_by_day(self) -> dict[date, float]:
+        """Total hours scheduled on each day with any work."""
+        hours: dict[date, float] = {}
+        for block in self.blocks:
+            hours[block.day] = hours.get(block.day, 0.0) + block.hours
+        return hours
+
+
+def study_items(courses: Iterable[Course]) -> list[StudyItem]:
+    """The remaining study time of every ungraded task with a predicted study time."""
+    items = []
+    for course in courses:
+        for group in course.grading_groups:
+            for task in group.tasks:
+                if task.grade is not None or not task.pst or task.pst < 0:
+                    continue
+                rate = group.get_marginal_grade_per_hour(task) * course.credits
+                items.append(StudyItem(course, task.name, task.pst, rate, task.due, task.release))
+    return items
+
+
+def _daily_caps(hours_per_day: Union[float, Sequence[float]]) -> tuple[float, ...]:
+    """Hour caps for each weekday, Monday first."""
+    if isinstance(hours_per_day, (int, float)):
+        hours_per_day = (hours_per_day,) * _DAYS_PER_WEEK
+    caps = tuple(float(cap) for cap in hours_per_day)
+    if len(caps) != _DAYS_PER_WEEK:
+        msg = f"Expected one hour cap or one per weekday, got {len(caps)}"
+        raise ValueError(msg)
+    if any(cap < 0 for cap in caps) or not any(caps):
+        msg = "Hour caps must be non-negative, with some hours in the week"
+        raise ValueError(msg)
+    return caps
+
+
+def build_schedule(
+    items: Iterable[StudyItem],
+    start: date,
+    hours_per_day: Union[float, Sequence[float]] = 4,
+    until: date | None = None,
+    days_off: Mapping[date, float] | None = None,
+) -> StudySchedule:
+    """Schedule study items day by day, earliest due date first.
+
+    Args:
+        items: Tasks to schedule (see study_items)
+        start: First day of the schedule; tasks released earlier start then
+        hours_per_day: Hour cap for every day, or one per weekday (Monday first)
+        until: Last day to schedule (defaults to whenever everything is done)
+        days_off: Hour caps of particular days, overriding ``hours_per_day``
+
+    Returns:
+        StudySchedule: The schedule
+    """
+    items = list(items)
+    caps = _daily_caps(hours_per_day)
+    overrides = {day.toordinal(): hours for day, hours in (days_off or {}).items()}
+    first = start.toordinal()
+    last = until.toordinal() if until is not None else inf
+
+    # Items waiting for their release day, and the released heap of
+    # (due day, -rate, position, hours left) entries
+    pending = sorted(
+        (max(item.release.toordinal(), first) if item.release else first, i)
+        for i, item in enumerate(items)
+    )
+    released: list[list] = []
+    schedule = StudySchedule(start)
+    day, next_pending = first, 0
+    while day <= last and (released or next_pending < len(pending)):
+        if not released:
+            # Nothing to do until the next release
+            day = max(day, pending[next_pending][0])
+            if day > last:
+                break
+        while next_pending < len(pending) and pending[next_pending][0] <= day:
+            i = pending[next_pending][1]
+            item = items[i]
+            due = item.due.toordinal() if item.due else inf
+            heapq.heappush(released, [due, -item.rate, i, item.hours])
+            next_pending += 1
+
+        capacity = overrides.get(day, caps[(day - 1) % _DAYS_PER_WEEK])  # Ordinal 1 is a Monday
+        while capacity > _EPSILON and released:
+            entry = released[0]
+            item = items[entry[2]]
+            hours = min(entry[3], capacity)
+            schedule.blocks.append(StudyBlock(date.fromordinal(day), item, hours))
+            capacity -= hours
+            entry[3] -= hours
+            if entry[3] <= _EPSILON:
+                heapq.heappop(released)
+                schedule.finished[item] = date.fromordinal(day)
+        day += 1
+
+    for entry in released:
+        schedule.unscheduled[items[entry[2]]] = entry[3]
+    for _, i in pending[next_pending:]:
+        schedule.unscheduled[items[i]] = items[i].hours
+    return schedule
+
+
+def schedule_courses(
+    courses: Iterable[Course],
+    start: date,
+    hours_per_day: Union[float, Sequence[float]] = 4,
+    until: date | None = None,
+    days_off: Mapping[date, float] | None = None,
+) -> StudySchedule:
+    """Schedule the remaining study time of every ungraded task in some courses."""
+    return build_schedule(study_items(courses), start, hours_per_day, until, days_off)
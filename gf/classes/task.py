@@ -1,12 +1,48 @@
+from datetime import date
+from itertools import count
+from typing import TYPE_CHECKING, Optional, Protocol
+from weakref import WeakSet
+
+if TYPE_CHECKING:
+    from .grading_group import GradingGroup
+
+# Stamps shared by every model object, so no two mutations ever get the same version
+_version_clock = count(1)
+
+# Task attributes whose changes invalidate anything computed from the task
+TASK_FIELDS = frozenset({"name", "grade", "base_grade", "expected_grade", "pst", "due", "release"})
+
+
 def is_proper_fraction(x):
     return all((isinstance(x, (float, int)), x >= 0, x <= 1))
 
 
+def next_version() -> int:
+    """Return a fresh, globally increasing version stamp."""
+    return next(_version_clock)
+
+
+class Versioned(Protocol):
+    """A model object (task, grading group or course) with a version stamp."""
+
+    def get_version(self) -> int:
+        """Version stamp that changes whenever the object changes."""
+        ...
+
+
 class Task:
     """base_grade is the grade I could get without trying very much.
     pst = "predicted something time"?
     """
 
+    # Groups to notify of changes (set while the task is in a group dropping its lowest grades)
+    _listeners: Optional["WeakSet[GradingGroup]"] = None
+
+    # Day the task is due (work on that day still counts) and day it can be started.
+    # Most tasks have neither, so they stay class attributes until set.
+    due: date | None = None
+    release: date | None = None
+
     def __init__(
         self,
         name: str,
@@ -14,7 +50,10 @@ class Task:
         base_grade: float = 0,
         expected_grade: float | None = None,
         pst: float | None = None,
-    ):
+        *,
+        due: date | None = None,
+        release: date | None = None,
+    ) -> None:
         assert isinstance(name, str)
         if grade is not None:
             assert is_proper_fraction(grade)
@@ -27,6 +66,47 @@ class Task:
         # if expected_grade == None:
         #     expected_grade = base_grade
         self.expected_grade = expected_grade
+        if due is not None:
+            self.due = due
+        if release is not None:
+            self.release = release
+
+    def __setattr__(self, key: str, value: object) -> None:
+        super().__setattr__(key, value)
+        if key in TASK_FIELDS:
+            stamp = next_version()
+            super().__setattr__("_version", stamp)
+            if key != "grade":
+                super().__setattr__("_structure_version", stamp)
+            # Groups dropping their lowest grades keep order statistics over their tasks
+            if self._listeners:
+                for group in list(self._listeners):
+                    group.task_changed(self)
+
+    def __getstate__(self) -> dict:
+        # Copies belong to no group until one starts tracking them
+        state = self.__dict__.copy()
+        state.pop("_listeners", None)
+        return state
+
+    def add_listener(self, group: "GradingGroup") -> None:
+        """Notify a group of every change to this task (see GradingGroup.task_changed)."""
+        if self._listeners is None:
+            self._listeners = WeakSet()
+        self._listeners.add(group)
+
+    def remove_listener(self, group: "GradingGroup") -> None:
+        """Stop notifying a group of changes to this task."""
+        if self._listeners is not None:
+            self._listeners.discard(group)
+
+    def get_version(self) -> int:
+        """Version stamp that changes whenever any of the task's fields change."""
+        return self._version
+
+    def get_structure_version(self) -> int:
+        """Version stamp that changes whenever a field other than the grade changes."""
+        return self._structure_version
 
     def get_marginal_grade_per_hour(self) -> float:
         """MGPH = dG/dt = d/dt ((max_grade - base_grade)/(pst)*t + base_grade) = (max_grade - base_grade)/pst = (1-base_grade)/pst"""
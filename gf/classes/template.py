@@ -0,0 +1,445 @@
+"""Course templates shared by many students, who each only store their own grades."""
+
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from datetime import date
+import heapq
+from itertools import islice
+from types import MappingProxyType
+from typing import Union
+
+from .course import Course
+from .grading_functions import drop_lowest_raw_grade, is_linear_grading, kept_count
+from .grading_group import DROP_VALUES, GradingGroup
+from .task import Task, next_version
+
+
+@dataclass(frozen=True, slots=True)
+class TaskSpec:
+    """Immutable structure of a task: everything except the student's grade."""
+
+    name: str
+    base_grade: float
+    expected_grade: float | None
+    pst: float | None
+    due: date | None = None
+    release: date | None = None
+
+    def create_task(self) -> Task:
+        """Create a fresh, ungraded Task with this structure."""
+        return Task(
+            self.name,
+            base_grade=self.base_grade,
+            expected_grade=self.expected_grade,
+            pst=self.pst,
+            due=self.due,
+            release=self.release,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class GroupSpec:
+    """Immutable structure of a grading group, with its ungraded sums precomputed."""
+
+    name: str
+    weight: float
+    tasks: tuple[TaskSpec, ...]
+    default_pst: float
+    base_grade: float
+    expected_grade: float | None
+    late_policy: str | None
+    grading_function: Callable
+    true_grading_function: Callable
+    expected_grading_function: Callable
+    drop_lowest: int
+    base_sum: float
+    expected_sum: float
+
+    @classmethod
+    def from_group(cls, group: GradingGroup) -> "GroupSpec":
+        """Capture the structure of a grading group, without its grades."""
+        tasks = tuple(
+            TaskSpec(
+                task.name,
+                task.base_grade,
+                task.expected_grade,
+                task.pst,
+                task.due,
+                task.release,
+            )
+            for task in group.tasks
+        )
+        return cls(
+            name=group.name,
+            weight=group.weight,
+            tasks=tasks,
+            default_pst=group.default_pst,
+            base_grade=group.base_grade,
+            expected_grade=group.expected_grade,
+            late_policy=group.late_policy,
+            grading_function=group.grading_function,
+            true_grading_function=group.true_grading_function,
+            expected_grading_function=group.expected_grading_function,
+            drop_lowest=group.drop_lowest,
+            base_sum=sum(task.base_grade for task in tasks),
+            expected_sum=sum(task.expected_grade for task in tasks),
+        )
+
+    @property
+    def is_linear(self) -> bool:
+        """Whether the group uses the default (averaging) grading functions."""
+        return is_linear_grading(
+            self.grading_function, self.true_grading_function, self.drop_lowest
+        )
+
+
+def _without(values: Iterable[float], removed: Counter) -> Iterator[float]:
+    """Yield the values, skipping each removed value as many times as it was removed."""
+    for value in values:
+        if removed[value]:
+            removed[value] -= 1
+        else:
+            yield value
+
+
+class CourseTemplate:
+    """The shared, immutable structure of a course.
+
+    Many students taking the same course share one template. Each student gets
+    a StudentCourse that only stores what differs from it (see ``instantiate``).
+    Grades in the source course are not part of the template.
+    """
+
+    def __init__(self, course: Course) -> None:
+        self.name = course.name
+        self.care_factor = course.care_factor
+        self.grading_boundaries = MappingProxyType(dict(course.grading_boundaries))
+        self.grade_utils = MappingProxyType(dict(course.grade_utils))
+        self.late_policy = course.late_policy
+        self.credits = course.credits
+        self.groups = tuple(GroupSpec.from_group(group) for group in course.grading_groups)
+
+        # Task name -> (group index, task index). Like Course.get_task, the first
+        # task with a given name wins.
+        index: dict[str, tuple[int, int]] = {}
+        for group_idx, group in enumerate(self.groups):
+            for task_idx, task in enumerate(group.tasks):
+                index.setdefault(task.name, (group_idx, task_idx))
+        self.index = MappingProxyType(index)
+
+        # Contributions of the linear groups with no grades at all
+        self.base_grade = sum(
+            group.weight * group.base_sum / len(group.tasks)
+            for group in self.groups
+            if group.is_linear and group.tasks
+        )
+        self.expected_grade = sum(
+            group.weight * group.expected_sum / len(group.tasks)
+            for group in self.groups
+            if group.tasks and not group.drop_lowest
+        )
+
+        # Shared, never graded tasks of the groups that are not plain averages, and
+        # the template values of each kind in the ones that drop grades, highest first
+        self.nonlinear_tasks = {
+            group_idx: tuple(task.create_task() for task in group.tasks)
+            for group_idx, group in enumerate(self.groups)
+            if not group.is_linear
+        }
+        self.drop_values = {
+            (group_idx, kind): tuple(
+                sorted((v for v in map(value_of, tasks) if v is not None), reverse=True)
+            )
+            for group_idx, tasks in self.nonlinear_tasks.items()
+            if self.groups[group_idx].drop_lowest
+            for kind, value_of in DROP_VALUES.items()
+        }
+        self._contributions: dict[tuple[int, str], float] = {}
+        self.structure_version = next_version()
+
+    def contribution(self, group_idx: int, kind: str) -> float:
+        """Weighted contribution of a nonlinear group without grades (computed once)."""
+        key = (group_idx, kind)
+        if key not in self._contributions:
+            group = self.groups[group_idx]
+            if group.drop_lowest:
+                raw = drop_lowest_raw_grade(
+                    self.drop_values[key], len(group.tasks), group.drop_lowest
+                )
+            elif kind == "true":
+                raw = group.true_grading_function(list(self.nonlinear_tasks[group_idx]))
+            else:
+                raw = group.grading_function(list(self.nonlinear_tasks[group_idx]))
+            self._contributions[key] = raw * group.weight
+        return self._contributions[key]
+
+    def instantiate(
+        self, grades: Mapping[str, float] | None = None, name: str | None = None
+    ) -> "StudentCourse":
+        """Create a student's course from this template.
+
+        Args:
+            grades: The student's grades by task name
+            name: Course name (defaults to the template's)
+
+        Returns:
+            StudentCourse: A course that only stores the given grades
+        """
+        student = StudentCourse(self, name)
+        for task_name, grade in (grades or {}).items():
+            student.set_grade(task_name, grade)
+        return student
+
+    def __repr__(self) -> str:
+        return f"CourseTemplate({self.name})"
+
+
+class StudentCourse:
+    """One student's view of a CourseTemplate.
+
+    Tasks are copied out of the template the first time they are accessed with
+    ``get_task`` or graded, so memory and construction time scale with the
+    number of tasks the student touches rather than the size of the course.
+    The grades are computed from the template's precomputed sums, corrected
+    for the touched tasks.
+
+    Reading ``grading_groups`` (as the display code does) materializes the
+    whole course once. From then on the student behaves exactly like a full
+    Course, and structural changes made through the groups stay local to
+    the student.
+    """
+
+    __slots__ = ("_course", "_tasks", "_version", "name", "template")
+
+    # These only rely on the rest of the Course interface
+    get_letter_grade = Course.get_letter_grade
+    get_raw_utility = Course.get_raw_utility
+
+    def __init__(self, template: CourseTemplate, name: str | None = None) -> None:
+        self.template = template
+        self.name = name if name is not None else template.name
+        self._tasks: dict[str, Task] = {}
+        self._course: Course | None = None
+        self._version = next_version()
+
+    @property
+    def care_factor(self) -> float:
+        """How much the student cares about the course (see Course)."""
+        return self._course.care_factor if self._course else self.template.care_factor
+
+    @property
+    def grading_boundaries(self) -> Mapping[str, tuple[float, float]]:
+        """Percentage range of each letter grade."""
+        if self._course:
+            return self._course.grading_boundaries
+        return self.template.grading_boundaries
+
+    @property
+    def grade_utils(self) -> Mapping[str, float]:
+        """Utility of each letter grade."""
+        return self._course.grade_utils if self._course else self.template.grade_utils
+
+    @property
+    def credits(self) -> float:
+        """Units the course is worth."""
+        return self._course.credits if self._course else self.template.credits
+
+    @property
+    def grading_groups(self) -> list[GradingGroup]:
+        """The grading groups of the materialized course."""
+        return self.materialize().grading_groups
+
+    def materialize(self) -> Course:
+        """Build (once) a full Course for this student, reusing the touched tasks."""
+        if self._course is None:
+            groups = [
+                GradingGroup(
+                    name=spec.name,
+                    weight=spec.weight,
+                    tasks=[self._get_or_copy(task.name) for task in spec.tasks],
+                    default_pst=spec.default_pst,
+                    base_grade=spec.base_grade,
+                    expected_grade=spec.expected_grade,
+                    late_policy=spec.late_policy,
+                    grading_function=spec.grading_function,
+                    true_grading_function=spec.true_grading_function,
+                    expected_grading_function=spec.expected_grading_function,
+                    drop_lowest=spec.drop_lowest,
+                )
+                for spec in self.template.groups
+            ]
+            self._course = Course(
+                name=self.name,
+                care_factor=self.template.care_factor,
+                grading_groups=groups,
+                grading_boundaries=dict(self.template.grading_boundaries),
+                grade_utils=dict(self.template.grade_utils),
+                late_policy=self.template.late_policy,
+                credits=self.template.credits,
+            )
+        return self._course
+
+    def is_materialized(self) -> bool:
+        """Whether the full course has been built."""
+        return self._course is not None
+
+    def _get_or_copy(self, name: str) -> Task:
+        task = self._tasks.get(name)
+        if task is None:
+            group_idx, task_idx = self.template.index[name]
+            task = self._tasks[name] = self.template.groups[group_idx].tasks[task_idx].create_task()
+        return task
+
+    def get_task(self, name: str) -> Task:
+        """Find a task by name, copying it out of the template on first access."""
+        if self._course is not None:
+            return self._course.get_task(name)
+        if name not in self.template.index:
+            raise Exception("Task not found")  # noqa: TRY002, TRY003 - as in Course.get_task
+        return self._get_or_copy(name)
+
+    def set_grade(self, task: str, grade: float) -> None:
+        """Record the student's grade for a task."""
+        self.get_task(task).set_grade(grade)
+
+    def get_parent(self, task: Union[Task, str]) -> GradingGroup:
+        """Find the grading group that contains a task (materializes the course)."""
+        return self.materialize().get_parent(task)
+
+    def get_marginal_grade_per_hour(self, task: Union[Task, str]) -> float:
+        """Calculate the marginal grade increase per hour for a task."""
+        if self._course is not None:
+            return self._course.get_marginal_grade_per_hour(task)
+        if isinstance(task, str):
+            task = self.get_task(task)
+        group = self.template.groups[self.template.index[task.name][0]]
+        n_tasks = kept_count(len(group.tasks), group.drop_lowest)
+        return group.weight * (task.get_marginal_grade_per_hour() / n_tasks)
+
+    def get_version(self) -> int:
+        """Version stamp that changes whenever the student's course changes."""
+        if self._course is not None:
+            return max(self._version, self._course.get_version())
+        return max(
+            self._version, max((task.get_version() for task in self._tasks.values()), default=0)
+        )
+
+    def get_structure_version(self) -> int:
+        """Version stamp that changes whenever anything but a task grade changes."""
+        if self._course is not None:
+            return max(self._version, self._course.get_structure_version())
+        return max(
+            self._version,
+            self.template.structure_version,
+            max((task.get_structure_version() for task in self._tasks.values()), default=0),
+        )
+
+    def _touched(self) -> list[tuple[GroupSpec, TaskSpec, Task]]:
+        """The touched tasks with their template group and task specs."""
+        touched = []
+        for name, task in self._tasks.items():
+            group_idx, task_idx = self.template.index[name]
+            group = self.template.groups[group_idx]
+            touched.append((group, group.tasks[task_idx], task))
+        return touched
+
+    def _nonlinear_contribution(self, kind: str) -> float:
+        """Weighted contribution of the groups that are not plain averages.
+
+        Groups without touched tasks contribute their template contribution. In
+        groups that drop grades, the touched tasks' values are merged into the
+        template's sorted values; custom grading functions get the template's
+        tasks with the touched ones swapped in.
+
+        Args:
+            kind: "grade", "true", "expected" or "current" (see DROP_VALUES). Groups
+                with custom grading functions only differ for the first two.
+        """
+        template = self.template
+        touched: dict[int, list[tuple[int, Task]]] = {}
+        for name, task in self._tasks.items():
+            group_idx, task_idx = template.index[name]
+            if group_idx in template.nonlinear_tasks:
+                touched.setdefault(group_idx, []).append((task_idx, task))
+
+        total = 0.0
+        for group_idx, spec in enumerate(template.groups):
+            if spec.is_linear or not (spec.drop_lowest or kind in ("grade", "true")):
+                continue
+            overrides = touched.get(group_idx)
+            if not overrides:
+                total += template.contribution(group_idx, kind)
+                continue
+            shared = template.nonlinear_tasks[group_idx]
+            if spec.drop_lowest:
+                value_of = DROP_VALUES[kind]
+                removed = Counter(value_of(shared[task_idx]) for task_idx, _ in overrides)
+                added = sorted(
+                    (v for v in (value_of(task) for _, task in overrides) if v is not None),
+                    reverse=True,
+                )
+                values = heapq.merge(
+                    _without(template.drop_values[group_idx, kind], removed), added, reverse=True
+                )
+                kept = kept_count(len(spec.tasks), spec.drop_lowest)
+                raw = sum(islice(values, kept)) / kept
+            else:
+                tasks = list(shared)
+                for task_idx, task in overrides:
+                    tasks[task_idx] = task
+                if kind == "true":
+                    raw = spec.true_grading_function(tasks)
+                else:
+                    raw = spec.grading_function(tasks)
+            total += raw * spec.weight
+        return total
+
+    def get_grade(self) -> float:
+        """Calculate the current grade based on completed and base grades."""
+        if self._course is not None:
+            return self._course.get_grade()
+        grade = self.template.base_grade + self._nonlinear_contribution("grade")
+        for group, spec, task in self._touched():
+            if group.is_linear:
+                effective = task.grade if task.grade is not None else task.base_grade
+                grade += group.weight * (effective - spec.base_grade) / len(group.tasks)
+        return grade
+
+    def get_current_grade(self) -> float:
+        """Calculate the current grade based only on completed assignments."""
+        if self._course is not None:
+            return self._course.get_current_grade()
+        return self._nonlinear_contribution("current") + sum(
+            group.weight * task.grade / len(group.tasks)
+            for group, _, task in self._touched()
+            if task.grade is not None and not group.drop_lowest
+        )
+
+    def get_true_grade(self) -> float:
+        """Calculate the grade assuming no work is done."""
+        if self._course is not None:
+            return self._course.get_true_grade()
+        return self._nonlinear_contribution("true") + sum(
+            group.weight * task.grade / len(group.tasks)
+            for group, _, task in self._touched()
+            if task.grade is not None and group.is_linear
+        )
+
+    def get_expected_grade(self) -> float:
+        """Calculate the expected grade based on expected grades."""
+        if self._course is not None:
+            return self._course.get_expected_grade()
+        grade = self.template.expected_grade + self._nonlinear_contribution("expected")
+        for group, spec, task in self._touched():
+            if group.drop_lowest:
+                continue
+            effective = task.grade if task.grade is not None else task.expected_grade
+            grade += group.weight * (effective - spec.expected_grade) / len(group.tasks)
+        return grade
+
+    def __repr__(self) -> str:
+        return self.name
+
+    def __str__(self) -> str:
+        return str(self.materialize())
@@ -0,0 +1,117 @@
+"""Terms of several courses, and the GPA they forecast."""
+
+from collections.abc import Iterable, Mapping
+
+from .course import Course
+
+# Points per letter grade (MIT's 5.0 scale). Letters missing from the map,
+# like the "?" of a grade outside every boundary, are worth 0 points.
+DEFAULT_GRADE_POINTS = {"A": 5.0, "B": 4.0, "C": 3.0, "D": 2.0, "F": 0.0}
+
+# Forecast scenarios, mapped to the Course method giving the grade in each
+GPA_SCENARIOS = {
+    "no_work": "get_true_grade",
+    "current": "get_current_grade",
+    "min_work": "get_grade",
+    "expected": "get_expected_grade",
+}
+
+
+def gpa(points: float, n_credits: float) -> float:
+    """Credit-weighted average points, or 0 with no credits."""
+    return points / n_credits if n_credits else 0.0
+
+
+class Term:
+    """A set of courses taken together, forecast as a credit-weighted GPA.
+
+    Each course's letter grade in every scenario of GPA_SCENARIOS comes from
+    its own ``grading_boundaries``. Letters are cached per course, and each
+    call only re-evaluates courses whose version changed since the last one.
+    Changing one task grade therefore recomputes one course, not the term.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        courses: Iterable[Course],
+        grade_points: Mapping[str, float] | None = None,
+    ) -> None:
+        self.name = name
+        self.courses = list(courses)
+        self.grade_points = dict(grade_points or DEFAULT_GRADE_POINTS)
+        # id(course) -> (version, credits, letter per scenario)
+        self._cache: dict[int, tuple[int, float, dict[str, str]]] = {}
+
+    def _evaluate(self, course: Course) -> tuple[int, float, dict[str, str]]:
+        letters = {
+            scenario: course.get_letter_grade(getattr(course, method)())
+            for scenario, method in GPA_SCENARIOS.items()
+        }
+        return course.get_version(), course.credits, letters
+
+    def refresh(self) -> int:
+        """Re-evaluate the courses that changed since the last call.
+
+        Returns:
+            int: Number of courses that had to be re-evaluated
+        """
+        current = {id(course): course for course in self.courses}
+        for course_id in set(self._cache) - set(current):
+            del self._cache[course_id]
+
+        recomputed = 0
+        for course_id, course in current.items():
+            cached = self._cache.get(course_id)
+            if cached is None or cached[0] != course.get_version():
+                self._cache[course_id] = self._evaluate(course)
+                recomputed += 1
+        return recomputed
+
+    def get_credits(self) -> float:
+        """Total credits of the term."""
+        self.refresh()
+        return sum(n_credits for _, n_credits, _ in self._cache.values())
+
+    def get_letters(self, course: Course) -> dict[str, str]:
+        """A course's letter grade in every scenario."""
+        self.refresh()
+        return dict(self._cache[id(course)][2])
+
+    def get_points(self) -> dict[str, float]:
+        """Credit-weighted grade points in every scenario."""
+        self.refresh()
+        points = dict.fromkeys(GPA_SCENARIOS, 0.0)
+        for _, n_credits, letters in self._cache.values():
+            for scenario, letter in letters.items():
+                points[scenario] += n_credits * self.grade_points.get(letter, 0.0)
+        return points
+
+    def get_gpa(self) -> dict[str, float]:
+        """The term's GPA in every scenario."""
+        total_credits = self.get_credits()
+        return {
+            scenario: gpa(points, total_credits) for scenario, points in self.get_points().items()
+        }
+
+
+def get_cumulative_gpa(
+    terms: Iterable[Term], prior_credits: float = 0, prior_gpa: float = 0
+) -> dict[str, float]:
+    """Cumulative GPA over several terms, on top of already completed credits.
+
+    Args:
+        terms: Terms to forecast
+        prior_credits: Credits completed before these terms
+        prior_gpa: GPA over the prior credits
+
+    Returns:
+        dict: Cumulative GPA in every scenario
+    """
+    total_credits = prior_credits
+    points = dict.fromkeys(GPA_SCENARIOS, prior_credits * prior_gpa)
+    for term in terms:
+        total_credits += term.get_credits()
+        for scenario, term_points in term.get_points().items():
+            points[scenario] += term_points
+    return {scenario: gpa(total, total_credits) for scenario, total in points.items()}
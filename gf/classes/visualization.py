@@ -1,15 +1,103 @@
+from collections import OrderedDict
+from collections.abc import Callable
+import io
+from threading import Lock
 from typing import TYPE_CHECKING
 
 from rich import box
-from rich.console import Console, Group
+from rich.console import Console, Group, RenderableType
 from rich.panel import Panel
+from rich.segment import Segment, Segments
 from rich.table import Table
 from rich.text import Text
 
+from gf.profiling import count
+
+from .task import Versioned
+
 if TYPE_CHECKING:
     from .grading_group import GradingGroup
 
 
+# Maximum number of rendered panels kept by the render cache
+RENDER_CACHE_SIZE = 256
+
+_render_cache: OrderedDict[tuple, list[Segment]] = OrderedDict()
+_render_cache_lock = Lock()
+# Only used to look up the terminal width; never printed to
+_width_console = Console()
+
+
+def render_segments(
+    obj: Versioned,
+    kind: str,
+    build: Callable[[], RenderableType],
+    width: int | None = None,
+) -> list[Segment]:
+    """Render an object's display, reusing the last render if the object is unchanged.
+
+    Renders are memoized per (object, kind, version, width) in a bounded LRU cache,
+    where the version comes from ``obj.get_version()``.
+
+    Args:
+        obj: A Task, GradingGroup or Course (anything with ``get_version``)
+        kind: Name of the display, so one object can have several
+        build: Creates the renderable when there is no cached render
+        width: Render width (defaults to the terminal width)
+
+    Returns:
+        list[Segment]: The rendered segments
+    """
+    if width is None:
+        width = _width_console.width
+    key = (id(obj), kind, obj.get_version(), width)
+
+    with _render_cache_lock:
+        segments = _render_cache.get(key)
+        if segments is not None:
+            _render_cache.move_to_end(key)
+            count("render_cache.hit")
+            return segments
+
+    count("render_cache.miss")
+    console = Console(width=width, file=io.StringIO(), force_terminal=True)
+    segments = list(console.render(build(), console.options))
+
+    with _render_cache_lock:
+        _render_cache[key] = segments
+        while len(_render_cache) > RENDER_CACHE_SIZE:
+            _render_cache.popitem(last=False)
+    return segments
+
+
+def render_cached(
+    obj: Versioned,
+    kind: str,
+    build: Callable[[], RenderableType],
+    width: int | None = None,
+) -> Segments:
+    """Like render_segments, but returns a renderable that can be passed to console.print."""
+    return Segments(render_segments(obj, kind, build, width))
+
+
+def render_to_string(
+    obj: Versioned,
+    kind: str,
+    build: Callable[[], RenderableType],
+    width: int | None = None,
+) -> str:
+    """Like render_segments, but returns the plain text of the render."""
+    return "".join(
+        segment.text for segment in render_segments(obj, kind, build, width) if not segment.control
+    )
+
+
+def clear_render_cache() -> None:
+    """Drop every cached render."""
+    with _render_cache_lock:
+        _render_cache.clear()
+
+
 def create_grading_group_display(grading_group: "GradingGroup") -> Panel:
     """Create a rich panel display for a grading group.
 
@@ -188,7 +276,6 @@ def grading_group_to_string(grading_group: "GradingGroup") -> str:
     Returns:
         str: String representation of the grading group panel
     """
-    panel = create_grading_group_display(grading_group)
-    console = Console(record=True)
-    console.print(panel)
-    return console.export_text()
+    return render_to_string(
+        grading_group, "group", lambda: create_grading_group_display(grading_group)
+    )
@@ -1,32 +1,38 @@
-"""Grade Forecast CLI package."""
+"""Grade Forecast CLI package.
 
-from gf.cli.display import (
-    display_course_details,
-    display_course_info,
-    display_courses_table,
-    display_task_analysis,
-)
-from gf.cli.interface import interface
-from gf.cli.main import app, compare, course, list, run, summary, task, tasks, update
-from gf.cli.plotting import plot_course_grade_vs_grade
-from gf.cli.utils import find_course, find_task
+The exports are imported on first access, so that importing one submodule
+(such as gf.cli.records) does not load the command-line app and its course
+configs.
+"""
 
-__all__ = [
-    "app",
-    "compare",
-    "course",
-    "display_course_details",
-    "display_course_info",
-    "display_courses_table",
-    "display_task_analysis",
-    "find_course",
-    "find_task",
-    "interface",
-    "list",
-    "plot_course_grade_vs_grade",
-    "run",
-    "summary",
-    "task",
-    "tasks",
-    "update",
-]
+from importlib import import_module
+
+# Exported name -> submodule that defines it
+_EXPORTS = {
+    "app": "main",
+    "compare": "main",
+    "course": "main",
+    "display_course_details": "display",
+    "display_course_info": "display",
+    "display_courses_table": "display",
+    "display_task_analysis": "display",
+    "find_course": "utils",
+    "find_task": "utils",
+    "interface": "interface",
+    "list": "main",
+    "plot_course_grade_vs_grade": "plotting",
+    "run": "main",
+    "summary": "main",
+    "task": "main",
+    "tasks": "main",
+    "update": "main",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> object:
+    if name not in _EXPORTS:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    return getattr(import_module(f"{__name__}.{_EXPORTS[name]}"), name)
@@ -0,0 +1,265 @@
+"""Long-running daemon that answers CLI commands from a warm process.
+
+The daemon imports the course configs, alias table, Rich and matplotlib once
+and keeps them (together with grade updates and render caches) in memory.
+Requests run the normal Typer commands with stdout/stderr captured, so every
+command behaves exactly as it does in-process.
+
+Protocol (Unix socket): the client sends one JSON object followed by EOF and
+receives one JSON object back.
+
+    request:  {"argv": ["summary", "--format", "json"], "width": 120}
+    response: {"exit_code": 0, "stdout": "...", "stderr": "..."}
+
+Output that is not UTF-8 text (``--format arrow``) is sent base64-encoded
+as "stdout_base64" instead of "stdout". Only the commands in
+gf.client.FORWARDED_COMMANDS are run.
+
+The socket lives in a private (0700) directory and is only accessible to
+its owner. The HTTP endpoint accepts the same request as the body of
+``POST /run``, on localhost only. It requires ``Content-Type:
+application/json`` and ``Authorization: Bearer <token>``, with the token
+that ``serve`` writes next to the socket, so web pages cannot forge
+requests.
+"""
+
+import base64
+from contextlib import redirect_stderr, redirect_stdout
+import hmac
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
+import json
+import os
+from pathlib import Path
+import secrets
+import socketserver
+import sys
+import threading
+from typing import Any
+
+import click
+from loguru import logger
+import matplotlib as mpl
+
+from gf.client import FORWARDED_COMMANDS
+
+# Commands execute one at a time because they share stdout redirection and course state
+_command_lock = threading.Lock()
+
+
+def _consoles() -> list:
+    # The CLI modules load the course configs, so they are imported on first use
+    from gf.cli import display, main  # noqa: PLC0415
+
+    return [main.console, main.err_console, display.console]
+
+
+def handle_request(request: dict[str, Any]) -> dict[str, Any]:
+    """Run one CLI command and capture its output.
+
+    Args:
+        request: Dict with "argv" (command line after the program name) and
+            optionally "width" (terminal width of the client)
+
+    Returns:
+        dict: "exit_code", "stdout" (or "stdout_base64") and "stderr" of the command
+    """
+    argv = request.get("argv")
+    if (
+        not isinstance(argv, list)
+        or not all(isinstance(arg, str) for arg in argv)
+        or not argv
+        or argv[0] not in FORWARDED_COMMANDS
+    ):
+        command = argv[0] if isinstance(argv, list) and argv else None
+        return {
+            "exit_code": 2,
+            "stdout": "",
+            "stderr": f"Error: {command!r} cannot be run through the daemon\n",
+        }
+
+    from gf.cli.main import app  # noqa: PLC0415
+
+    width = request.get("width")
+    # Binary writers (Arrow) write to stdout's buffer
+    stdout = io.TextIOWrapper(io.BytesIO(), encoding="utf-8", write_through=True)
+    stderr = io.StringIO()
+
+    with _command_lock, redirect_stdout(stdout), redirect_stderr(stderr):
+        consoles = _consoles()
+        previous_widths = [console.width for console in consoles]
+        if width:
+            for console in consoles:
+                console.width = width
+        # Prompts cannot be answered remotely, so they abort instead of blocking the daemon
+        stdin, sys.stdin = sys.stdin, io.StringIO("")
+        try:
+            result = app(args=argv, prog_name="grade-forecast", standalone_mode=False)
+            exit_code = result if isinstance(result, int) else 0
+        except click.exceptions.Exit as e:
+            exit_code = e.exit_code
+        except click.ClickException as e:
+            e.show(file=stderr)
+            exit_code = e.exit_code
+        except click.exceptions.Abort:
+            stderr.write("Aborted!\n")
+            exit_code = 1
+        except Exception as e:  # noqa: BLE001 - a failing command must not take the daemon down
+            logger.exception("Command {} failed", argv)
+            stderr.write(f"Error: {e}\n")
+            exit_code = 1
+        finally:
+            sys.stdin = stdin
+            for console, previous_width in zip(consoles, previous_widths, strict=True):
+                console.width = previous_width
+
+    response = {"exit_code": exit_code, "stderr": stderr.getvalue()}
+    output = stdout.buffer.getvalue()
+    try:
+        response["stdout"] = output.decode("utf-8")
+    except UnicodeDecodeError:
+        response["stdout_base64"] = base64.b64encode(output).decode("ascii")
+    return response
+
+
+class _SocketHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.read())
+        except ValueError:
+            response = {"exit_code": 2, "stdout": "", "stderr": "Error: malformed request\n"}
+        else:
+            response = handle_request(request)
+        self.wfile.write(json.dumps(response).encode())
+
+
+class _HTTPHandler(BaseHTTPRequestHandler):
+    server: "_HTTPServer"
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send(200, {"status": "ok"})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        if self.path != "/run":
+            self._send(404, {"error": "not found"})
+            return
+        error = self._check_request()
+        if error is not None:
+            self._send(*error)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length))
+        except ValueError:
+            self._send(400, {"error": "malformed request"})
+            return
+        self._send(200, handle_request(request))
+
+    def _check_request(self) -> tuple[int, dict[str, Any]] | None:
+        """Reject requests that a web page (rather than a local client) could have sent."""
+        port = self.server.server_address[1]
+        hosts = {f"127.0.0.1:{port}", f"localhost:{port}"}
+        # Guards against DNS rebinding and cross-site requests from browsers
+        if self.headers.get("Host") not in hosts:
+            return 403, {"error": "forbidden host"}
+        origin = self.headers.get("Origin")
+        if origin is not None and origin.removeprefix("http://") not in hosts:
+            return 403, {"error": "forbidden origin"}
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type != "application/json":
+            return 415, {"error": "Content-Type must be application/json"}
+        authorization = self.headers.get("Authorization", "")
+        if not hmac.compare_digest(authorization.encode(), f"Bearer {self.server.token}".encode()):
+            return 401, {"error": "missing or invalid token"}
+        return None
+
+    def _send(self, status: int, body: dict[str, Any]) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - overrides the base
+        logger.debug("HTTP {}", format % args)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    token = ""  # Bearer token every request must carry
+
+
+def _make_private_dir(directory: Path) -> None:
+    """Create a directory only its owner can use, refusing one that anyone else controls."""
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    info = directory.stat()
+    if info.st_uid != os.getuid() or info.st_mode & 0o077:
+        msg = f"{directory} must be owned by the current user and private (mode 0700)"
+        raise PermissionError(msg)
+
+
+def _write_token(path: Path) -> str:
+    """Write a fresh HTTP token to a file only its owner can read."""
+    token = secrets.token_urlsafe(32)
+    path.unlink(missing_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(token + "\n")
+    return token
+
+
+def warm_up() -> None:
+    """Import and compute everything a typical command needs."""
+    from gf.cli import main  # noqa: PLC0415
+    from gf.cli.records import course_record  # noqa: PLC0415
+
+    for course in main.courses:
+        course_record(course)
+
+
+def serve(socket_path: Path, http_port: int | None = None) -> None:
+    """Serve CLI commands until interrupted.
+
+    Args:
+        socket_path: Unix socket to listen on, in a private directory
+        http_port: Also listen for HTTP requests on this localhost port. Requests
+            need the token written to ``<socket_path>.token``.
+    """
+    # Plots can't be shown from a daemon, so never try to open a window
+    mpl.use("Agg")
+    warm_up()
+
+    _make_private_dir(socket_path.parent)
+    if socket_path.exists():
+        socket_path.unlink()
+    # Created without group or other permissions, so nobody can connect before a chmod
+    umask = os.umask(0o177)
+    try:
+        unix_server = socketserver.ThreadingUnixStreamServer(str(socket_path), _SocketHandler)
+    finally:
+        os.umask(umask)
+    unix_server.daemon_threads = True
+    logger.info(f"Listening on {socket_path}")
+
+    http_server = None
+    token_path = socket_path.with_name(socket_path.name + ".token")
+    if http_port is not None:
+        http_server = _HTTPServer(("127.0.0.1", http_port), _HTTPHandler)
+        http_server.token = _write_token(token_path)
+        threading.Thread(target=http_server.serve_forever, daemon=True).start()
+        logger.info(f"Listening on http://127.0.0.1:{http_port} (token in {token_path})")
+
+    try:
+        unix_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        unix_server.server_close()
+        if http_server is not None:
+            http_server.shutdown()
+        socket_path.unlink(missing_ok=True)
+        token_path.unlink(missing_ok=True)
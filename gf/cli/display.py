@@ -1,6 +1,7 @@
 """Display functions for the grade forecast CLI."""
 
 import matplotlib.pyplot as plt
+import numpy as np
 from rich import box
 from rich.console import Console, Group
 from rich.panel import Panel
@@ -8,6 +9,8 @@ from rich.table import Table
 from rich.text import Text
 
 from gf.classes import Course, Task
+from gf.classes.grading_functions import kept_count
+from gf.classes.visualization import render_cached
 from gf.cli.plotting import plot_course_grade_vs_grade
 
 # Create console for rich output
@@ -38,6 +41,40 @@ def display_course_details(course: Course) -> None:
     Args:
         course: The course to display details for
     """
+    # Cached renders are keyed on the width, which the daemon sets per request
+    console.print(
+        render_cached(course, "details", lambda: create_course_details_panel(course), console.width)
+    )
+
+
+def _progress_bar(
+    boundary_positions: dict[int, str], grades: list[float], max_grade: float, max_width: int
+) -> Text:
+    """Bar marking the boundaries and the no-work, min-work, current and expected grades.
+
+    Where grades share a position, the first one is shown.
+    """
+    markers = dict.fromkeys(boundary_positions, ("┃", "bold magenta"))
+    styles = ["red", "yellow", "green", "blue"]
+    for grade, style in reversed(list(zip(grades, styles, strict=True))):
+        markers[int((grade / max_grade) * max_width)] = ("▼", style)
+
+    progress_text = Text()
+    for i in range(max_width):
+        marker, style = markers.get(i, ("─", None))
+        progress_text.append(marker, style=style)
+    return progress_text
+
+
+def create_course_details_panel(course: Course) -> Panel:
+    """Create the detailed course breakdown panel.
+
+    Args:
+        course: The course to display details for
+
+    Returns:
+        Panel: A rich panel with every grading group and the grade progress bar
+    """
     # Create tables for each grading group
     group_tables = []
     for group in course.grading_groups:
@@ -222,35 +259,19 @@ def display_course_details(course: Course) -> None:
 
     # Find boundary positions
     boundaries_sorted = sorted(course.grading_boundaries.items(), key=lambda x: x[1][0])
-    for letter, (lower, upper) in boundaries_sorted:
+    for letter, (lower, _) in boundaries_sorted:
         if lower > 0:  # Skip the lowest boundary (usually 0)
             pos = int((lower / max_grade) * max_width)
             if pos < max_width:
                 boundary_positions[pos] = letter
 
-    # Calculate positions for grade markers
-    no_work_pos = int((no_work_grade / max_grade) * max_width)
-    min_work_pos = int((min_work_grade / max_grade) * max_width)
-    current_pos = int((current_grade / max_grade) * max_width)
-    expected_pos = int((expected_grade / max_grade) * max_width)
-
     # Create the progress bar with boundary markers and grade markers included
-    progress_text = Text()
-    for i in range(max_width):
-        # Check if this position has a grade marker
-        if i == no_work_pos:
-            progress_text.append("▼", style="red")
-        elif i == min_work_pos:
-            progress_text.append("▼", style="yellow")
-        elif i == current_pos:
-            progress_text.append("▼", style="green")
-        elif i == expected_pos:
-            progress_text.append("▼", style="blue")
-        # Check if this position has a boundary marker
-        elif i in boundary_positions:
-            progress_text.append("┃", style="bold magenta")
-        else:
-            progress_text.append("─")
+    progress_text = _progress_bar(
+        boundary_positions,
+        [no_work_grade, min_work_grade, current_grade, expected_grade],
+        max_grade,
+        max_width,
+    )
 
     # Add boundary labels (directly above the markers)
     boundary_labels = Text()
@@ -315,13 +336,103 @@ def display_course_details(course: Course) -> None:
         grade_progress,
     )
 
-    panel = Panel(
+    return Panel(
         content,
         title=f"[bold cyan]COURSE: {course.name}[/bold cyan]",
         border_style="blue",
     )
 
-    console.print(panel)
+
+def create_course_summary_panel(course: Course, record: dict) -> Panel:
+    """Create the one-course panel shown by the summary command.
+
+    Args:
+        course: The course being summarized
+        record: The course's summary record (see gf.cli.records.course_record)
+
+    Returns:
+        Panel: A rich panel with the course's grade progress bar
+    """
+    max_width = 60  # Width of the progress bar
+    max_grade = 100  # Maximum possible grade
+
+    # Get grade values
+    expected_grade = record["expected_grade"] * 100
+    current_grade = record["current_grade"] * 100
+    min_work_grade = record["min_work_grade"] * 100
+    no_work_grade = record["no_work_grade"] * 100
+
+    # Create a list to track where boundary markers should go
+    boundary_positions = {}
+
+    # Find boundary positions
+    boundaries_sorted = sorted(course.grading_boundaries.items(), key=lambda x: x[1][0])
+    for letter, (lower, _) in boundaries_sorted:
+        if lower > 0:  # Skip the lowest boundary (usually 0)
+            pos = int((lower / max_grade) * max_width)
+            if pos < max_width:
+                boundary_positions[pos] = letter
+
+    # Create the progress bar with boundary markers and grade markers included
+    progress_text = _progress_bar(
+        boundary_positions,
+        [no_work_grade, min_work_grade, current_grade, expected_grade],
+        max_grade,
+        max_width,
+    )
+
+    # Add boundary labels (directly above the markers)
+    boundary_labels = Text()
+    boundary_labels.append("\n")
+    label_spaces = [" "] * max_width
+    for pos, letter in boundary_positions.items():
+        label_spaces[pos] = letter
+    boundary_labels.append("".join(label_spaces), style="bold magenta")
+
+    # Add grade values directly to the display
+    grade_values = Text()
+    grade_values.append("\n")
+    grade_values.append(f"NO WORK: {no_work_grade:.2f}%  ", style="red")
+    grade_values.append(f"MIN WORK: {min_work_grade:.2f}%  ", style="yellow")
+    grade_values.append(f"CURRENT: {current_grade:.2f}%  ", style="green")
+    grade_values.append(f"EXPECTED: {expected_grade:.2f}%  ", style="blue")
+    grade_values.append(f"LETTER: {record['letter_grade']}", style="magenta")
+
+    # Create completion info
+    completion_info = Text()
+    completion_info.append("\n")
+    completion_info.append(f"TASKS: {record['completed_tasks']}/{record['total_tasks']} ")
+    completion_info.append(f"({record['completion'] * 100:.1f}% complete)")
+
+    course_progress = Group(progress_text, boundary_labels, grade_values, completion_info)
+    return Panel(
+        course_progress, title=f"[bold cyan]{course.name}[/bold cyan]", border_style="blue"
+    )
+
+
+def create_summary_legend() -> Text:
+    """Create the marker legend printed after the summary panels.
+
+    Returns:
+        Text: The legend
+    """
+    legend = Text()
+    legend.append("\n")
+    legend.append("▼", style="red")
+    legend.append(" NO WORK ", style="red")
+    legend.append("    ")
+    legend.append("▼", style="yellow")
+    legend.append(" MIN WORK ", style="yellow")
+    legend.append("    ")
+    legend.append("▼", style="green")
+    legend.append(" CURRENT ", style="green")
+    legend.append("    ")
+    legend.append("▼", style="blue")
+    legend.append(" EXPECTED ", style="blue")
+    legend.append("    ")
+    legend.append("┃", style="magenta")
+    legend.append(" GRADE BOUNDARY", style="magenta")
+    return legend
 
 
 def display_course_info(course: Course) -> list[Task]:
@@ -333,6 +444,21 @@ def display_course_info(course: Course) -> list[Task]:
     Returns:
         List[Task]: List of all tasks in the course
     """
+    console.print(
+        render_cached(course, "info", lambda: create_course_info_panel(course), console.width)
+    )
+    return [task for group in course.grading_groups for task in group.tasks]
+
+
+def create_course_info_panel(course: Course) -> Panel:
+    """Create the course overview panel listing numbered tasks and the grade summary.
+
+    Args:
+        course: The course to display information for
+
+    Returns:
+        Panel: A rich panel with the course overview
+    """
     # Create table for task groups
     tasks_table = Table(box=box.ROUNDED, show_header=True, padding=(0, 2))
     tasks_table.add_column("Group", style="bold cyan", width=25)
@@ -372,22 +498,24 @@ def display_course_info(course: Course) -> list[Task]:
     content = Group(tasks_table, Text("\nGrade Summary:", style="bold cyan"), grade_table)
 
     # Create panel with the group
-    panel = Panel(
+    return Panel(
         content,
         title=f"[bold cyan]{course.name} Overview[/bold cyan]",
         border_style="blue",
     )
 
-    console.print(panel)
-    return all_tasks
-
 
-def display_task_analysis(course: Course, task: Task) -> None:
+def display_task_analysis(
+    course: Course,
+    task: Task,
+    sensitivity: tuple[np.ndarray, np.ndarray] | None = None,
+) -> None:
     """Display task analysis information and plot.
 
     Args:
         course: The course containing the task
         task: The task to analyze
+        sensitivity: Precomputed course grade curve for the task, if available
     """
     group = course.get_parent(task)
     mgph = course.get_marginal_grade_per_hour(task)
@@ -402,7 +530,10 @@ def display_task_analysis(course: Course, task: Task) -> None:
     task_table.add_row("Task Name", task.name)
     task_table.add_row("Course", course.name)
     task_table.add_row("Group", group.name)
-    task_table.add_row("Weight in Group", f"{1 / len(group.tasks):.4f}")
+    counted = kept_count(len(group.tasks), group.drop_lowest)
+    task_table.add_row("Weight in Group", f"{1 / counted:.4f}")
+    if group.drop_lowest:
+        task_table.add_row("Dropped in Group", f"lowest {group.drop_lowest}")
     task_table.add_row("Base Grade", f"{task.base_grade * 100:.2f}%")
 
     if task.grade is not None:
@@ -421,7 +552,7 @@ def display_task_analysis(course: Course, task: Task) -> None:
     formula_text.append("\nGrade Formula:\n", style="bold cyan")
     formula_text.append(
         f"ΔCG = {mgph * 100:.4f}%/hr * (t hours) + "
-        f"{task.base_grade * group.weight / len(group.tasks) * 100:.4f}% "
+        f"{task.base_grade * group.weight / counted * 100:.4f}% "
         f"for (0 < t < {task.pst})\n",
         style="yellow",
     )
@@ -443,6 +574,6 @@ def display_task_analysis(course: Course, task: Task) -> None:
 
     console.print(panel)
 
-    fig = plot_course_grade_vs_grade(course, task.name)
+    line = plot_course_grade_vs_grade(course, task.name, sensitivity)
     plt.show()
-    plt.close(fig)
+    plt.close(line.figure)
@@ -0,0 +1,150 @@
+"""Machine-readable output writers for the grade forecast CLI.
+
+These write plain records straight to a byte or text stream without going
+through Rich, one record at a time, so large outputs never have to be held in
+memory.
+"""
+
+from collections.abc import Iterable, Iterator, Mapping
+import csv
+from enum import StrEnum
+from functools import partial
+from itertools import chain, islice
+import json
+import sys
+from typing import IO, Any
+
+import typer
+
+# Rows buffered per Arrow record batch
+ARROW_BATCH_SIZE = 1024
+
+
+class OutputFormat(StrEnum):
+    """Output formats supported by the CLI commands."""
+
+    rich = "rich"
+    json = "json"
+    jsonl = "jsonl"
+    csv = "csv"
+    arrow = "arrow"
+
+
+def write_records(
+    records: Iterable[dict[str, Any]],
+    fmt: OutputFormat,
+    stream: IO | None = None,
+    types: Mapping[str, type] | None = None,
+) -> int:
+    """Serialize records in a machine-readable format.
+
+    Args:
+        records: Flat records (all with the same keys) to write
+        fmt: The output format (anything but OutputFormat.rich)
+        stream: Text stream to write to (binary buffer is used for Arrow),
+            defaults to stdout
+        types: Types (float, int, str or bool) of fields that the first rows
+            can't be trusted to show, such as grades that may be None or an
+            int 0. Arrow output infers the other fields from its first batch.
+
+    Returns:
+        int: Number of records written
+    """
+    stream = stream if stream is not None else sys.stdout
+    writers = {
+        OutputFormat.json: _write_json,
+        OutputFormat.jsonl: _write_jsonl,
+        OutputFormat.csv: _write_csv,
+        OutputFormat.arrow: partial(_write_arrow, types=types or {}),
+    }
+    if fmt not in writers:
+        msg = f"'{fmt.value}' is not a machine-readable format"
+        raise ValueError(msg)
+    return writers[fmt](iter(records), stream)
+
+
+def write_record(
+    record: dict[str, Any],
+    fmt: OutputFormat,
+    stream: IO | None = None,
+    types: Mapping[str, type] | None = None,
+) -> None:
+    """Serialize a single record. JSON output is an object rather than an array.
+
+    Args:
+        record: The record to write
+        fmt: The output format
+        stream: Stream to write to, defaults to stdout
+        types: Types of fields (see write_records)
+    """
+    stream = stream if stream is not None else sys.stdout
+    if fmt == OutputFormat.json:
+        stream.write(json.dumps(record) + "\n")
+    else:
+        write_records([record], fmt, stream, types)
+
+
+def _write_json(records: Iterator[dict[str, Any]], stream: IO) -> int:
+    count = 0
+    stream.write("[")
+    for record in records:
+        stream.write(("," if count else "") + "\n" + json.dumps(record))
+        count += 1
+    stream.write("\n]\n" if count else "]\n")
+    return count
+
+
+def _write_jsonl(records: Iterator[dict[str, Any]], stream: IO) -> int:
+    count = 0
+    for record in records:
+        stream.write(json.dumps(record) + "\n")
+        count += 1
+    return count
+
+
+def _write_csv(records: Iterator[dict[str, Any]], stream: IO) -> int:
+    first = next(records, None)
+    if first is None:
+        return 0
+    writer = csv.DictWriter(stream, fieldnames=list(first))
+    writer.writeheader()
+    count = 0
+    for record in chain([first], records):
+        writer.writerow(record)
+        count += 1
+    return count
+
+
+def _write_arrow(records: Iterator[dict[str, Any]], stream: IO, types: Mapping[str, type]) -> int:
+    try:
+        import pyarrow as pa  # noqa: PLC0415 - optional dependency
+    except ModuleNotFoundError as e:
+        msg = "arrow output requires pyarrow (pip install pyarrow)"
+        raise typer.BadParameter(msg, param_hint="--format") from e
+
+    sink = getattr(stream, "buffer", stream)
+    first_batch = list(islice(records, ARROW_BATCH_SIZE))
+    if not first_batch:
+        return 0
+
+    # Later batches must fit the first batch's schema, so declared types win over
+    # inference (an int 0 would make a grade column int64, a None one null-typed)
+    arrow_types = {float: pa.float64(), int: pa.int64(), str: pa.string(), bool: pa.bool_()}
+    inferred = pa.RecordBatch.from_pylist(first_batch).schema
+    schema = pa.schema(
+        [
+            pa.field(field.name, arrow_types[types[field.name]]) if field.name in types else field
+            for field in inferred
+        ]
+    )
+    batch = pa.RecordBatch.from_pylist(first_batch, schema=schema)
+    count = 0
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        while batch.num_rows:
+            writer.write_batch(batch)
+            count += batch.num_rows
+            rows = list(islice(records, ARROW_BATCH_SIZE))
+            if not rows:
+                break
+            batch = pa.RecordBatch.from_pylist(rows, schema=batch.schema)
+    return count
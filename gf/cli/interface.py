@@ -12,6 +12,7 @@ from gf.cli.display import (
     display_courses_table,
     display_task_analysis,
 )
+from gf.cli.precompute import Precomputer
 from gf.cli.utils import find_course, find_task
 
 # Enable Rich's pretty traceback
@@ -28,6 +29,10 @@ def interface() -> None:
 
     display_courses_table(courses)
 
+    # Warm up course overviews and task plots while the user reads the table
+    precomputer = Precomputer(courses)
+    precomputer.start()
+
     while True:
         user_input = Prompt.ask(
             "\nWhich course would you like to learn more about? (Enter course name or index, or 'exit' to quit)",
@@ -58,6 +63,7 @@ def interface() -> None:
                 console.print("[bold red]Error:[/bold red] Course not found.", style="bold red")
                 continue
 
+            precomputer.prioritize(selected_course)
             all_tasks = display_course_info(selected_course)
 
             analyze_task = Prompt.ask(
@@ -78,7 +84,9 @@ def interface() -> None:
                     )
                     continue
 
-                display_task_analysis(selected_course, task)
+                display_task_analysis(
+                    selected_course, task, precomputer.get_sensitivity(selected_course, task)
+                )
 
         except Exception as e:
             console.print(f"[bold red]An error occurred:[/bold red] {e}", style="bold red")
@@ -1,21 +1,62 @@
 """Main CLI entry point for the grade forecast application."""
 
 import builtins
-from typing import Optional
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+import sys
+from typing import TYPE_CHECKING, Any
 
+import numpy as np
 from rich.console import Console
 from rich.table import Table
 import typer
 
 from configs import configs
 from configs.examples.prog_fund import prog_fund
-from gf.cli.display import display_course_info, display_courses_table, display_task_analysis
+from gf import profiling
+from gf.cache import get_cache
+from gf.classes import Course, FrontierMetric, build_frontier
+from gf.cli.display import (
+    create_course_summary_panel,
+    create_summary_legend,
+    display_course_info,
+    display_courses_table,
+    display_task_analysis,
+)
+from gf.cli.formats import OutputFormat, write_record, write_records
 from gf.cli.interface import interface
+from gf.cli.parallel import render_in_pool, render_summary_text, resolve_jobs
+from gf.cli.records import (
+    BACKTEST_RECORD_TYPES,
+    COURSE_RECORD_TYPES,
+    GROUP_RECORD_TYPES,
+    SUMMARY_SORT_KEYS,
+    TASK_ANALYSIS_RECORD_TYPES,
+    TASK_RECORD_TYPES,
+    cached_course_record,
+    course_record,
+    group_records,
+    iter_course_summaries,
+    paginate,
+    task_analysis_record,
+    task_records,
+)
 from gf.cli.utils import find_course, find_task
+from gf.config import DAEMON_SOCKET, LEDGER_DIR, PROJ_ROOT
+from gf.ledger import DEFAULT_STUDENT, GradeEvent, GradeLedger, local_time
+from gf.synthetic import DatasetFormat, generate_dataset, load_course_file
+
+if TYPE_CHECKING:
+    from gf.sweep import SweepResult
+
+# Sweeps of this many axes are shown as a heatmap
+HEATMAP_AXES = 2
 
 app = typer.Typer(help="Grade Forecast - Track and forecast your university grades")
 courses = configs if configs else [prog_fund]
 console = Console()
+err_console = Console(stderr=True)
 
 # Generate course aliases (first letter of each word in the course name)
 course_aliases = {}
@@ -47,22 +88,151 @@ def show_available_courses() -> None:
     console.print(f"  grade-forecast course {course_aliases[courses[0].name]}")
 
 
+def resolve_course(course_name: str) -> Course | None:
+    """Find a course by name, alias or 1-based index."""
+    selected_course = find_course(course_name, courses)
+    if selected_course is None:
+        for c in courses:
+            if course_aliases[c.name] == course_name.lower():
+                return c
+    if selected_course is None and course_name.isdigit():
+        idx = int(course_name) - 1
+        if 0 <= idx < len(courses):
+            return courses[idx]
+    return selected_course
+
+
+def resolve_courses(course_names: builtins.list[str] | None) -> builtins.list[Course]:
+    """Resolve course names, aliases or indices, defaulting to every course."""
+    selected_courses = []
+    for name in course_names or []:
+        selected_course = resolve_course(name)
+        if selected_course is None:
+            err_console.print(f"[bold red]Error:[/bold red] Course '{name}' not found.")
+            raise typer.Exit(code=1)
+        selected_courses.append(selected_course)
+    return selected_courses or courses
+
+
+def jobs_option() -> int:
+    """Create the --jobs option shared by commands that can render in parallel."""
+    return typer.Option(
+        1, "--jobs", "-j", min=0, help="Worker processes for rendering (0 = one per CPU)"
+    )
+
+
+def format_option() -> OutputFormat:
+    """Create the --format option shared by commands with machine-readable output."""
+    return typer.Option(
+        OutputFormat.rich,
+        "--format",
+        "-f",
+        case_sensitive=False,
+        help="Output format. Anything but 'rich' skips Rich rendering entirely.",
+    )
+
+
+def course_not_found(course_name: str, fmt: OutputFormat) -> None:
+    """Report a course that could not be found, keeping machine-readable stdout clean."""
+    if fmt != OutputFormat.rich:
+        err_console.print(f"[bold red]Error:[/bold red] Course '{course_name}' not found.")
+        raise typer.Exit(code=1)
+    console.print(f"[bold red]Error:[/bold red] Course '{course_name}' not found.")
+    show_available_courses()
+
+
+def missing_courses(fmt: OutputFormat | None, usage: str = "a course name or alias") -> None:
+    """Show the available courses when a command got none, and exit.
+
+    Machine-readable formats keep stdout clean: the error goes to stderr and the
+    command fails.
+    """
+    if fmt is not None and fmt != OutputFormat.rich:
+        err_console.print(f"[bold red]Error:[/bold red] Missing {usage}.")
+        raise typer.Exit(code=1)
+    show_available_courses()
+    raise typer.Exit()
+
+
 def course_callback(
-    ctx: typer.Context, param: typer.CallbackParam, value: Optional[str]
-) -> Optional[str]:
+    ctx: typer.Context, param: typer.CallbackParam, value: str | None
+) -> str | None:
     """Callback for course name argument to show available courses if not provided."""
     if not value and not ctx.resilient_parsing:
-        show_available_courses()
-        raise typer.Exit()
+        # A missing argument is processed after the options given on the command line
+        missing_courses(ctx.params.get("fmt"))
     return value
 
 
+@app.callback()
+def main(
+    ctx: typer.Context,
+    profile: bool = typer.Option(
+        False, "--profile", help="Print a per-stage timing breakdown after the command"
+    ),
+    profile_output: Path | None = typer.Option(
+        None,
+        "--profile-output",
+        dir_okay=False,
+        help="Also write a cProfile dump (.prof/.pstats) or collapsed stacks (any other "
+        "suffix, for flamegraph tools). Implies --profile.",
+    ),
+) -> None:
+    """Grade Forecast - Track and forecast your university grades."""
+    if not (profile or profile_output):
+        return
+
+    pstats_path = None
+    if profile_output and profile_output.suffix in profiling.PSTATS_SUFFIXES:
+        pstats_path = str(profile_output)
+    profiler = profiling.Profiler(f"grade-forecast {ctx.invoked_subcommand}", pstats_path)
+    profiling.enable(profiler)
+
+    def report() -> None:
+        profiling.disable()
+        if profile_output and pstats_path is None:
+            profiler.write_collapsed(str(profile_output))
+        err_console.print(profiler.create_table())
+        if profile_output:
+            err_console.print(f"Profile written to {profile_output}", highlight=False)
+
+    ctx.call_on_close(report)
+
+
 @app.command()
 def run() -> None:
     """Run the Grade Forecast interactive CLI application."""
     interface()
 
 
+@app.command()
+def serve(
+    socket_path: Path = typer.Option(
+        DAEMON_SOCKET,
+        "--socket",
+        envvar="GF_DAEMON_SOCKET",
+        help="Unix socket to listen on. Commands forward to GF_DAEMON_SOCKET, so set that too.",
+    ),
+    http_port: int | None = typer.Option(
+        None, "--http", help="Also serve requests over HTTP on this localhost port"
+    ),
+) -> None:
+    """Run a daemon that keeps courses and caches warm and answers CLI commands.
+
+    While it is running, grade-forecast commands automatically forward to it.
+    They look for it at GF_DAEMON_SOCKET, which is also the default --socket.
+    """
+    from gf.cli.daemon import serve as serve_daemon
+
+    console.print(f"[bold cyan]Serving grade-forecast on {socket_path}[/bold cyan]")
+    if socket_path != DAEMON_SOCKET:
+        console.print(
+            f"Commands only forward to this daemon with GF_DAEMON_SOCKET={socket_path}",
+            highlight=False,
+        )
+    serve_daemon(socket_path, http_port)
+
+
 @app.command()
 def list() -> None:
     """List all available courses."""
@@ -70,148 +240,92 @@ def list() -> None:
 
 
 @app.command()
-def summary() -> None:
-    """Show a summary of all courses with progress bars."""
-    from rich.panel import Panel
-    from rich.console import Group
-    from rich.text import Text
+def summary(
+    sort: str | None = typer.Option(
+        None,
+        "--sort",
+        "-s",
+        help=f"Sort courses by one of: {', '.join(SUMMARY_SORT_KEYS)}",
+    ),
+    reverse: bool = typer.Option(False, "--reverse", "-r", help="Reverse the sort direction"),
+    top: int | None = typer.Option(
+        None, "--top", "-k", min=1, help="Only show the first K courses"
+    ),
+    letter: builtins.list[str] | None = typer.Option(
+        None, "--letter", "-l", help="Only show courses with this letter grade (repeatable)"
+    ),
+    name_filter: str | None = typer.Option(
+        None, "--filter", help="Only show courses whose name contains this text"
+    ),
+    page: int = typer.Option(1, "--page", "-p", min=1, help="Page of courses to show"),
+    page_size: int | None = typer.Option(
+        None, "--page-size", min=1, help="Courses per page (default: all)"
+    ),
+    fmt: OutputFormat = format_option(),
+    jobs: int = jobs_option(),
+) -> None:
+    """Show a summary of all courses with progress bars.
+
+    Courses are computed and printed one at a time, so output starts
+    immediately even for very large course sets.
+    """
+    if sort is not None and sort not in SUMMARY_SORT_KEYS:
+        msg = f"must be one of: {', '.join(SUMMARY_SORT_KEYS)}"
+        raise typer.BadParameter(msg, param_hint="--sort")
+
+    cache = get_cache()
+    summaries = iter_course_summaries(
+        courses,
+        sort_by=sort,
+        reverse=reverse,
+        top=top,
+        letters=letter,
+        name_filter=name_filter,
+        record=partial(cached_course_record, cache=cache),
+    )
+
+    if fmt != OutputFormat.rich:
+        write_records(
+            (record for _, record in paginate(summaries, page, page_size)),
+            fmt,
+            types=COURSE_RECORD_TYPES,
+        )
+        return
 
     total_tasks = 0
     completed_tasks = 0
-
-    course_displays = []
-
-    for course in courses:
-        # Count tasks
-        course_total_tasks = 0
-        course_completed_tasks = 0
-
-        for group in course.grading_groups:
-            for task in group.tasks:
-                course_total_tasks += 1
-                if task.grade is not None:
-                    course_completed_tasks += 1
-
-        total_tasks += course_total_tasks
-        completed_tasks += course_completed_tasks
-
-        # Create grade progress bar for this course
-        max_width = 60  # Width of the progress bar
-        max_grade = 100  # Maximum possible grade
-
-        # Get grade values
-        expected_grade = course.get_expected_grade() * 100
-        current_grade = course.get_current_grade() * 100
-        min_work_grade = course.get_grade() * 100
-        no_work_grade = course.get_true_grade() * 100
-
-        # Create a list to track where boundary markers should go
-        boundary_positions = {}
-
-        # Find boundary positions
-        boundaries_sorted = sorted(course.grading_boundaries.items(), key=lambda x: x[1][0])
-        for letter, (lower, upper) in boundaries_sorted:
-            if lower > 0:  # Skip the lowest boundary (usually 0)
-                pos = int((lower / max_grade) * max_width)
-                if pos < max_width:
-                    boundary_positions[pos] = letter
-
-        # Calculate positions for grade markers
-        no_work_pos = int((no_work_grade / max_grade) * max_width)
-        min_work_pos = int((min_work_grade / max_grade) * max_width)
-        current_pos = int((current_grade / max_grade) * max_width)
-        expected_pos = int((expected_grade / max_grade) * max_width)
-
-        # Create the progress bar with boundary markers and grade markers included
-        progress_text = Text()
-        for i in range(max_width):
-            # Check if this position has a grade marker
-            if i == no_work_pos:
-                progress_text.append("▼", style="red")
-            elif i == min_work_pos:
-                progress_text.append("▼", style="yellow")
-            elif i == current_pos:
-                progress_text.append("▼", style="green")
-            elif i == expected_pos:
-                progress_text.append("▼", style="blue")
-            # Check if this position has a boundary marker
-            elif i in boundary_positions:
-                progress_text.append("┃", style="bold magenta")
-            else:
-                progress_text.append("─")
-
-        # Add boundary labels (directly above the markers)
-        boundary_labels = Text()
-        boundary_labels.append("\n")
-
-        # Create a string of spaces for positioning
-        label_spaces = [" "] * max_width
-
-        # Add letter labels at boundary positions
-        for pos, letter in boundary_positions.items():
-            label_spaces[pos] = letter
-
-        # Convert to a string and add to boundary_labels
-        boundary_labels.append("".join(label_spaces), style="bold magenta")
-
-        # Add grade values directly to the display
-        grade_values = Text()
-        grade_values.append("\n")
-        grade_values.append(f"NO WORK: {no_work_grade:.2f}%  ", style="red")
-        grade_values.append(f"MIN WORK: {min_work_grade:.2f}%  ", style="yellow")
-        grade_values.append(f"CURRENT: {current_grade:.2f}%  ", style="green")
-        grade_values.append(f"EXPECTED: {expected_grade:.2f}%  ", style="blue")
-        grade_values.append(f"LETTER: {course.get_letter_grade()}", style="magenta")
-
-        # Create completion info
-        completion_info = Text()
-        completion_info.append("\n")
-        completion_info.append(f"TASKS: {course_completed_tasks}/{course_total_tasks} ")
-        completion_info.append(
-            f"({course_completed_tasks / course_total_tasks * 100:.1f}% complete)"
-        )
-
-        # Create the course progress display
-        course_progress = Group(progress_text, boundary_labels, grade_values, completion_info)
-
-        # Create a panel for this course
-        course_panel = Panel(
-            course_progress, title=f"[bold cyan]{course.name}[/bold cyan]", border_style="blue"
-        )
-
-        course_displays.append(course_panel)
+    if jobs == 1:
+        for summary_course, record in paginate(summaries, page, page_size):
+            total_tasks += record["total_tasks"]
+            completed_tasks += record["completed_tasks"]
+            console.file.write(
+                render_summary_text(
+                    summary_course, record, console.width, console.color_system, cache
+                )
+            )
+    else:
+        if sort is None and not letter and not name_filter:
+            # Nothing to select on, so workers compute the records too
+            items = ((idx, None) for idx in paginate(range(len(courses)), page, page_size))
+        else:
+            index_of = {id(c): idx for idx, c in enumerate(courses)}
+            items = (
+                (index_of[id(summary_course)], record)
+                for summary_course, record in paginate(summaries, page, page_size)
+            )
+        for record, text in render_in_pool("summary", items, resolve_jobs(jobs), console):
+            total_tasks += record["total_tasks"]
+            completed_tasks += record["completed_tasks"]
+            console.file.write(text)
 
     # Add overall completion info
     if total_tasks > 0:
         completion_percentage = completed_tasks / total_tasks * 100
-        overall_text = Text(
+        console.print(
             f"OVERALL: {completed_tasks}/{total_tasks} tasks completed ({completion_percentage:.1f}%)"
         )
-        course_displays.append(overall_text)
-
-    # Add legend
-    legend = Text()
-    legend.append("\n")
-    legend.append("▼", style="red")
-    legend.append(" NO WORK ", style="red")
-    legend.append("    ")
-    legend.append("▼", style="yellow")
-    legend.append(" MIN WORK ", style="yellow")
-    legend.append("    ")
-    legend.append("▼", style="green")
-    legend.append(" CURRENT ", style="green")
-    legend.append("    ")
-    legend.append("▼", style="blue")
-    legend.append(" EXPECTED ", style="blue")
-    legend.append("    ")
-    legend.append("┃", style="magenta")
-    legend.append(" GRADE BOUNDARY", style="magenta")
-
-    course_displays.append(legend)
-
-    # Display all courses
-    for display in course_displays:
-        console.print(display)
+
+    console.print(create_summary_legend())
 
 
 @app.command()
@@ -220,27 +334,20 @@ def course(
         None, help="Name or alias of the course to display", callback=course_callback
     ),
     details: bool = typer.Option(False, "--details", "-d", help="Show detailed information"),
+    fmt: OutputFormat = format_option(),
 ) -> None:
     """Display information for a specific course."""
-    # First try to find by name
-    selected_course = find_course(course_name, courses)
+    selected_course = resolve_course(course_name)
 
-    # If not found, try to find by alias
     if selected_course is None:
-        for c in courses:
-            if course_aliases[c.name] == course_name.lower():
-                selected_course = c
-                break
-
-    # If still not found, try to find by index
-    if selected_course is None and course_name.isdigit():
-        idx = int(course_name) - 1
-        if 0 <= idx < len(courses):
-            selected_course = courses[idx]
+        course_not_found(course_name, fmt)
+        return
 
-    if selected_course is None:
-        console.print(f"[bold red]Error:[/bold red] Course '{course_name}' not found.")
-        show_available_courses()
+    if fmt != OutputFormat.rich:
+        if details:
+            write_records(group_records(selected_course), fmt, types=GROUP_RECORD_TYPES)
+        else:
+            write_record(course_record(selected_course), fmt, types=COURSE_RECORD_TYPES)
         return
 
     if details:
@@ -251,13 +358,835 @@ def course(
         display_course_info(selected_course)
 
 
+@app.command()
+def report(
+    course_names: builtins.list[str] | None = typer.Argument(
+        None, help="Names or aliases of courses to include (default: all)"
+    ),
+    groups: bool = typer.Option(
+        False, "--groups", "-g", help="Print one panel per grading group instead of per course"
+    ),
+    jobs: int = jobs_option(),
+) -> None:
+    """Print the detailed breakdown of every course, rendering in parallel with --jobs."""
+    if course_names:
+        indices = []
+        for name in course_names:
+            selected_course = resolve_course(name)
+            if selected_course is None:
+                console.print(f"[bold red]Error:[/bold red] Course '{name}' not found.")
+                continue
+            indices.append(courses.index(selected_course))
+    else:
+        indices = builtins.list(range(len(courses)))
+
+    if groups:
+        items = [
+            (idx, group_idx)
+            for idx in indices
+            for group_idx in range(len(courses[idx].grading_groups))
+        ]
+        segments = render_in_pool("group", items, resolve_jobs(jobs), console)
+    else:
+        segments = render_in_pool("details", indices, resolve_jobs(jobs), console)
+
+    for text in segments:
+        console.file.write(text)
+
+
+@app.command()
+def watch(
+    directory: Path = typer.Argument(
+        ..., exists=True, file_okay=False, help="Directory of gradebook files to watch"
+    ),
+    interval: float = typer.Option(1.0, "--interval", "-i", help="Seconds between scans"),
+    once: bool = typer.Option(False, "--once", help="Apply the current files and exit"),
+    student: str | None = typer.Option(
+        None, "--student", help="Only apply this student's rows of files with a student column"
+    ),
+    fmt: OutputFormat = format_option(),
+) -> None:
+    """Watch a gradebook directory and re-forecast only the courses that change.
+
+    Gradebook files are CSV, JSON Lines or JSON rows with course, task and
+    grade (0-100) columns. Only files that changed since the last scan are
+    parsed, and only courses with a changed grade are recomputed and printed.
+    Removing a row (or a whole file) clears its grade. Files with the grades
+    of several students are skipped unless --student picks one.
+
+    Machine-readable formats write the changed courses' records after each
+    scan that changed any. Arrow output is one stream, so it needs --once.
+    """
+    import time
+
+    from gf.gradebook import GradebookWatcher, apply_gradebook
+
+    if fmt == OutputFormat.arrow and not once:
+        err_console.print(
+            "[bold red]Error:[/bold red] --format arrow writes a single stream; "
+            "use it with --once or pick jsonl"
+        )
+        raise typer.Exit(code=1)
+    watcher = GradebookWatcher(directory, student=student)
+    if fmt == OutputFormat.rich:
+        console.print(f"[bold cyan]Watching {directory} for gradebook changes...[/bold cyan]")
+
+    try:
+        while True:
+            affected = apply_gradebook(watcher.poll(), resolve_course)
+            if fmt != OutputFormat.rich:
+                if affected:
+                    write_records(
+                        (course_record(c) for c in affected), fmt, types=COURSE_RECORD_TYPES
+                    )
+                    sys.stdout.flush()
+            else:
+                for changed_course in affected:
+                    console.print(
+                        create_course_summary_panel(changed_course, course_record(changed_course))
+                    )
+            if once:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command()
+def gen(
+    output: Path = typer.Argument(..., file_okay=False, help="Directory to write the dataset to"),
+    students: int = typer.Option(1000, "--students", "-n", min=1, help="Students per course"),
+    n_courses: int | None = typer.Option(
+        None, "--courses", "-c", min=1, help="Number of courses (default: one per template)"
+    ),
+    templates: builtins.list[Path] | None = typer.Option(
+        None,
+        "--template",
+        "-t",
+        exists=True,
+        dir_okay=False,
+        help="Course config file to use as a template (default: the configured courses)",
+    ),
+    seed: int = typer.Option(0, "--seed", help="Seed for reproducible output"),
+    progress: float = typer.Option(
+        0.5, "--progress", min=0, max=1, help="Fraction of the semester that has elapsed"
+    ),
+    fmt: DatasetFormat = typer.Option(
+        DatasetFormat.columnar,
+        "--format",
+        "-f",
+        case_sensitive=False,
+        help="'columnar' writes a grades.npy matrix per course, 'csv'/'jsonl' gradebook rows, "
+        "'ledger' timestamped grade events (for backtest)",
+    ),
+) -> None:
+    """Generate a synthetic cohort of per-student grades for scale testing.
+
+    Output is written course by course and block by block, so memory use does
+    not depend on the size of the dataset.
+    """
+    if templates:
+        template_courses = [c for path in templates for c in load_course_file(path)]
+    else:
+        template_courses = builtins.list(courses)
+    if not template_courses:
+        err_console.print("[bold red]Error:[/bold red] No courses found in the templates.")
+        raise typer.Exit(code=1)
+
+    total = n_courses or len(template_courses)
+    for i, path in enumerate(
+        generate_dataset(
+            template_courses, output, total, students, fmt=fmt, seed=seed, progress=progress
+        ),
+        start=1,
+    ):
+        err_console.print(f"[{i}/{total}] {path}", soft_wrap=True, highlight=False)
+
+
+@app.command()
+def cohort(
+    course_name: str = typer.Argument(..., help="Name or alias of the course the grades follow"),
+    grades: Path = typer.Argument(
+        ..., exists=True, help="Grade matrix (.npy) or a directory from `gen --format columnar`"
+    ),
+    output: Path = typer.Argument(..., dir_okay=False, help="Results file (.npy) to write"),
+    chunk_size: int = typer.Option(
+        8192, "--chunk-size", min=1, help="Students evaluated at a time (bounds memory use)"
+    ),
+) -> None:
+    """Evaluate a memory-mapped cohort grade matrix against a course, chunk by chunk.
+
+    Writes one row per student with the current, expected, min-work and
+    no-work grades and the letter grade, as a structured .npy file.
+    """
+    import time
+
+    from gf.cohort import evaluate_cohort, letter_distribution, resolve_cohort
+
+    selected_course = resolve_course(course_name)
+    if selected_course is None:
+        course_not_found(course_name, OutputFormat.rich)
+        return
+
+    matrix_path, columns = resolve_cohort(grades)
+    start = time.perf_counter()
+    try:
+        results = evaluate_cohort(selected_course, matrix_path, output, columns, chunk_size)
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        raise typer.Exit(code=1) from e
+    elapsed = time.perf_counter() - start
+
+    console.print(
+        f"Evaluated [cyan]{len(results)}[/cyan] students in {elapsed:.2f}s -> {output}",
+        highlight=False,
+    )
+    distribution = letter_distribution(results)
+    console.print(
+        "Letter grades: "
+        + ", ".join(f"{letter}: {count}" for letter, count in sorted(distribution.items()))
+    )
+
+
+def format_percent(value: float | None, *, signed: bool = False) -> str:
+    """Format a fraction as a percentage for the backtest tables ("-" if missing)."""
+    if value is None:
+        return "-"
+    return f"{value * 100:+.1f}" if signed else f"{value * 100:.1f}"
+
+
+def backtest_progress_table(records: builtins.list[dict[str, Any]]) -> Table:
+    """Table of the backtest's forecast errors by the fraction of each course graded."""
+    from gf.backtest import PROGRESS_BINS
+
+    table = Table(title="Mean Absolute Error by Fraction of the Course Graded")
+    table.add_column("Course", style="green")
+    table.add_column("Forecast", style="cyan")
+    for b in range(PROGRESS_BINS):
+        table.add_column(f"{b * 100 // PROGRESS_BINS}%+", justify="right", style="yellow")
+    rows: dict[tuple[str, str], builtins.list[str]] = {}
+    for record in records:
+        if record["progress"] is not None:
+            key = (record["course"], record["forecast"])
+            rows.setdefault(key, []).append(format_percent(record["mae"]))
+    for (course_name, forecast), cells in rows.items():
+        table.add_row(course_name, forecast, *cells)
+    return table
+
+
+def backtest_tables(
+    records: builtins.list[dict[str, Any]],
+    groups: builtins.list[dict[str, Any]],
+    calibration: builtins.list[dict[str, Any]],
+    *,
+    by_progress: bool = False,
+) -> builtins.list[Table]:
+    """Tables of the backtest's forecast errors, group assumptions and calibration."""
+    tables = []
+    table = Table(title="Forecast Error Against Final Grades (percentage points)")
+    table.add_column("Course", style="green")
+    table.add_column("Forecast", style="cyan")
+    for header in ["MAE", "RMSE", "Bias", "Letter Acc. %"]:
+        table.add_column(header, justify="right", style="yellow")
+    for record in records:
+        if record["progress"] is None:
+            table.add_row(
+                record["course"],
+                record["forecast"],
+                format_percent(record["mae"]),
+                format_percent(record["rmse"]),
+                format_percent(record["bias"], signed=True),
+                format_percent(record["letter_accuracy"]),
+            )
+    tables.append(table)
+
+    if by_progress:
+        tables.append(backtest_progress_table(records))
+
+    table = Table(title="Group Expected Grade Assumptions")
+    table.add_column("Course", style="green")
+    table.add_column("Group", style="cyan")
+    for header in ["Assumed %", "Actual %", "Bias", "MAE", "Graded"]:
+        table.add_column(header, justify="right", style="yellow")
+    for record in groups:
+        table.add_row(
+            record["course"],
+            record["group"],
+            format_percent(record["expected_grade"]),
+            format_percent(record["mean_grade"]),
+            format_percent(record["bias"], signed=True),
+            format_percent(record["mae"]),
+            str(record["graded_tasks"]),
+        )
+    tables.append(table)
+
+    table = Table(title="Calibration of Expected Grades")
+    table.add_column("Course", style="green")
+    table.add_column("Forecast %", style="cyan")
+    for header in ["Steps", "Mean Forecast %", "Mean Final %"]:
+        table.add_column(header, justify="right", style="yellow")
+    for record in calibration:
+        table.add_row(
+            record["course"],
+            # The top band also holds forecasts above 100%
+            f"{record['forecast_low'] * 100:.0f}"
+            + (f"-{record['forecast_high'] * 100:.0f}" if record["forecast_high"] < 1 else "+"),
+            str(record["steps"]),
+            format_percent(record["mean_forecast"]),
+            format_percent(record["mean_outcome"]),
+        )
+    tables.append(table)
+    return tables
+
+
+@app.command()
+def backtest(
+    ledgers: builtins.list[Path] | None = typer.Argument(
+        None,
+        exists=True,
+        file_okay=False,
+        help="Grade ledger directories to replay (default: your own ledger)",
+    ),
+    course_names: builtins.list[str] | None = typer.Option(
+        None, "--course", "-c", help="Only replay these courses (name, alias or index)"
+    ),
+    by_progress: bool = typer.Option(
+        False, "--by-progress", help="Also show errors by the fraction of the course graded"
+    ),
+    fmt: OutputFormat = format_option(),
+    jobs: int = jobs_option(),
+) -> None:
+    """Replay historical grade timelines and measure how accurate the forecasts were.
+
+    After every grade event, the expected, min-work and current grades are
+    compared with each student's final grade. Also compares each group's
+    expected grade assumption with the grades actually received.
+    """
+    import time
+
+    from gf.backtest import (
+        calibration_records,
+        course_records,
+        load_timelines,
+        run_backtest,
+    )
+    from gf.backtest import group_records as backtest_group_records
+
+    selected_courses = resolve_courses(course_names)
+    start = time.perf_counter()
+    timelines, skipped = load_timelines(
+        (GradeLedger(path) for path in ledgers or [LEDGER_DIR]), selected_courses
+    )
+    for name, count in sorted(skipped.items()):
+        err_console.print(f"Skipped {count} events of unknown '{name}'", highlight=False)
+    if not timelines:
+        err_console.print("[bold red]Error:[/bold red] No grade events to replay.")
+        raise typer.Exit(code=1)
+    results = run_backtest(timelines.values(), resolve_jobs(jobs))
+    elapsed = time.perf_counter() - start
+
+    records = builtins.list(course_records(results))
+    groups = builtins.list(backtest_group_records(results))
+    calibration = builtins.list(calibration_records(results))
+    if fmt != OutputFormat.rich:
+        # The tables have different fields, so every row gets all of them (None if missing)
+        empty = dict.fromkeys(BACKTEST_RECORD_TYPES)
+        write_records(
+            [
+                *({**empty, "table": "forecast", **record} for record in records),
+                *({**empty, "table": "group", **record} for record in groups),
+                *({**empty, "table": "calibration", **record} for record in calibration),
+            ],
+            fmt,
+            types=BACKTEST_RECORD_TYPES,
+        )
+        return
+
+    steps = sum(record["steps"] for record in records if record["progress"] is None) // 3
+    console.print(
+        f"Replayed [cyan]{sum(result.students for result in results)}[/cyan] student timelines "
+        f"([cyan]{steps}[/cyan] steps) in {elapsed:.2f}s",
+        highlight=False,
+    )
+    for table in backtest_tables(records, groups, calibration, by_progress=by_progress):
+        console.print(table)
+
+
+def sweep_display(result: "SweepResult", outcome: str) -> Table | str:
+    """Grades of every swept combination: a heatmap for two axes, a list for fewer.
+
+    Sweeps of more than two axes are summarized in one line.
+    """
+    axes = result.axes
+    grades = getattr(result, outcome)
+    letters = result.letters(outcome)
+    title = f"{result.course.name}: {outcome.replace('_', ' ')}"
+
+    if len(axes) > HEATMAP_AXES:
+        return (
+            f"{title}: {grades.size} combinations, "
+            f"{grades.min() * 100:.1f}% to {grades.max() * 100:.1f}%. "
+            "Use --format or --output for the full tensor."
+        )
+    table = Table(title=title)
+    if len(axes) == HEATMAP_AXES:
+        # First axis down, second axis across
+        table.add_column(f"{axes[0].label} \\ {axes[1].label}", style="cyan")
+        for value in axes[1].values:
+            table.add_column(f"{value:.2f}", justify="center")
+        for i, value in enumerate(axes[0].values):
+            table.add_row(
+                f"{value:.2f}",
+                *(
+                    f"{grade * 100:.1f}% {letter}"
+                    for grade, letter in zip(grades[i].tolist(), letters[i].tolist(), strict=True)
+                ),
+            )
+        return table
+
+    for axis in axes:
+        table.add_column(axis.label, style="cyan", justify="right")
+    table.add_column("Grade", style="yellow", justify="right")
+    table.add_column("Letter", style="magenta", justify="center")
+    for index in np.ndindex(grades.shape):
+        table.add_row(
+            *(f"{axis.values[i]:.2f}" for axis, i in zip(axes, index, strict=True)),
+            f"{grades[index] * 100:.2f}%",
+            str(letters[index]),
+        )
+    return table
+
+
+@app.command()
+def sweep(
+    course_name: str = typer.Argument(..., help="Name or alias of the course to sweep"),
+    expected: builtins.list[str] | None = typer.Option(
+        None, "--expected", "-e", help="Expected grades to try: GROUP=START:STOP:N or GROUP=V1,V2"
+    ),
+    base: builtins.list[str] | None = typer.Option(
+        None, "--base", "-b", help="Base grades to try: GROUP=START:STOP:N or GROUP=V1,V2"
+    ),
+    output: Path | None = typer.Option(
+        None, "--output", "-o", dir_okay=False, help="Save the outcome tensors to a .npz file"
+    ),
+    fmt: OutputFormat = format_option(),
+) -> None:
+    """Sweep grading group assumptions and show the resulting grades.
+
+    Every combination of the given expected and base grades is evaluated at
+    once, without modifying the course. Base grades affect the min-work
+    grade, expected grades the expected grade.
+    """
+    from gf.sweep import parse_axis, sweep_assumptions
+
+    selected_course = resolve_course(course_name)
+    if selected_course is None:
+        course_not_found(course_name, fmt)
+        return
+
+    try:
+        axes = [parse_axis("expected_grade", spec) for spec in expected or []]
+        axes += [parse_axis("base_grade", spec) for spec in base or []]
+        result = sweep_assumptions(selected_course, axes)
+    except ValueError as e:
+        err_console.print(f"[bold red]Error:[/bold red] {e}")
+        raise typer.Exit(code=1) from e
+    if output is not None:
+        result.save(output)
+        err_console.print(f"Saved a {'x'.join(map(str, result.shape))} sweep to {output}")
+
+    if fmt != OutputFormat.rich:
+        write_records(result.records(), fmt)
+        return
+
+    # Show the outcome the swept assumptions affect
+    outcome = "expected_grade" if expected else "min_work_grade"
+    console.print(sweep_display(result, outcome))
+
+
+@app.command()
+def gpa(
+    course_names: builtins.list[str] | None = typer.Argument(
+        None, help="Names or aliases of this term's courses (default: all)"
+    ),
+    prior_credits: float = typer.Option(
+        0, "--prior-credits", min=0, help="Credits completed in earlier terms"
+    ),
+    prior_gpa: float = typer.Option(0, "--prior-gpa", min=0, help="GPA over the prior credits"),
+    fmt: OutputFormat = format_option(),
+) -> None:
+    """Forecast the term and cumulative GPA in every scenario.
+
+    Each course's letter grade comes from its own grading boundaries and is
+    weighted by its credits (A=5, B=4, C=3, D=2, F=0).
+    """
+    from gf.classes import Term, get_cumulative_gpa
+    from gf.classes.term import GPA_SCENARIOS
+
+    term = Term("This term", resolve_courses(course_names))
+    term_gpa = term.get_gpa()
+    cumulative_gpa = get_cumulative_gpa([term], prior_credits, prior_gpa)
+
+    if fmt != OutputFormat.rich:
+        write_records(
+            (
+                {
+                    "scenario": scenario,
+                    "credits": term.get_credits(),
+                    "term_gpa": term_gpa[scenario],
+                    "cumulative_gpa": cumulative_gpa[scenario],
+                }
+                for scenario in GPA_SCENARIOS
+            ),
+            fmt,
+        )
+        return
+
+    titles = {"no_work": "No Work", "current": "Current", "min_work": "Min Work"}
+    table = Table(title="GPA Forecast", show_footer=True)
+    table.add_column("Course", style="cyan", footer="TERM GPA")
+    table.add_column("Credits", justify="right", footer=f"{term.get_credits():g}")
+    for scenario in GPA_SCENARIOS:
+        table.add_column(
+            titles.get(scenario, scenario.title()),
+            justify="center",
+            style="yellow",
+            footer=f"{term_gpa[scenario]:.2f}",
+        )
+    for selected_course in term.courses:
+        letters = term.get_letters(selected_course)
+        table.add_row(
+            selected_course.name,
+            f"{selected_course.credits:g}",
+            *(letters[scenario] for scenario in GPA_SCENARIOS),
+        )
+    console.print(table)
+
+    if prior_credits:
+        console.print(
+            "CUMULATIVE GPA: "
+            + " | ".join(
+                f"{titles.get(scenario, scenario.title())}: {value:.2f}"
+                for scenario, value in cumulative_gpa.items()
+            )
+        )
+
+
+@app.command()
+def frontier(
+    course_names: builtins.list[str] | None = typer.Argument(
+        None, help="Names or aliases of the courses to plan for (default: all)"
+    ),
+    metric: FrontierMetric = typer.Option(
+        FrontierMetric.grade, "--metric", "-m", help="What to trade study hours against"
+    ),
+    hours: float | None = typer.Option(
+        None, "--hours", min=0, help="Also show the study plan for this many hours"
+    ),
+    fmt: OutputFormat = format_option(),
+) -> None:
+    """Show the trade-off between total study hours and grade, GPA or utility.
+
+    Tasks are worked on in order of credit-weighted marginal grade per hour,
+    and every point of the frontier is the plan up to that task.
+    """
+    study_frontier = build_frontier(resolve_courses(course_names), metric)
+
+    def describe(value: float) -> str:
+        return f"{value * 100:.2f}%" if metric == FrontierMetric.grade else f"{value:.3f}"
+
+    if fmt != OutputFormat.rich:
+        if hours is not None:
+            write_records(
+                (
+                    {"course": segment.course.name, "task": segment.task, "hours": spent}
+                    for segment, spent in study_frontier.plan(hours)
+                ),
+                fmt,
+                types={"hours": float},
+            )
+            return
+        records = []
+        for point in study_frontier.points:
+            step = study_frontier.step(point)
+            records.append(
+                {
+                    "hours": point.hours,
+                    metric.value: point.value,
+                    "course": step.course.name if step else None,
+                    "task": step.task if step else None,
+                }
+            )
+        write_records(records, fmt, types={"hours": float, metric.value: float, "task": str})
+        return
+
+    table = Table(title=f"Study Hours vs {metric.value.title()}")
+    table.add_column("Hours", justify="right", style="cyan")
+    table.add_column(metric.value.title(), justify="right", style="yellow")
+    table.add_column("Course", style="green")
+    table.add_column("Task", style="magenta")
+    for point in study_frontier.points:
+        step = study_frontier.step(point)
+        table.add_row(
+            f"{point.hours:.1f}",
+            describe(point.value),
+            step.course.name if step else "-",
+            step.task if step else "(no more work)",
+        )
+    console.print(table)
+
+    if hours is not None:
+        point = study_frontier.at(hours)
+        plan = Table(title=f"Plan for {hours:g} hours: {describe(point.value)}")
+        plan.add_column("Course", style="green")
+        plan.add_column("Task", style="magenta")
+        plan.add_column("Hours", justify="right", style="cyan")
+        for segment, spent in study_frontier.plan(point):
+            plan.add_row(segment.course.name, segment.task, f"{spent:.1f}")
+        console.print(plan)
+
+
+@app.command()
+def schedule(
+    course_names: builtins.list[str] | None = typer.Argument(
+        None, help="Names or aliases of the courses to schedule (default: all)"
+    ),
+    start: str | None = typer.Option(
+        None, "--start", help="First day of the schedule as an ISO date (default: today)"
+    ),
+    until: str | None = typer.Option(
+        None, "--until", help="Last day of the schedule as an ISO date (default: until done)"
+    ),
+    hours: float = typer.Option(4, "--hours", min=0, help="Study hours per weekday"),
+    weekend_hours: float | None = typer.Option(
+        None, "--weekend-hours", min=0, help="Study hours per weekend day (default: --hours)"
+    ),
+    student: str = typer.Option(DEFAULT_STUDENT, "--student", help="Student whose grades to use"),
+    fmt: OutputFormat = format_option(),
+) -> None:
+    """Plan the remaining study time of ungraded tasks day by day.
+
+    Each day's hours go to the released task due soonest, breaking ties by
+    credit-weighted marginal grade per hour. Grades recorded with `update`
+    are taken into account.
+    """
+    from datetime import date
+
+    from gf.classes import schedule_courses
+
+    days = {}
+    for label, value in (("start", start), ("until", until)):
+        if value is not None:
+            try:
+                days[label] = date.fromisoformat(value)
+            except ValueError:
+                err_console.print(f"[bold red]Error:[/bold red] Invalid date '{value}'")
+                raise typer.Exit(code=1) from None
+    weekend = hours if weekend_hours is None else weekend_hours
+    if not hours and not weekend:
+        err_console.print("[bold red]Error:[/bold red] No study hours in the week")
+        raise typer.Exit(code=1)
+
+    ledger = GradeLedger(LEDGER_DIR)
+    scenarios = []
+    for selected_course in resolve_courses(course_names):
+        scenario = ledger.course_at(selected_course, student=student)
+        scenario.name = selected_course.name  # Report under the course's own name
+        scenarios.append(scenario)
+    plan = schedule_courses(
+        scenarios,
+        days.get("start", local_time().date()),
+        [hours] * 5 + [weekend] * 2,
+        days.get("until"),
+    )
+    late = set(plan.late)
+
+    if fmt != OutputFormat.rich:
+        write_records(
+            (
+                {
+                    "day": block.day.isoformat(),
+                    "course": block.item.course.name,
+                    "task": block.item.task,
+                    "hours": block.hours,
+                    "due": block.item.due.isoformat() if block.item.due else None,
+                    "late": block.item in late,
+                }
+                for block in plan.blocks
+            ),
+            fmt,
+            types={"hours": float, "due": str},
+        )
+        return
+
+    table = Table(title=f"Study Schedule from {plan.start.isoformat()}")
+    table.add_column("Day", style="cyan")
+    table.add_column("Course", style="green")
+    table.add_column("Task", style="magenta")
+    table.add_column("Hours", justify="right", style="yellow")
+    table.add_column("Due", justify="right")
+    previous_day = None
+    for block in plan.blocks:
+        due = block.item.due.isoformat() if block.item.due else "-"
+        table.add_row(
+            block.day.strftime("%a %Y-%m-%d") if block.day != previous_day else "",
+            block.item.course.name,
+            block.item.task,
+            f"{block.hours:.1f}",
+            f"[red]{due}[/red]" if block.item in late else due,
+        )
+        previous_day = block.day
+    console.print(table)
+
+    if late:
+        console.print(
+            f"[bold red]{len(late)} task(s) finish after their due date[/bold red] "
+            "at these hours per day"
+        )
+    if plan.unscheduled:
+        left = sum(plan.unscheduled.values())
+        console.print(
+            f"[yellow]{left:.1f} hours of {len(plan.unscheduled)} task(s) "
+            "left after the last day[/yellow]"
+        )
+
+
+@app.command("mem-report")
+def mem_report(fmt: OutputFormat = format_option()) -> None:
+    """Show how much memory the loaded courses and the render cache use."""
+    import resource
+
+    from gf.memory import registry_footprint, render_cache_footprint
+
+    footprints = registry_footprint(courses)
+    if fmt != OutputFormat.rich:
+        write_records(footprints, fmt)
+        return
+
+    table = Table(title="Memory Footprint", show_footer=True)
+    table.add_column("Course", style="green", footer="TOTAL")
+    columns = ["tasks", "task_bytes", "group_bytes", "course_bytes", "total_bytes"]
+    for header in ["Tasks", "Task KiB", "Group KiB", "Course KiB", "Total KiB"]:
+        table.add_column(header, justify="right", style="cyan")
+    table.add_column("B/Task", justify="right", style="yellow")
+
+    totals = dict.fromkeys(columns, 0)
+    for record in footprints:
+        for column in columns:
+            totals[column] += record[column]
+        per_task = record["total_bytes"] / record["tasks"] if record["tasks"] else 0
+        table.add_row(
+            record["course"],
+            str(record["tasks"]),
+            *(f"{record[column] / 1024:.1f}" for column in columns[1:]),
+            f"{per_task:.0f}",
+        )
+    for column, footer in zip(table.columns[1:-1], totals.values(), strict=True):
+        column.footer = str(footer) if column.header == "Tasks" else f"{footer / 1024:.1f}"
+    console.print(table)
+
+    # ru_maxrss is in KiB on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    console.print(f"Render cache: {render_cache_footprint() / 1024:.1f} KiB")
+    console.print(f"Process peak RSS: {peak_rss / 1024:.1f} MiB")
+
+
+@app.command("cache")
+def cache_command(
+    clear: bool = typer.Option(False, "--clear", help="Delete every cached result"),
+    fmt: OutputFormat = format_option(),
+) -> None:
+    """Show (or clear) the on-disk cache of computed results."""
+    cache = get_cache()
+    if cache is None:
+        err_console.print("[bold red]Error:[/bold red] Caching is disabled (GF_NO_CACHE)")
+        raise typer.Exit(code=1)
+    if clear:
+        removed = cache.clear()
+        if fmt != OutputFormat.rich:
+            write_record({"directory": str(cache.directory), "removed": removed}, fmt)
+        else:
+            console.print(f"Removed {removed} cached results from {cache.directory}")
+        return
+
+    stats = cache.stats()
+    if fmt != OutputFormat.rich:
+        write_records(
+            (
+                {"kind": kind, **kind_stats, "directory": stats["directory"]}
+                for kind, kind_stats in sorted(stats["kinds"].items())
+            ),
+            fmt,
+        )
+        return
+
+    table = Table(title=f"Result Cache ({stats['directory']})", show_footer=True)
+    table.add_column("Kind", style="green", footer="TOTAL")
+    table.add_column("Entries", justify="right", style="cyan", footer=str(stats["entries"]))
+    table.add_column("KiB", justify="right", style="cyan", footer=f"{stats['bytes'] / 1024:.1f}")
+    for kind, kind_stats in sorted(stats["kinds"].items()):
+        table.add_row(kind, str(kind_stats["entries"]), f"{kind_stats['bytes'] / 1024:.1f}")
+    console.print(table)
+    console.print(f"Limit: {stats['max_bytes'] / 1024 / 1024:.1f} MiB")
+
+
+@app.command()
+def lint(
+    paths: builtins.list[Path] | None = typer.Argument(
+        None, help="Config files or directories to check (default: the configs directory)"
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Check every config, even the unchanged ones"
+    ),
+    fmt: OutputFormat = format_option(),
+    jobs: int = jobs_option(),
+) -> None:
+    """Check course configs for mistakes and report them all at once.
+
+    Exits with status 1 if any config has errors.
+    """
+    from gf.lint import Severity, lint_paths
+
+    paths = paths or [PROJ_ROOT / "configs"]
+    missing = [str(path) for path in paths if not path.exists()]
+    if missing:
+        err_console.print(f"[bold red]Error:[/bold red] No such file: {', '.join(missing)}")
+        raise typer.Exit(code=1)
+
+    results = lint_paths(paths, resolve_jobs(jobs), None if no_cache else get_cache())
+    issues = [issue for file_issues in results.values() for issue in file_issues]
+    n_errors = sum(issue.severity == Severity.error for issue in issues)
+
+    if fmt != OutputFormat.rich:
+        write_records((issue.to_record() for issue in issues), fmt, types={"line": int})
+    else:
+        styles = {Severity.error: "bold red", Severity.warning: "yellow"}
+        for path, file_issues in results.items():
+            if not file_issues:
+                continue
+            console.print(f"[bold]{path}[/bold]", highlight=False)
+            for issue in file_issues:
+                line = f"line {issue.line}" if issue.line else None
+                where = ":".join(part for part in (line, issue.course, issue.group) if part)
+                style = styles[issue.severity]
+                console.print(
+                    f"  [{style}]{issue.severity.value}[/{style}] [cyan]{issue.code}[/cyan] "
+                    f"{where + ': ' if where else ''}{issue.message}",
+                    highlight=False,
+                )
+        console.print(
+            f"{len(results)} configs checked: {n_errors} errors, {len(issues) - n_errors} warnings"
+        )
+    if n_errors:
+        raise typer.Exit(code=1)
+
+
 def task_course_callback(
-    ctx: typer.Context, param: typer.CallbackParam, value: Optional[str]
-) -> Optional[str]:
+    ctx: typer.Context, param: typer.CallbackParam, value: str | None
+) -> str | None:
     """Callback for course name argument in task-related commands."""
     if not value and not ctx.resilient_parsing:
-        show_available_courses()
-        raise typer.Exit()
+        missing_courses(ctx.params.get("fmt"))
     return value
 
 
@@ -266,27 +1195,17 @@ def tasks(
     course_name: str = typer.Argument(
         None, help="Name or alias of the course to list tasks for", callback=task_course_callback
     ),
+    fmt: OutputFormat = format_option(),
 ) -> None:
     """List all tasks in a course."""
-    # First try to find by name
-    selected_course = find_course(course_name, courses)
+    selected_course = resolve_course(course_name)
 
-    # If not found, try to find by alias
     if selected_course is None:
-        for c in courses:
-            if course_aliases[c.name] == course_name.lower():
-                selected_course = c
-                break
-
-    # If still not found, try to find by index
-    if selected_course is None and course_name.isdigit():
-        idx = int(course_name) - 1
-        if 0 <= idx < len(courses):
-            selected_course = courses[idx]
+        course_not_found(course_name, fmt)
+        return
 
-    if selected_course is None:
-        console.print(f"[bold red]Error:[/bold red] Course '{course_name}' not found.")
-        show_available_courses()
+    if fmt != OutputFormat.rich:
+        write_records(task_records(selected_course), fmt, types=TASK_RECORD_TYPES)
         return
 
     # Create a table to display tasks
@@ -312,9 +1231,7 @@ def tasks(
     console.print(table)
 
 
-def task_callback(
-    ctx: typer.Context, param: typer.CallbackParam, value: Optional[str]
-) -> Optional[str]:
+def task_callback(ctx: typer.Context, param: typer.CallbackParam, value: str | None) -> str | None:
     """Callback for task name argument to show available tasks if not provided."""
     # We can't show tasks here because we don't know the course yet
     # The course parameter will be handled by its own callback
@@ -326,28 +1243,14 @@ def task(
     course_name: str = typer.Argument(
         None, help="Name or alias of the course containing the task", callback=task_course_callback
     ),
-    task_name: Optional[str] = typer.Argument(None, help="Name or index of the task to analyze"),
+    task_name: str | None = typer.Argument(None, help="Name or index of the task to analyze"),
+    fmt: OutputFormat = format_option(),
 ) -> None:
     """Analyze a specific task within a course."""
-    # First try to find by name
-    selected_course = find_course(course_name, courses)
-
-    # If not found, try to find by alias
-    if selected_course is None:
-        for c in courses:
-            if course_aliases[c.name] == course_name.lower():
-                selected_course = c
-                break
-
-    # If still not found, try to find by index
-    if selected_course is None and course_name.isdigit():
-        idx = int(course_name) - 1
-        if 0 <= idx < len(courses):
-            selected_course = courses[idx]
+    selected_course = resolve_course(course_name)
 
     if selected_course is None:
-        console.print(f"[bold red]Error:[/bold red] Course '{course_name}' not found.")
-        show_available_courses()
+        course_not_found(course_name, fmt)
         return
 
     # Get all tasks from the course
@@ -356,6 +1259,9 @@ def task(
         all_tasks.extend(group.tasks)
 
     # If task_name is not provided, show available tasks
+    if task_name is None and fmt != OutputFormat.rich:
+        write_records(task_records(selected_course), fmt, types=TASK_RECORD_TYPES)
+        return
     if task_name is None:
         table = Table(title=f"Tasks in {selected_course.name}")
         table.add_column("Index", style="cyan")
@@ -379,9 +1285,14 @@ def task(
     selected_task = find_task(task_name, selected_course, all_tasks)
 
     if selected_task is None:
-        console.print(
-            f"[bold red]Error:[/bold red] Task '{task_name}' not found in course '{selected_course.name}'."
+        error = (
+            f"[bold red]Error:[/bold red] Task '{task_name}' "
+            f"not found in course '{selected_course.name}'."
         )
+        if fmt != OutputFormat.rich:
+            err_console.print(error)
+            raise typer.Exit(code=1)
+        console.print(error)
         table = Table(title=f"Tasks in {selected_course.name}")
         table.add_column("Index", style="cyan")
         table.add_column("Task Name", style="green")
@@ -392,6 +1303,14 @@ def task(
         console.print(table)
         return
 
+    if fmt != OutputFormat.rich:
+        write_record(
+            task_analysis_record(selected_course, selected_task),
+            fmt,
+            types=TASK_ANALYSIS_RECORD_TYPES,
+        )
+        return
+
     display_task_analysis(selected_course, selected_task)
 
 
@@ -400,25 +1319,13 @@ def update(
     course_name: str = typer.Argument(
         None, help="Name or alias of the course containing the task", callback=task_course_callback
     ),
-    task_name: Optional[str] = typer.Argument(None, help="Name or index of the task to update"),
-    grade: Optional[float] = typer.Argument(None, help="New grade for the task (0-100)"),
+    task_name: str | None = typer.Argument(None, help="Name or index of the task to update"),
+    grade: float | None = typer.Argument(None, help="New grade for the task (0-100)"),
 ) -> None:
     """Update a task's grade."""
-    # First try to find by name
-    selected_course = find_course(course_name, courses)
+    import time
 
-    # If not found, try to find by alias
-    if selected_course is None:
-        for c in courses:
-            if course_aliases[c.name] == course_name.lower():
-                selected_course = c
-                break
-
-    # If still not found, try to find by index
-    if selected_course is None and course_name.isdigit():
-        idx = int(course_name) - 1
-        if 0 <= idx < len(courses):
-            selected_course = courses[idx]
+    selected_course = resolve_course(course_name)
 
     if selected_course is None:
         console.print(f"[bold red]Error:[/bold red] Course '{course_name}' not found.")
@@ -455,7 +1362,8 @@ def update(
 
     if selected_task is None:
         console.print(
-            f"[bold red]Error:[/bold red] Task '{task_name}' not found in course '{selected_course.name}'."
+            f"[bold red]Error:[/bold red] Task '{task_name}' "
+            f"not found in course '{selected_course.name}'."
         )
         table = Table(title=f"Tasks in {selected_course.name}")
         table.add_column("Index", style="cyan")
@@ -488,8 +1396,11 @@ def update(
     # Convert percentage to decimal
     decimal_grade = grade / 100.0
 
-    # Update the task's grade
+    # Update the task's grade and keep a record of the change
     selected_task.set_grade(decimal_grade)
+    GradeLedger(LEDGER_DIR).append(
+        GradeEvent(time.time(), selected_course.name, selected_task.name, decimal_grade)
+    )
 
     console.print(f"Updated grade for '{selected_task.name}' to {grade:.1f}%")
 
@@ -497,14 +1408,79 @@ def update(
     display_course_info(selected_course)
 
 
+def parse_point_in_time(value: str) -> datetime:
+    """Parse an ISO date (meaning its end) or time, in local time unless it has an offset."""
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        err_console.print(f"[bold red]Error:[/bold red] Invalid date or time '{value}'")
+        raise typer.Exit(code=1) from None
+    if len(value) == len("YYYY-MM-DD"):
+        moment = datetime.combine(moment.date(), datetime.max.time())
+    return moment if moment.tzinfo is not None else moment.astimezone()
+
+
+@app.command()
+def history(
+    course_name: str = typer.Argument(
+        None, help="Name, alias or index of the course", callback=course_callback
+    ),
+    at: str | None = typer.Option(
+        None,
+        "--at",
+        help="Reconstruct the course as of this ISO date or time (a date means its end)",
+    ),
+    student: str = typer.Option(DEFAULT_STUDENT, "--student", help="Student whose grades to use"),
+    compact: bool = typer.Option(
+        False, "--compact", help="Snapshot the ledger so later loads skip the events so far"
+    ),
+    fmt: OutputFormat = format_option(),
+) -> None:
+    """Show the recorded grade updates of a course and its forecast at a point in time."""
+    selected_course = resolve_course(course_name)
+    if selected_course is None:
+        course_not_found(course_name, fmt)
+        return
+
+    as_of = None if at is None else parse_point_in_time(at)
+    ledger = GradeLedger(LEDGER_DIR)
+    if compact:
+        snapshot = ledger.compact()
+        if snapshot is not None:
+            err_console.print(f"Snapshot of {snapshot.events} events written", highlight=False)
+    scenario = ledger.course_at(selected_course, as_of, student)
+    record = {
+        **course_record(scenario),
+        "as_of": (as_of or local_time()).isoformat(timespec="seconds"),
+    }
+    if fmt != OutputFormat.rich:
+        write_record(record, fmt, types=COURSE_RECORD_TYPES)
+        return
+
+    table = Table(title=f"Grade History of {selected_course.name}")
+    table.add_column("Time", style="cyan")
+    table.add_column("Task", style="green")
+    table.add_column("Grade", justify="right", style="yellow")
+    for event in ledger.events(until=as_of):
+        if event.course == selected_course.name and event.student == student:
+            grade = f"{event.grade * 100:.1f}%" if event.grade is not None else "cleared"
+            time_label = local_time(event.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+            table.add_row(time_label, event.task, grade)
+    console.print(table)
+    console.print(create_course_summary_panel(scenario, record))
+
+
 @app.command()
 def compare(
-    course_names: Optional[builtins.list[str]] = typer.Argument(
+    course_names: builtins.list[str] | None = typer.Argument(
         None, help="Names or aliases of courses to compare"
     ),
+    fmt: OutputFormat = format_option(),
 ) -> None:
     """Compare multiple courses."""
     if not course_names:
+        if fmt != OutputFormat.rich:
+            missing_courses(fmt, "the courses to compare")
         show_available_courses()
         console.print("\n[bold cyan]Usage example:[/bold cyan]")
         if len(courses) >= 2:
@@ -516,27 +1492,23 @@ def compare(
 
     selected_courses = []
     for name in course_names:
-        # First try to find by name
-        course = find_course(name, courses)
-
-        # If not found, try to find by alias
-        if course is None:
-            for c in courses:
-                if course_aliases[c.name] == name.lower():
-                    course = c
-                    break
-
-        # If still not found, try to find by index
-        if course is None and name.isdigit():
-            idx = int(name) - 1
-            if 0 <= idx < len(courses):
-                course = courses[idx]
+        course = resolve_course(name)
 
         if course is None:
-            console.print(f"[bold red]Error:[/bold red] Course '{name}' not found.")
+            (console if fmt == OutputFormat.rich else err_console).print(
+                f"[bold red]Error:[/bold red] Course '{name}' not found."
+            )
             continue
         selected_courses.append(course)
 
+    if fmt != OutputFormat.rich:
+        write_records(
+            ({**course_record(c), "care_factor": c.care_factor} for c in selected_courses),
+            fmt,
+            types={**COURSE_RECORD_TYPES, "care_factor": float},
+        )
+        return
+
     if not selected_courses:
         console.print("[bold red]No valid courses found for comparison.[/bold red]")
         show_available_courses()
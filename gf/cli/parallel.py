@@ -0,0 +1,124 @@
+"""Process-pool rendering for multi-course reports.
+
+Workers look courses up by index in the CLI's course list, build and render
+their panels to text, and return the text. The parent writes the segments in
+input order, so output is identical to a serial run.
+"""
+
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import io
+import multiprocessing
+import os
+from typing import Any
+
+from rich.console import Console, RenderableType
+
+from gf.cache import ResultCache, cache_key, get_cache
+from gf.classes import Course, create_grading_group_display
+from gf.cli.display import create_course_details_panel, create_course_summary_panel
+from gf.cli.records import cached_course_record
+
+# Work items handed to each worker at a time
+CHUNK_SIZE = 4
+
+
+def resolve_jobs(jobs: int) -> int:
+    """Turn a --jobs value into a worker count (0 means one per CPU)."""
+    return jobs if jobs > 0 else os.cpu_count() or 1
+
+
+def render_text(renderable: RenderableType, width: int, color_system: str | None) -> str:
+    """Render to a string, keeping ANSI styles when color_system is set."""
+    console = Console(
+        width=width,
+        file=io.StringIO(),
+        force_terminal=color_system is not None,
+        color_system=color_system,
+    )
+    console.print(renderable)
+    return console.file.getvalue()
+
+
+def render_summary_text(
+    course: Course,
+    record: dict[str, Any],
+    width: int,
+    color_system: str | None,
+    cache: ResultCache | None = None,
+) -> str:
+    """Render a course's summary panel, reusing the text cached for its content hash."""
+
+    def render() -> str:
+        return render_text(create_course_summary_panel(course, record), width, color_system)
+
+    if cache is None:
+        return render()
+    key = cache_key(course, "summary_panel", width, color_system)
+    return cache.get_or_compute("summary_panel", key, render)
+
+
+def _render_summary(
+    item: tuple[int, dict[str, Any] | None], width: int, color_system: str | None
+) -> tuple[dict[str, Any], str]:
+    from gf.cli.main import courses  # noqa: PLC0415 - gf.cli.main imports this module
+
+    index, record = item
+    course = courses[index]
+    cache = get_cache()
+    if record is None:
+        record = cached_course_record(course, cache)
+    return record, render_summary_text(course, record, width, color_system, cache)
+
+
+def _render_details(index: int, width: int, color_system: str | None) -> str:
+    from gf.cli.main import courses  # noqa: PLC0415
+
+    return render_text(create_course_details_panel(courses[index]), width, color_system)
+
+
+def _render_group(item: tuple[int, int], width: int, color_system: str | None) -> str:
+    from gf.cli.main import courses  # noqa: PLC0415
+
+    course_index, group_index = item
+    group = courses[course_index].grading_groups[group_index]
+    return render_text(create_grading_group_display(group), width, color_system)
+
+
+_RENDERERS = {
+    "summary": _render_summary,
+    "details": _render_details,
+    "group": _render_group,
+}
+
+
+def render_in_pool(
+    kind: str,
+    items: Iterable[Any],
+    jobs: int,
+    console: Console,
+) -> Iterator[Any]:
+    """Render work items, in order, on a pool of ``jobs`` processes.
+
+    Args:
+        kind: "summary" (items are (course index, record or None)),
+            "details" (items are course indices) or "group"
+            (items are (course index, group index))
+        items: Work items for the renderer
+        jobs: Number of worker processes (1 renders in this process)
+        console: Console whose width and color system the output should match
+
+    Yields:
+        The renderer's results in the same order as ``items``
+    """
+    render = partial(_RENDERERS[kind], width=console.width, color_system=console.color_system)
+    if jobs <= 1:
+        yield from map(render, items)
+        return
+
+    # Forked workers see the parent's in-memory course state (e.g. grades updated in a daemon)
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as executor:
+        yield from executor.map(render, items, chunksize=CHUNK_SIZE)
@@ -1,38 +1,48 @@
 """Plotting utilities for the grade forecast CLI."""
 
-import copy
-
 import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
 
 from gf.classes import Course
 
+# Number of task grades sampled for sensitivity curves
+SENSITIVITY_POINTS = 100
 
-def plot_course_grade_vs_grade(course: Course, name: str) -> matplotlib.lines.Line2D:
-    """Plot how a task's grade affects the course grade.
+
+def course_grade_sensitivity(course: Course, name: str) -> tuple[np.ndarray, np.ndarray]:
+    """Compute the course grade as a function of one task's grade.
 
     Args:
         course: The course to analyze
         name: The name of the task to analyze
 
     Returns:
-        matplotlib.lines.Line2D: The plotted line
+        tuple: Task grades and the corresponding course grades
     """
-    # Create a copy of the course to avoid modifying the original
-    course_copy = copy.deepcopy(course)
-
-    # Get the task by name
-    task = course_copy.get_task(name)
+    # Evaluate every task grade at once on the compiled plan, which never
+    # modifies the course
+    plan = course.compile()
+    x = np.linspace(0, 1, SENSITIVITY_POINTS)
+    return x, plan.sweep(plan.grades_of(course), name, x)
+
+
+def plot_course_grade_vs_grade(
+    course: Course,
+    name: str,
+    sensitivity: tuple[np.ndarray, np.ndarray] | None = None,
+) -> matplotlib.lines.Line2D:
+    """Plot how a task's grade affects the course grade.
 
-    # Create arrays for x and y values
-    x = np.linspace(0, 1, 100)
-    y = []
+    Args:
+        course: The course to analyze
+        name: The name of the task to analyze
+        sensitivity: Precomputed result of course_grade_sensitivity, if available
 
-    # Calculate course grade for each task grade
-    for grade in x:
-        task.set_grade(grade)
-        y.append(course_copy.get_grade())
+    Returns:
+        matplotlib.lines.Line2D: The plotted line
+    """
+    x, y = sensitivity if sensitivity is not None else course_grade_sensitivity(course, name)
 
     # Create the plot
     plt.figure(figsize=(10, 6))
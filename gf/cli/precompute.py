@@ -0,0 +1,104 @@
+"""Background precomputation for the interactive interface.
+
+While the user reads the course table, a worker thread renders every course
+overview into the render cache and computes the grade sensitivity curve of
+every task. Selections are then served from those results. Results are keyed
+by the course's version, so anything that changed since is recomputed on
+demand instead of being served stale.
+"""
+
+from collections import deque
+from functools import partial
+import threading
+
+from loguru import logger
+import numpy as np
+
+from gf.classes import Course, Task
+from gf.classes.visualization import render_segments
+from gf.cli import display
+from gf.cli.display import create_course_info_panel
+from gf.cli.plotting import course_grade_sensitivity
+
+Sensitivity = tuple[np.ndarray, np.ndarray]
+
+
+class Precomputer:
+    """Precomputes course overviews and task sensitivity curves in a daemon thread."""
+
+    def __init__(self, courses: list[Course]) -> None:
+        self.courses = courses
+        self._sensitivities: dict[tuple[int, str], tuple[int, Sensitivity]] = {}
+        self._queue: deque[tuple[Course, Task | None]] = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="gf-precompute", daemon=True)
+
+        # Overviews first, since those are shown as soon as a course is picked
+        self._queue.extend((course, None) for course in courses)
+        for course in courses:
+            self._queue.extend(
+                (course, task) for group in course.grading_groups for task in group.tasks
+            )
+
+    def start(self) -> None:
+        """Start precomputing in the background."""
+        self._thread.start()
+        self._wakeup.set()
+
+    def prioritize(self, course: Course) -> None:
+        """Move a course's remaining work to the front of the queue.
+
+        Args:
+            course: The course the user just selected
+        """
+        with self._lock:
+            mine = [item for item in self._queue if item[0] is course]
+            others = [item for item in self._queue if item[0] is not course]
+            self._queue = deque(mine + others)
+        self._wakeup.set()
+
+    def get_sensitivity(self, course: Course, task: Task) -> Sensitivity:
+        """Return a task's sensitivity curve, computing it now if it isn't ready.
+
+        Args:
+            course: The course containing the task
+            task: The task to analyze
+
+        Returns:
+            Sensitivity: Task grades and the corresponding course grades
+        """
+        key = (id(course), task.name)
+        version = course.get_version()
+        with self._lock:
+            cached = self._sensitivities.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        sensitivity = course_grade_sensitivity(course, task.name)
+        with self._lock:
+            self._sensitivities[key] = (version, sensitivity)
+        return sensitivity
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                item = self._queue.popleft() if self._queue else None
+            if item is None:
+                self._wakeup.clear()
+                self._wakeup.wait()
+                continue
+
+            course, task = item
+            try:
+                if task is None:
+                    render_segments(
+                        course,
+                        "info",
+                        partial(create_course_info_panel, course),
+                        display.console.width,
+                    )
+                else:
+                    self.get_sensitivity(course, task)
+            except Exception:  # noqa: BLE001 - a failed job must not stop the worker
+                logger.exception(f"Precomputing {course.name} failed")
@@ -0,0 +1,325 @@
+"""Plain-data records of computed course numbers for the grade forecast CLI."""
+
+from collections.abc import Callable, Iterable, Iterator
+import heapq
+from itertools import islice
+from typing import Any
+
+from gf.cache import ResultCache, cache_key
+from gf.classes import Course, GradingGroup, Task
+from gf.classes.grading_functions import kept_count
+
+# Keys that summaries can be sorted by, mapped to whether they sort descending by default
+SUMMARY_SORT_KEYS = {
+    "name": False,
+    "expected": True,
+    "current": True,
+    "min_work": True,
+    "no_work": True,
+    "completion": True,
+}
+
+_SORT_FIELDS = {
+    "name": "course",
+    "expected": "expected_grade",
+    "current": "current_grade",
+    "min_work": "min_work_grade",
+    "no_work": "no_work_grade",
+    "completion": "completion",
+}
+
+# Types of record fields that can be an int 0 or None (see gf.cli.formats.write_records)
+COURSE_RECORD_TYPES = dict.fromkeys(
+    ["expected_grade", "current_grade", "min_work_grade", "no_work_grade", "completion"], float
+)
+GROUP_RECORD_TYPES = dict.fromkeys(
+    [
+        "weight",
+        "raw_grade",
+        "min_work_contribution",
+        "current_contribution",
+        "expected_contribution",
+        "no_work_contribution",
+    ],
+    float,
+)
+TASK_RECORD_TYPES = dict.fromkeys(["grade", "base_grade", "expected_grade", "pst"], float)
+TASK_ANALYSIS_RECORD_TYPES = {
+    **TASK_RECORD_TYPES,
+    **dict.fromkeys(
+        [
+            "weight_in_group",
+            "marginal_grade_per_hour",
+            "course_marginal_grade_per_hour",
+            "max_contribution",
+        ],
+        float,
+    ),
+}
+# The forecast, group and calibration tables of a backtest, written as one table
+BACKTEST_RECORD_TYPES = {
+    **dict.fromkeys(["table", "course", "forecast", "group"], str),
+    **dict.fromkeys(["students", "steps", "graded_tasks"], int),
+    **dict.fromkeys(
+        [
+            "progress",
+            "bias",
+            "mae",
+            "rmse",
+            "letter_accuracy",
+            "expected_grade",
+            "mean_grade",
+            "forecast_low",
+            "forecast_high",
+            "mean_forecast",
+            "mean_outcome",
+        ],
+        float,
+    ),
+}
+
+
+def course_record(course: Course) -> dict[str, Any]:
+    """Compute the summary numbers for a course.
+
+    Args:
+        course: The course to summarize
+
+    Returns:
+        dict: Grades (as fractions), letter grade and task completion counts
+    """
+    total_tasks = 0
+    completed_tasks = 0
+    for group in course.grading_groups:
+        total_tasks += len(group.tasks)
+        completed_tasks += sum(1 for task in group.tasks if task.grade is not None)
+
+    min_work_grade = course.get_grade()
+    return {
+        "course": course.name,
+        "expected_grade": course.get_expected_grade(),
+        "current_grade": course.get_current_grade(),
+        "min_work_grade": min_work_grade,
+        "no_work_grade": course.get_true_grade(),
+        "letter_grade": course.get_letter_grade(min_work_grade),
+        "completed_tasks": completed_tasks,
+        "total_tasks": total_tasks,
+        "completion": completed_tasks / total_tasks if total_tasks else 0.0,
+    }
+
+
+def iter_course_summaries(
+    courses: Iterable[Course],
+    *,
+    sort_by: str | None = None,
+    reverse: bool = False,
+    top: int | None = None,
+    letters: Iterable[str] | None = None,
+    name_filter: str | None = None,
+    record: Callable[[Course], dict[str, Any]] = course_record,
+) -> Iterator[tuple[Course, dict[str, Any]]]:
+    """Lazily compute summary records for courses.
+
+    Records are produced one course at a time so callers can print them as
+    they arrive. Sorting with ``top`` only keeps ``top`` records in memory.
+
+    Args:
+        courses: Courses to summarize
+        sort_by: Key from SUMMARY_SORT_KEYS to order by (None keeps input order)
+        reverse: Flip the default direction of ``sort_by``
+        top: Only yield the first ``top`` courses by ``sort_by``
+        letters: Only yield courses whose letter grade is one of these
+        name_filter: Only yield courses whose name contains this (case-insensitive)
+        record: Computes a course's summary record (e.g. a cached course_record)
+
+    Yields:
+        tuple: The course and its summary record
+    """
+    if sort_by is not None and sort_by not in SUMMARY_SORT_KEYS:
+        msg = f"Unknown sort key '{sort_by}'"
+        raise ValueError(msg)
+
+    wanted_letters = {letter.upper() for letter in letters} if letters else None
+    needle = name_filter.lower() if name_filter else None
+
+    summaries = (
+        (course, record(course))
+        for course in courses
+        if needle is None or needle in course.name.lower()
+    )
+    if wanted_letters is not None:
+        summaries = (item for item in summaries if item[1]["letter_grade"] in wanted_letters)
+
+    if sort_by is None:
+        yield from summaries if top is None else islice(summaries, top)
+        return
+
+    field = _SORT_FIELDS[sort_by]
+    descending = SUMMARY_SORT_KEYS[sort_by] != reverse
+
+    def key(item: tuple[Course, dict[str, Any]]) -> float | str:
+        return item[1][field]
+
+    if top is not None:
+        select = heapq.nlargest if descending else heapq.nsmallest
+        yield from select(top, summaries, key=key)
+    else:
+        yield from sorted(summaries, key=key, reverse=descending)
+
+
+def paginate(items: Iterable[Any], page: int = 1, page_size: int | None = None) -> Iterator[Any]:
+    """Yield a single page of items without materializing the others.
+
+    Args:
+        items: Items to page through
+        page: 1-based page number
+        page_size: Items per page (None yields everything)
+
+    Returns:
+        Iterator: The items on the requested page
+    """
+    if page_size is None:
+        return iter(items)
+    start = (page - 1) * page_size
+    return islice(items, start, start + page_size)
+
+
+def group_record(course: Course, group: GradingGroup) -> dict[str, Any]:
+    """Compute the contribution numbers of one grading group.
+
+    Args:
+        course: The course the group belongs to
+        group: The grading group to describe
+
+    Returns:
+        dict: Task counts and contributions (as weighted fractions)
+    """
+    return {
+        "course": course.name,
+        "group": group.name,
+        "weight": group.weight,
+        "tasks": len(group.tasks),
+        "completed_tasks": sum(1 for task in group.tasks if task.grade is not None),
+        "drop_lowest": group.drop_lowest,
+        "raw_grade": group.get_raw_contribution(),
+        "min_work_contribution": group.get_contribution(),
+        "current_contribution": group.get_current_contribution(),
+        "expected_contribution": group.get_expected_contribution(),
+        "no_work_contribution": group.get_true_contribution(),
+    }
+
+
+def group_records(course: Course) -> Iterator[dict[str, Any]]:
+    """Yield the contribution numbers for each grading group in a course.
+
+    Args:
+        course: The course whose grading groups to describe
+
+    Yields:
+        dict: One record per grading group (contributions are weighted fractions)
+    """
+    for group in course.grading_groups:
+        yield group_record(course, group)
+
+
+def course_record_from_groups(course: Course, groups: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Assemble a course's summary record (see course_record) from its group records."""
+    groups = list(groups)
+    total_tasks = sum(group["tasks"] for group in groups)
+    completed_tasks = sum(group["completed_tasks"] for group in groups)
+    min_work_grade = sum(group["min_work_contribution"] for group in groups)
+    return {
+        "course": course.name,
+        "expected_grade": sum(group["expected_contribution"] for group in groups),
+        "current_grade": (
+            sum(group["current_contribution"] for group in groups) if completed_tasks else 0.0
+        ),
+        "min_work_grade": min_work_grade,
+        "no_work_grade": sum(group["no_work_contribution"] for group in groups),
+        "letter_grade": course.get_letter_grade(min_work_grade),
+        "completed_tasks": completed_tasks,
+        "total_tasks": total_tasks,
+        "completion": completed_tasks / total_tasks if total_tasks else 0.0,
+    }
+
+
+def cached_course_record(course: Course, cache: ResultCache | None) -> dict[str, Any]:
+    """Like course_record, but cached on disk under the course's content hash.
+
+    On a miss the record is assembled from group records cached under each
+    group's hash, so only the groups that changed are recomputed.
+
+    Args:
+        course: The course to summarize
+        cache: Result cache (None computes the record directly)
+
+    Returns:
+        dict: The course's summary record
+    """
+    if cache is None:
+        return course_record(course)
+
+    def from_groups() -> dict[str, Any]:
+        groups = [
+            cache.get_or_compute(
+                "group",
+                cache_key(group, course.name),
+                lambda group=group: group_record(course, group),
+            )
+            for group in course.grading_groups
+        ]
+        return course_record_from_groups(course, groups)
+
+    return cache.get_or_compute("course", cache_key(course), from_groups)
+
+
+def task_records(course: Course) -> Iterator[dict[str, Any]]:
+    """Yield one record per task in a course, numbered like the CLI task tables.
+
+    Args:
+        course: The course whose tasks to list
+
+    Yields:
+        dict: The task's index, group and grade state
+    """
+    idx = 0
+    for group in course.grading_groups:
+        for task in group.tasks:
+            idx += 1
+            yield {
+                "index": idx,
+                "course": course.name,
+                "task": task.name,
+                "group": group.name,
+                "completed": task.grade is not None,
+                "grade": task.grade,
+                "base_grade": task.base_grade,
+                "expected_grade": task.expected_grade,
+                "pst": task.pst,
+            }
+
+
+def task_analysis_record(course: Course, task: Task) -> dict[str, Any]:
+    """Compute the numbers shown by the task analysis display.
+
+    Args:
+        course: The course containing the task
+        task: The task to analyze
+
+    Returns:
+        dict: The task's grades, study time and marginal grade per hour
+    """
+    group = course.get_parent(task)
+    return {
+        "course": course.name,
+        "task": task.name,
+        "group": group.name,
+        "weight_in_group": 1 / kept_count(len(group.tasks), group.drop_lowest),
+        "grade": task.grade,
+        "base_grade": task.base_grade,
+        "expected_grade": task.expected_grade,
+        "pst": task.pst,
+        "marginal_grade_per_hour": task.get_marginal_grade_per_hour(),
+        "course_marginal_grade_per_hour": course.get_marginal_grade_per_hour(task),
+        "max_contribution": group.get_max_task_contribution(task),
+    }
@@ -0,0 +1,93 @@
+"""Entry point that forwards commands to a running `grade-forecast serve` daemon.
+
+Importing the full CLI pulls in the course configs, Rich and matplotlib. This
+module only needs the standard library and gf.config, so when a daemon is listening the
+command is answered without paying for any of that. Otherwise, or when
+GF_NO_DAEMON is set, it falls back to running the CLI in-process.
+
+The daemon is looked for at GF_DAEMON_SOCKET (see gf.config). That is also
+where `serve` listens by default; a daemon started with another ``--socket``
+only gets commands when GF_DAEMON_SOCKET is set to its path.
+"""
+
+import base64
+from importlib import import_module
+import json
+import os
+from pathlib import Path
+import shutil
+import socket
+import sys
+from typing import Any
+
+from gf.config import DAEMON_SOCKET
+
+# Commands answered by the daemon. `run` and `task` stay local because they
+# are interactive or open plot windows, and `serve` starts a daemon itself.
+FORWARDED_COMMANDS = frozenset(
+    {"list", "summary", "course", "tasks", "compare", "report", "update"}
+)
+
+# Seconds to wait for the daemon to accept a connection before running locally
+CONNECT_TIMEOUT = 0.2
+
+
+def send_request(request: dict[str, Any], socket_path: Path) -> dict[str, Any] | None:
+    """Send one request to the daemon.
+
+    Args:
+        request: JSON-serializable request (see gf.cli.daemon.handle_request)
+        socket_path: Path of the daemon's Unix socket
+
+    Returns:
+        dict or None: The daemon's response, or None if no daemon is listening
+    """
+    if not hasattr(socket, "AF_UNIX") or not socket_path.exists():
+        return None
+    if socket_path.stat().st_uid != os.getuid():
+        # Not our daemon: someone else created the socket
+        return None
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(str(socket_path))
+        except OSError:
+            return None
+        sock.settimeout(None)
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+        with sock.makefile("rb") as response:
+            return json.loads(response.read())
+
+
+def main() -> None:
+    """Run a grade-forecast command, through the daemon when one is running."""
+    argv = sys.argv[1:]
+    if argv and argv[0] in FORWARDED_COMMANDS and not os.environ.get("GF_NO_DAEMON"):
+        response = send_request(
+            {"argv": argv, "width": shutil.get_terminal_size().columns},
+            DAEMON_SOCKET,
+        )
+        if response is not None:
+            if "stdout_base64" in response:
+                sys.stdout.buffer.write(base64.b64decode(response["stdout_base64"]))
+            else:
+                sys.stdout.write(response["stdout"])
+            sys.stderr.write(response["stderr"])
+            sys.exit(response["exit_code"])
+
+    # Only imported without a daemon to answer, to keep forwarding fast
+    from gf import profiling  # noqa: PLC0415
+
+    # Timed separately so --profile can attribute startup cost
+    with profiling.startup_timer("config_load"):
+        import_module("configs")
+    with profiling.startup_timer("cli_import"):
+        from gf.cli.main import app  # noqa: PLC0415
+
+    app()
+
+
+if __name__ == "__main__":
+    main()
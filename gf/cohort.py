@@ -0,0 +1,216 @@
+"""Out-of-core evaluation of a cohort's grade matrix against a course.
+
+A cohort is a students x tasks matrix of grade fractions (NaN for ungraded)
+stored as a ``.npy`` file, like the ``columnar`` output of ``grade-forecast
+gen``. A ``tasks.json`` file next to it names the columns. The matrix is
+memory-mapped and evaluated in fixed-size chunks on the course's compiled
+plan. Results are written into a memory-mapped structured ``.npy`` file.
+Peak memory therefore depends on the chunk size, not on the number of
+students.
+"""
+
+from collections.abc import Iterator, Mapping, Sequence
+import json
+from pathlib import Path
+
+from loguru import logger
+import numpy as np
+
+from gf.classes import Course
+from gf.classes.term import DEFAULT_GRADE_POINTS, GPA_SCENARIOS
+
+# Students evaluated at a time
+COHORT_CHUNK_SIZE = 8192
+
+# Per-student GPA in each forecast scenario
+GPA_DTYPE = np.dtype([(scenario, np.float32) for scenario in GPA_SCENARIOS])
+
+# Results field holding each scenario's grade
+_SCENARIO_FIELDS = {
+    "no_work": "no_work_grade",
+    "current": "current_grade",
+    "min_work": "min_work_grade",
+    "expected": "expected_grade",
+}
+
+# One row of results per student
+RESULT_DTYPE = np.dtype(
+    [
+        ("current_grade", np.float32),
+        ("expected_grade", np.float32),
+        ("min_work_grade", np.float32),
+        ("no_work_grade", np.float32),
+        ("letter_grade", "U2"),
+    ]
+)
+
+
+def letter_grades(course: Course, grades: np.ndarray) -> np.ndarray:
+    """Vectorized Course.get_letter_grade for an array of grade fractions."""
+    percent = np.asarray(grades) * 100
+    letters = list(course.grading_boundaries)
+    conditions = [
+        (lower <= percent) & (percent <= upper)
+        for lower, upper in course.grading_boundaries.values()
+    ]
+    return np.select(conditions, letters, default="?")
+
+
+def grade_points(
+    course: Course, grades: np.ndarray, points: Mapping[str, float] = DEFAULT_GRADE_POINTS
+) -> np.ndarray:
+    """Vectorized grade points of an array of grade fractions (0 for unmapped letters)."""
+    percent = np.asarray(grades) * 100
+    conditions = [
+        (lower <= percent) & (percent <= upper)
+        for lower, upper in course.grading_boundaries.values()
+    ]
+    choices = [points.get(letter, 0.0) for letter in course.grading_boundaries]
+    return np.select(conditions, choices, default=0.0)
+
+
+def resolve_cohort(path: Path) -> tuple[Path, list[str] | None]:
+    """Find a cohort's grade matrix and column names.
+
+    Args:
+        path: A ``.npy`` file, or a directory containing ``grades.npy``
+
+    Returns:
+        tuple: The matrix path and the task names from ``tasks.json`` (None if absent)
+    """
+    matrix_path = path / "grades.npy" if path.is_dir() else path
+    tasks_path = matrix_path.parent / "tasks.json"
+    if not tasks_path.exists():
+        return matrix_path, None
+    with tasks_path.open() as f:
+        return matrix_path, [entry["task"] for entry in json.load(f)["tasks"]]
+
+
+def _column_map(course: Course, columns: list[str] | None, width: int) -> np.ndarray | None:
+    """Map the plan's tasks to matrix columns (-1 for missing), or None if they already line up."""
+    plan = course.compile()
+    if columns is None:
+        if width != len(plan):
+            msg = (
+                f"Matrix has {width} columns but '{course.name}' has {len(plan)} tasks; "
+                "add a tasks.json naming the columns"
+            )
+            raise ValueError(msg)
+        return None
+    if list(plan.names) == columns:
+        return None
+
+    unknown = sorted(set(columns) - set(plan.names))
+    if unknown:
+        msg = f"Tasks not in '{course.name}': {', '.join(unknown)}"
+        raise ValueError(msg)
+    position = {name: i for i, name in enumerate(columns)}
+    return np.array([position.get(name, -1) for name in plan.names])
+
+
+def iter_cohort_chunks(
+    matrix: np.ndarray, chunk_size: int = COHORT_CHUNK_SIZE
+) -> Iterator[tuple[int, np.ndarray]]:
+    """Yield (first row, view) chunks of a matrix without copying it."""
+    for start in range(0, matrix.shape[0], chunk_size):
+        yield start, matrix[start : start + chunk_size]
+
+
+def evaluate_cohort(
+    course: Course,
+    grades_path: Path,
+    output_path: Path,
+    columns: list[str] | None = None,
+    chunk_size: int = COHORT_CHUNK_SIZE,
+) -> np.memmap:
+    """Evaluate every student in a cohort and write the results to a memory-mapped file.
+
+    Args:
+        course: Course whose structure the grades follow (its own grades are ignored)
+        grades_path: ``.npy`` students x tasks matrix of grade fractions (NaN for ungraded)
+        output_path: ``.npy`` file to write, with one RESULT_DTYPE row per student
+        columns: Task name of each matrix column (defaults to the course's task order)
+        chunk_size: Students evaluated at a time
+
+    Returns:
+        np.memmap: The results, memory-mapped read-only
+    """
+    plan = course.compile()
+    grades = np.load(grades_path, mmap_mode="r")
+    try:
+        n_students, width = grades.shape
+    except ValueError:
+        msg = f"Expected a 2-D grade matrix, got shape {grades.shape}"
+        raise ValueError(msg) from None
+    column_map = _column_map(course, columns, width)
+
+    output = np.lib.format.open_memmap(
+        output_path, mode="w+", dtype=RESULT_DTYPE, shape=(n_students,)
+    )
+    for start, block in iter_cohort_chunks(grades, chunk_size):
+        # Reorder into plan order; tasks the matrix lacks are ungraded
+        chunk = (
+            block if column_map is None else np.where(column_map >= 0, block[:, column_map], np.nan)
+        )
+        rows = output[start : start + len(chunk)]
+        min_work = plan.get_grade(chunk)
+        rows["current_grade"] = plan.get_current_grade(chunk)
+        rows["expected_grade"] = plan.get_expected_grade(chunk)
+        rows["min_work_grade"] = min_work
+        rows["no_work_grade"] = plan.get_true_grade(chunk)
+        rows["letter_grade"] = letter_grades(course, min_work)
+    output.flush()
+    logger.debug(f"Evaluated {n_students} students of '{course.name}' into {output_path}")
+    del output
+    return np.load(output_path, mmap_mode="r")
+
+
+def letter_distribution(results: np.ndarray, chunk_size: int = COHORT_CHUNK_SIZE) -> dict[str, int]:
+    """Count students per letter grade, reading the results chunk by chunk."""
+    counts: dict[str, int] = {}
+    for _, chunk in iter_cohort_chunks(results, chunk_size):
+        letters, chunk_counts = np.unique(chunk["letter_grade"], return_counts=True)
+        for letter, count in zip(letters.tolist(), chunk_counts.tolist(), strict=True):
+            counts[letter] = counts.get(letter, 0) + count
+    return counts
+
+
+def cohort_gpa(
+    courses: Sequence[Course],
+    results: Sequence[np.ndarray],
+    output_path: Path,
+    points: Mapping[str, float] = DEFAULT_GRADE_POINTS,
+    chunk_size: int = COHORT_CHUNK_SIZE,
+) -> np.memmap:
+    """Forecast every student's term GPA from per-course cohort results.
+
+    Args:
+        courses: The term's courses (for credits and grading boundaries)
+        results: evaluate_cohort output of each course, with the same students in
+            the same rows
+        output_path: ``.npy`` file to write, with one GPA_DTYPE row per student
+        points: Grade points per letter
+        chunk_size: Students processed at a time
+
+    Returns:
+        np.memmap: Each student's GPA in every scenario, memory-mapped read-only
+    """
+    n_students = {len(result) for result in results}
+    if len(n_students) != 1 or len(results) != len(courses):
+        msg = "Expected one result array per course, all with the same students"
+        raise ValueError(msg)
+    (n,) = n_students
+    total_credits = sum(course.credits for course in courses)
+
+    output = np.lib.format.open_memmap(output_path, mode="w+", dtype=GPA_DTYPE, shape=(n,))
+    for start in range(0, n, chunk_size):
+        rows = output[start : start + chunk_size]
+        for scenario, field in _SCENARIO_FIELDS.items():
+            total = np.zeros(len(rows))
+            for course, result in zip(courses, results, strict=True):
+                chunk = result[start : start + chunk_size][field]
+                total += course.credits * grade_points(course, chunk, points)
+            rows[scenario] = total / total_credits if total_credits else 0.0
+    output.flush()
+    del output
+    return np.load(output_path, mmap_mode="r")
@@ -4,7 +4,10 @@ Defines project-wide constants, directory structures, and logging setup.
 Automatically loads environment variables from .env if present.
 """
 
+import os
 from pathlib import Path
+import sys
+import tempfile
 
 from dotenv import load_dotenv
 from loguru import logger
@@ -27,12 +30,43 @@ MODELS_DIR = PROJ_ROOT / "models"
 REPORTS_DIR = PROJ_ROOT / "reports"
 FIGURES_DIR = REPORTS_DIR / "figures"
 
+# Private (0700) directory of the `grade-forecast serve` daemon's socket and HTTP token
+DAEMON_DIR = Path(
+    os.environ.get(
+        "GF_DAEMON_DIR",
+        Path(os.environ["XDG_RUNTIME_DIR"]) / "grade-forecast"
+        if os.environ.get("XDG_RUNTIME_DIR")
+        else Path(tempfile.gettempdir()) / f"grade-forecast-{os.getuid()}",
+    )
+)
+DAEMON_SOCKET = Path(os.environ.get("GF_DAEMON_SOCKET", DAEMON_DIR / "daemon.sock"))
+
+# Persistent cache of computed results and renders (see gf.cache); GF_NO_CACHE disables it
+CACHE_DIR = Path(
+    os.environ.get(
+        "GF_CACHE_DIR",
+        Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "grade-forecast",
+    )
+)
+CACHE_MAX_BYTES = int(os.environ.get("GF_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Append-only history of grade updates (see gf.ledger)
+LEDGER_DIR = Path(
+    os.environ.get(
+        "GF_LEDGER_DIR",
+        Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share"))
+        / "grade-forecast"
+        / "ledger",
+    )
+)
+
 # If tqdm is installed, configure loguru with tqdm.write
 # https://github.com/Delgan/loguru/issues/135
+# Logs go to stderr so machine-readable CLI output on stdout stays parseable
 try:
     from tqdm import tqdm
 
     logger.remove(0)
-    logger.add(lambda msg: tqdm.write(msg, end=""), colorize=True)
+    logger.add(lambda msg: tqdm.write(msg, end="", file=sys.stderr), colorize=True)
 except ModuleNotFoundError:
     pass
@@ -0,0 +1,183 @@
+"""Gradebook files and incremental watching of a gradebook directory.
+
+A gradebook file lists grades as rows with ``course``, ``task`` and ``grade``
+columns, where ``grade`` is a percentage (0-100, like `grade-forecast update`)
+and an empty grade means "not graded". Supported formats are CSV (``.csv``),
+JSON Lines (``.jsonl``) and a JSON array of objects (``.json``). Extra columns
+are ignored, except for ``student``: a file with the grades of several
+students (like those written by `grade-forecast gen`) is only read for one
+chosen student.
+"""
+
+from collections.abc import Callable, Iterable
+import csv
+import json
+from pathlib import Path
+
+from loguru import logger
+
+from gf.classes import Course
+
+GRADEBOOK_PATTERNS = ("*.csv", "*.jsonl", "*.json")
+
+# (course, task) -> grade as a fraction, or None if not graded
+Gradebook = dict[tuple[str, str], float | None]
+
+
+def _parse_grade(value: object) -> float | None:
+    if value is None or value == "":
+        return None
+    grade = float(value) / 100
+    if not 0 <= grade <= 1:
+        msg = f"grade {value} is not between 0 and 100"
+        raise ValueError(msg)
+    return grade
+
+
+def read_gradebook(path: Path, student: str | None = None) -> Gradebook:
+    """Parse a gradebook file.
+
+    Args:
+        path: CSV, JSON Lines or JSON gradebook file
+        student: Only read the rows of this student (rows without a student are
+            always read)
+
+    Returns:
+        Gradebook: Grades keyed by (course, task); later rows win
+
+    Raises:
+        ValueError: If no student is given and the file lists several students
+    """
+    if path.suffix == ".csv":
+        with path.open(newline="") as f:
+            rows: Iterable[dict] = list(csv.DictReader(f))
+    elif path.suffix == ".jsonl":
+        with path.open() as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    elif path.suffix == ".json":
+        rows = json.loads(path.read_text())
+    else:
+        msg = f"Unsupported gradebook format: {path.suffix}"
+        raise ValueError(msg)
+
+    gradebook: Gradebook = {}
+    students: set[str] = set()
+    for row in rows:
+        row_student = row.get("student")
+        if row_student is not None and row_student != "":
+            if student is not None and str(row_student) != student:
+                continue
+            students.add(str(row_student))
+        gradebook[(str(row["course"]), str(row["task"]))] = _parse_grade(row.get("grade"))
+    if len(students) > 1:
+        msg = f"grades of {len(students)} students, but no student was chosen"
+        raise ValueError(msg)
+    return gradebook
+
+
+class GradebookWatcher:
+    """Track a directory of gradebook files and report only what changed.
+
+    Files are stat-ed on every poll but only re-parsed when their modification
+    time or size changes. The grades of a changed file are diffed against the
+    file's previous contents, so a poll yields exactly the changed grades.
+    Grades whose rows were removed, or whose file was deleted, come back as
+    None (not graded) unless another file still lists them.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        patterns: Iterable[str] = GRADEBOOK_PATTERNS,
+        student: str | None = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.patterns = tuple(patterns)
+        self.student = student
+        self._stats: dict[Path, tuple[int, int]] = {}
+        self._contents: dict[Path, Gradebook] = {}
+
+    def _files(self) -> set[Path]:
+        return {path for pattern in self.patterns for path in self.directory.glob(pattern)}
+
+    def poll(self) -> Gradebook:
+        """Re-read changed files.
+
+        Returns:
+            Gradebook: The grades that were added or changed since the last poll
+        """
+        deltas: Gradebook = {}
+        removed: set[tuple[str, str]] = set()
+        files = self._files()
+
+        for path in self._stats.keys() - files:
+            del self._stats[path]
+            removed.update(self._contents.pop(path, {}))
+
+        for path in sorted(files):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self._stats.get(path) == signature:
+                continue
+            self._stats[path] = signature
+
+            try:
+                contents = read_gradebook(path, self.student)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Skipping unreadable gradebook {path}: {e}")
+                continue
+
+            previous = self._contents.get(path, {})
+            deltas.update(
+                (key, grade)
+                for key, grade in contents.items()
+                if key not in previous or previous[key] != grade
+            )
+            removed.update(previous.keys() - contents.keys())
+            self._contents[path] = contents
+
+        # A grade no file lists anymore is cleared; one still listed elsewhere
+        # falls back to that file's grade (the last file in path order wins)
+        for key in removed - deltas.keys():
+            deltas[key] = None
+            for path in sorted(self._contents):
+                if key in self._contents[path]:
+                    deltas[key] = self._contents[path][key]
+        return deltas
+
+
+def apply_gradebook(
+    deltas: Gradebook, resolve_course: Callable[[str], Course | None]
+) -> list[Course]:
+    """Apply grade changes to courses.
+
+    Args:
+        deltas: Grades keyed by (course name or alias, task name)
+        resolve_course: Looks a course up by the name used in the gradebook
+
+    Returns:
+        list[Course]: Courses with at least one grade that actually changed,
+            in the order they were first touched
+    """
+    affected: dict[int, Course] = {}
+    for (course_name, task_name), grade in deltas.items():
+        course = resolve_course(course_name)
+        if course is None:
+            logger.warning(f"Unknown course '{course_name}' in gradebook")
+            continue
+        try:
+            task = course.get_task(task_name)
+        except Exception:  # noqa: BLE001 - get_task raises a bare Exception
+            logger.warning(f"Unknown task '{task_name}' in course '{course.name}'")
+            continue
+        if task.grade == grade:
+            continue
+        if grade is None:
+            task.grade = None
+        else:
+            task.set_grade(grade)
+        affected.setdefault(id(course), course)
+    return list(affected.values())
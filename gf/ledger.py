@@ -0,0 +1,300 @@
+"""Append-only ledger of grade events, with snapshots for fast loading.
+
+Every grade change is appended to ``events.jsonl`` as one JSON line with a
+timestamp, student, course, task and grade (``null`` clears a grade).
+Nothing is ever rewritten, so the ledger is a complete history that
+forecasts can be audited and backtested against.
+
+Once enough events have been appended since the last snapshot, the
+ledger compacts: it writes the full grade state to a snapshot file
+together with the byte offset in ``events.jsonl`` that the state covers.
+"Enough" is ``snapshot_every`` events, or the number of grades in the
+state if that is larger, so writing snapshots costs O(1) per event even
+for large cohorts. Loading the current state (or the
+state at any point in time) reads the latest snapshot at or before that
+point and replays only the events after its offset, never the whole
+history.
+
+Events must be appended in timestamp order. A ledger has a single writer.
+
+Timestamps are POSIX seconds. Dates and times shown to the user, or read
+from them, are in the local time zone (see ``local_time``).
+"""
+
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+import json
+from pathlib import Path
+from typing import Union
+
+from loguru import logger
+
+from gf.classes import Course, Scenario
+
+# Student recorded by the single-user CLI
+DEFAULT_STUDENT = "me"
+
+# Events between automatic snapshots
+SNAPSHOT_INTERVAL = 1000
+
+# student -> course -> task -> grade
+GradeState = dict[str, dict[str, dict[str, float]]]
+
+
+@dataclass(frozen=True)
+class GradeEvent:
+    """A task's grade being set (or cleared, with None) at a point in time."""
+
+    timestamp: float  # Seconds since the epoch
+    course: str
+    task: str
+    grade: float | None
+    student: str = DEFAULT_STUDENT
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Where a snapshot file's state ends in the event log."""
+
+    timestamp: float  # Of the last event included
+    offset: int  # Bytes of events.jsonl included
+    events: int  # Number of events included
+    file: str
+
+
+def local_time(timestamp: float | None = None) -> datetime:
+    """A timestamp (or the current time, if None) as an aware local datetime."""
+    if timestamp is None:
+        return datetime.now(UTC).astimezone()
+    return datetime.fromtimestamp(timestamp, UTC).astimezone()
+
+
+def _timestamp(at: Union[datetime, float]) -> float:
+    return at.timestamp() if isinstance(at, datetime) else float(at)
+
+
+def apply_event(state: GradeState, event: GradeEvent) -> int:
+    """Update a grade state with one event, returning the change in its number of grades."""
+    grades = state.setdefault(event.student, {}).setdefault(event.course, {})
+    if event.grade is None:
+        return -1 if grades.pop(event.task, None) is not None else 0
+    added = event.task not in grades
+    grades[event.task] = event.grade
+    return int(added)
+
+
+def count_grades(state: GradeState) -> int:
+    """Number of grades in a grade state."""
+    return sum(len(grades) for courses in state.values() for grades in courses.values())
+
+
+class GradeLedger:
+    """Grade event log and snapshots stored in a directory.
+
+    Args:
+        directory: Directory holding ``events.jsonl`` and ``snapshots/``
+        snapshot_every: Minimum events between automatic snapshots (0 disables them)
+    """
+
+    def __init__(self, directory: Path, snapshot_every: int = SNAPSHOT_INTERVAL) -> None:
+        self.directory = Path(directory)
+        self.snapshot_every = snapshot_every
+        self.events_path = self.directory / "events.jsonl"
+        self.snapshots_dir = self.directory / "snapshots"
+        self.index_path = self.snapshots_dir / "index.jsonl"
+        # Loaded on first use: current state, end of the log and snapshot index
+        self._state: GradeState | None = None
+        self._offset = 0
+        self._events = 0
+        self._grades = 0  # Grades in the current state
+        self._last_timestamp = float("-inf")
+        self._snapshots: list[Snapshot] | None = None
+
+    def snapshots(self) -> list[Snapshot]:
+        """Snapshots in the order they were taken (and so by timestamp)."""
+        if self._snapshots is None:
+            self._snapshots = []
+            if self.index_path.exists():
+                with self.index_path.open() as f:
+                    self._snapshots = [Snapshot(**json.loads(line)) for line in f if line.strip()]
+        return self._snapshots
+
+    def _read_snapshot(self, snapshot: Snapshot | None) -> GradeState:
+        if snapshot is None:
+            return {}
+        with (self.snapshots_dir / snapshot.file).open() as f:
+            return json.load(f)["state"]
+
+    def _read_events(self, offset: int = 0) -> Iterator[tuple[int, GradeEvent]]:
+        """(offset after the event, event) for each complete event from a byte offset."""
+        if not self.events_path.exists():
+            return
+        with self.events_path.open("rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # An interrupted write; the next append starts after it
+                    logger.warning(
+                        f"Ignoring truncated event at byte {offset} of {self.events_path}"
+                    )
+                    return
+                offset += len(line)
+                yield offset, GradeEvent(**json.loads(line))
+
+    def _snapshot_before(self, timestamp: float) -> Snapshot | None:
+        """The latest snapshot containing no events after a timestamp."""
+        snapshots = self.snapshots()
+        i = bisect_right([snapshot.timestamp for snapshot in snapshots], timestamp)
+        return snapshots[i - 1] if i else None
+
+    def _load(self) -> GradeState:
+        if self._state is None:
+            snapshots = self.snapshots()
+            latest = snapshots[-1] if snapshots else None
+            state = self._read_snapshot(latest)
+            self._offset = latest.offset if latest else 0
+            self._events = latest.events if latest else 0
+            if latest:
+                self._last_timestamp = latest.timestamp
+            self._grades = count_grades(state)
+            for offset, event in self._read_events(self._offset):
+                self._grades += apply_event(state, event)
+                self._offset = offset
+                self._events += 1
+                self._last_timestamp = event.timestamp
+            self._state = state
+        return self._state
+
+    def state(self) -> GradeState:
+        """Current grades of every student (student -> course -> task -> grade)."""
+        return self._load()
+
+    def state_at(self, at: Union[datetime, float]) -> GradeState:
+        """Grades of every student as of a point in time (events at ``at`` included)."""
+        timestamp = _timestamp(at)
+        snapshot = self._snapshot_before(timestamp)
+        state = self._read_snapshot(snapshot)
+        for _, event in self._read_events(snapshot.offset if snapshot else 0):
+            if event.timestamp > timestamp:
+                break
+            apply_event(state, event)
+        return state
+
+    def events(
+        self,
+        since: Union[datetime, float] | None = None,
+        until: Union[datetime, float] | None = None,
+    ) -> Iterator[GradeEvent]:
+        """Events in order, optionally only those after ``since`` and up to ``until``."""
+        start = _timestamp(since) if since is not None else float("-inf")
+        end = _timestamp(until) if until is not None else float("inf")
+        # Snapshots at or before ``since`` let the scan skip the events they cover
+        snapshot = self._snapshot_before(start) if since is not None else None
+        for _, event in self._read_events(snapshot.offset if snapshot else 0):
+            if event.timestamp > end:
+                return
+            if event.timestamp > start:
+                yield event
+
+    def grades(
+        self,
+        course: str,
+        student: str = DEFAULT_STUDENT,
+        at: Union[datetime, float] | None = None,
+    ) -> dict[str, float]:
+        """Task grades of one student in one course, now or as of a point in time."""
+        state = self.state() if at is None else self.state_at(at)
+        return dict(state.get(student, {}).get(course, {}))
+
+    def course_at(
+        self,
+        course: Course,
+        at: Union[datetime, float] | None = None,
+        student: str = DEFAULT_STUDENT,
+    ) -> Scenario:
+        """A scenario of a course with the grades recorded in the ledger.
+
+        Grades in the ledger override the course's own; tasks without any
+        recorded grade keep theirs. The course itself is not modified.
+
+        Args:
+            course: Course whose structure to use
+            at: Point in time to reconstruct (defaults to now)
+            student: Student whose grades to apply
+
+        Returns:
+            Scenario: The course as of ``at``
+        """
+        label = "now"
+        if at is not None:
+            label = local_time(_timestamp(at)).strftime("%Y-%m-%d %H:%M")
+        scenario = course.scenario(f"{course.name} ({label})")
+        known = {task.name for group in course.grading_groups for task in group.tasks}
+        for task, grade in self.grades(course.name, student, at).items():
+            if task in known:
+                scenario.set_grade(task, grade)
+            else:
+                logger.warning(f"Ledger has a grade for unknown task '{task}' in '{course.name}'")
+        return scenario
+
+    def append(self, event: GradeEvent) -> None:
+        """Record one grade event."""
+        self.extend([event])
+
+    def extend(self, events: Iterable[GradeEvent]) -> None:
+        """Record grade events, which must be in timestamp order and not predate the log."""
+        state = self._load()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self.events_path.open("ab") as f:
+            if f.tell() != self._offset:
+                # Drop a truncated last line so that new events start on their own line
+                f.truncate(self._offset)
+            for event in events:
+                if event.grade is not None and not 0 <= event.grade <= 1:
+                    msg = f"Grade must be between 0 and 1, got {event.grade}"
+                    raise ValueError(msg)
+                if event.timestamp < self._last_timestamp:
+                    msg = (
+                        f"Event at {event.timestamp} predates the last recorded event "
+                        f"({self._last_timestamp})"
+                    )
+                    raise ValueError(msg)
+                line = (json.dumps(vars(event)) + "\n").encode()
+                f.write(line)
+                self._grades += apply_event(state, event)
+                self._offset += len(line)
+                self._events += 1
+                self._last_timestamp = event.timestamp
+                snapshots = self.snapshots()
+                since_snapshot = self._events - (snapshots[-1].events if snapshots else 0)
+                if self.snapshot_every and since_snapshot >= max(self.snapshot_every, self._grades):
+                    f.flush()
+                    self.compact()
+
+    def compact(self) -> Snapshot | None:
+        """Snapshot the current state, so loading it no longer replays the events so far.
+
+        Returns:
+            Snapshot: The new snapshot (None if no events were added since the last one)
+        """
+        state = self._load()
+        snapshots = self.snapshots()
+        if self._events == 0 or (snapshots and snapshots[-1].events == self._events):
+            return None
+
+        snapshot = Snapshot(
+            self._last_timestamp, self._offset, self._events, f"snapshot-{self._events:012d}.json"
+        )
+        self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+        path = self.snapshots_dir / snapshot.file
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("w") as f:
+            json.dump({**asdict(snapshot), "state": state}, f)
+        tmp.replace(path)
+        # The snapshot only counts once it is in the index
+        with self.index_path.open("a") as f:
+            f.write(json.dumps(asdict(snapshot)) + "\n")
+        snapshots.append(snapshot)
+        return snapshot
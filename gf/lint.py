@@ -0,0 +1,302 @@
+"""Validation of course config files.
+
+Config mistakes either stop a config from importing (a failed assert in
+``GradingGroup``) or go unnoticed: weights that don't add up to 1, gaps
+between grading boundaries, expected grades outside [0, 1]. ``lint_paths``
+loads every config in its own namespace, checks every ``Course`` it
+defines and reports all the issues at once.
+
+Configs are linted in parallel on a process pool. Results are stored in the
+result cache (see gf.cache) under a hash of the file's contents and of gf's
+own source, so later runs only load the configs that changed. Load errors
+are not cached: they can come from anything the config imports.
+"""
+
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from enum import StrEnum
+import functools
+import hashlib
+from itertools import chain, pairwise
+import math
+from pathlib import Path
+import runpy
+import traceback
+from typing import Any
+
+from gf.cache import ResultCache
+from gf.classes import Course, GradingGroup
+
+# Bump when the checks change, so cached results are recomputed
+LINT_FORMAT = 1
+
+# Weights and boundaries closer than this are considered equal
+TOLERANCE = 1e-9
+
+# Grading boundaries are percentages of the full grade
+FULL_GRADE = 100
+
+
+class Severity(StrEnum):
+    """How serious an issue is; errors make ``grade-forecast lint`` fail."""
+
+    error = "error"
+    warning = "warning"
+
+
+@dataclass(frozen=True)
+class LintIssue:
+    """One problem found in a config file."""
+
+    path: str
+    severity: Severity
+    code: str
+    message: str
+    course: str | None = None
+    group: str | None = None
+    line: int | None = None
+
+    def to_record(self) -> dict[str, Any]:
+        """The issue as a flat record, for the machine-readable formats."""
+        return {**asdict(self), "severity": self.severity.value}
+
+
+def discover_configs(paths: Iterable[Path]) -> list[Path]:
+    """Config files in the given files and directories (recursively), in sorted order."""
+    found = set()
+    for path in paths:
+        if path.is_dir():
+            found.update(p for p in path.rglob("*.py") if p.name != "__init__.py")
+        else:
+            found.add(path)
+    return sorted(found)
+
+
+def _is_fraction(value: object) -> bool:
+    return isinstance(value, (int, float)) and 0 <= value <= 1
+
+
+def _check_boundaries(course: Course) -> Iterator[tuple[Severity, str, str]]:
+    """Gaps, overlaps and coverage of the percent grading boundaries."""
+    bands = sorted(course.grading_boundaries.items(), key=lambda item: item[1])
+    for letter, (lower, upper) in bands:
+        if lower > upper:
+            yield Severity.error, "boundary-order", f"'{letter}' runs from {lower} down to {upper}"
+    if not bands:
+        yield Severity.error, "boundary-empty", "No grading boundaries"
+        return
+    if bands[0][1][0] > 0:
+        yield Severity.error, "boundary-gap", f"No letter covers grades below {bands[0][1][0]}"
+    if bands[-1][1][1] < FULL_GRADE:
+        yield Severity.error, "boundary-gap", f"No letter covers grades above {bands[-1][1][1]}"
+    for (low_letter, (_, low_upper)), (high_letter, (high_lower, _)) in pairwise(bands):
+        if high_lower - low_upper > TOLERANCE:
+            yield (
+                Severity.error,
+                "boundary-gap",
+                (
+                    f"Grades between {low_upper} ('{low_letter}') and {high_lower} "
+                    f"('{high_letter}') have no letter"
+                ),
+            )
+        elif low_upper - high_lower > TOLERANCE:
+            yield (
+                Severity.error,
+                "boundary-overlap",
+                f"'{low_letter}' and '{high_letter}' overlap between {high_lower} and {low_upper}",
+            )
+
+    unknown = sorted(set(course.grade_utils) - set(course.grading_boundaries))
+    if unknown:
+        yield (
+            Severity.warning,
+            "utility-letter",
+            f"Utilities for letters without boundaries: {', '.join(unknown)}",
+        )
+
+
+def _check_group(group: GradingGroup) -> Iterator[tuple[Severity, str, str]]:
+    """Weights, defaults and task count of a grading group."""
+    for field in ("weight", "base_grade", "expected_grade"):
+        value = getattr(group, field)
+        if not _is_fraction(value):
+            yield Severity.error, "fraction", f"{field} must be in [0, 1], got {value!r}"
+    if group.default_pst < 0:
+        yield (
+            Severity.error,
+            "pst",
+            f"default_pst must not be negative, got {group.default_pst!r}",
+        )
+    if not group.tasks:
+        yield Severity.warning, "empty-group", "Group has no tasks"
+    elif group.drop_lowest >= len(group.tasks):
+        yield (
+            Severity.warning,
+            "drop-lowest",
+            f"Drops {group.drop_lowest} of {len(group.tasks)} tasks; only the best one counts",
+        )
+
+
+def _check_tasks(group: GradingGroup, task_names: set[str]) -> Iterator[tuple[Severity, str, str]]:
+    """Grades and study times of a group's tasks.
+
+    Args:
+        group: Group whose tasks to check
+        task_names: Names of the tasks checked so far (updated in place), to
+            find names used more than once in the course
+    """
+    for task in group.tasks:
+        if task.name in task_names:
+            yield (
+                Severity.warning,
+                "duplicate-task",
+                f"Task name '{task.name}' is used more than once; lookups by name find the first",
+            )
+        task_names.add(task.name)
+        for field in ("grade", "base_grade", "expected_grade"):
+            value = getattr(task, field)
+            if value is not None and not _is_fraction(value):
+                yield (
+                    Severity.error,
+                    "fraction",
+                    f"'{task.name}' {field} must be in [0, 1], got {value!r}",
+                )
+        if task.pst is not None and task.pst < 0:
+            yield Severity.error, "pst", f"'{task.name}' pst must not be negative, got {task.pst!r}"
+
+
+def check_course(course: Course, path: str = "") -> list[LintIssue]:
+    """Check a course's groups, tasks and grading boundaries.
+
+    Args:
+        course: Course to check
+        path: Config file the course comes from, for the issues
+
+    Returns:
+        list: Every issue found, errors and warnings alike
+    """
+    issues = []
+
+    def report(severity: Severity, code: str, message: str, group: str | None = None) -> None:
+        issues.append(LintIssue(path, severity, code, message, course.name, group))
+
+    if not isinstance(course.credits, (int, float)) or course.credits <= 0:
+        report(Severity.error, "credits", f"Credits must be positive, got {course.credits!r}")
+    if not course.grading_groups:
+        report(Severity.error, "no-groups", "Course has no grading groups")
+
+    total_weight = sum(group.weight for group in course.grading_groups)
+    if course.grading_groups and not math.isclose(total_weight, 1, abs_tol=TOLERANCE):
+        report(Severity.error, "weights", f"Group weights add up to {total_weight:g}, not 1")
+
+    for severity, code, message in _check_boundaries(course):
+        report(severity, code, message)
+
+    group_names: set[str] = set()
+    task_names: set[str] = set()
+    for group in course.grading_groups:
+        if group.name in group_names:
+            report(Severity.error, "duplicate-group", "Duplicate group name", group.name)
+        group_names.add(group.name)
+        for severity, code, message in chain(_check_group(group), _check_tasks(group, task_names)):
+            report(severity, code, message, group.name)
+    return issues
+
+
+def _failure_line(error: BaseException, path: Path) -> int | None:
+    """Line of the config file where loading it failed."""
+    frames = traceback.extract_tb(error.__traceback__)
+    for frame in reversed(frames):
+        if Path(frame.filename).resolve() == path.resolve():
+            return frame.lineno
+    return None
+
+
+def lint_file(path: Path) -> list[LintIssue]:
+    """Load a config file and check every course it defines."""
+    try:
+        namespace = runpy.run_path(str(path), run_name=f"gf_lint_{path.stem}")
+    except Exception as e:  # noqa: BLE001 - any failure to load is reported as an issue
+        message = str(e)
+        if not message and e.__traceback__ is not None:
+            # Bare asserts have no message; show the failing statement instead
+            message = traceback.extract_tb(e.__traceback__)[-1].line or ""
+        return [
+            LintIssue(
+                str(path),
+                Severity.error,
+                "load",
+                f"{type(e).__name__}: {message}",
+                line=_failure_line(e, path),
+            )
+        ]
+
+    course_list = [value for value in namespace.values() if isinstance(value, Course)]
+    if not course_list:
+        return [LintIssue(str(path), Severity.warning, "no-course", "Defines no Course")]
+    issues = []
+    for course in course_list:
+        issues.extend(check_course(course, str(path)))
+    return issues
+
+
+@functools.cache
+def _code_token() -> str:
+    """Hash of gf's source files, which define both the checks and the classes they load."""
+    root = Path(__file__).resolve().parent
+    digest = hashlib.blake2b(digest_size=16)
+    for source in sorted(root.rglob("*.py")):
+        digest.update(f"{source.relative_to(root)}:".encode())
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def _file_key(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{LINT_FORMAT}:{_code_token()}:{path.resolve()}:".encode())
+    digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _lint_records(path: Path) -> list[dict[str, Any]]:
+    return [issue.to_record() for issue in lint_file(path)]
+
+
+def lint_paths(
+    paths: Iterable[Path], jobs: int = 1, cache: ResultCache | None = None
+) -> dict[Path, list[LintIssue]]:
+    """Lint every config in the given files and directories.
+
+    Args:
+        paths: Config files, or directories to search for them
+        jobs: Worker processes for the configs that are not cached
+        cache: Result cache for unchanged configs (None lints everything)
+
+    Returns:
+        dict: The issues of each config file, in sorted path order
+    """
+    files = discover_configs(paths)
+    keys = {path: _file_key(path) for path in files} if cache is not None else {}
+    results: dict[Path, list[dict[str, Any]] | None] = {
+        path: cache.get("lint", keys[path]) if cache else None for path in files
+    }
+    stale = [path for path, records in results.items() if records is None]
+
+    if jobs <= 1 or len(stale) <= 1:
+        results.update(zip(stale, map(_lint_records, stale), strict=True))
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(stale))) as executor:
+            results.update(zip(stale, executor.map(_lint_records, stale), strict=True))
+    if cache is not None:
+        for path in stale:
+            if not any(record["code"] == "load" for record in results[path]):
+                cache.put("lint", keys[path], results[path])
+
+    return {
+        path: [
+            LintIssue(**{**record, "severity": Severity(record["severity"])})
+            for record in records or []
+        ]
+        for path, records in results.items()
+    }
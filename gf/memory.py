@@ -0,0 +1,143 @@
+"""Memory measurement for the course model.
+
+Two tools are provided:
+- ``measure`` runs a function under tracemalloc and reports the bytes it left
+  allocated and its peak. The memory tests use it to enforce MEMORY_BUDGETS.
+- ``registry_footprint`` walks objects that already exist and adds up their
+  sizes. ``grade-forecast mem-report`` uses it for the loaded courses.
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+import sys
+import tracemalloc
+import types
+from typing import Any
+
+from gf.classes import Course
+from gf.classes.visualization import _render_cache
+
+# Upper bounds, in bytes, enforced by tests/test_memory.py. Raising one should
+# be a deliberate decision made in review, not a side effect.
+MEMORY_BUDGETS = {
+    # One Task, including its attribute dict and name
+    "task": 256,
+    # One GradingGroup, not counting its tasks
+    "group": 512,
+    # One Course, not counting its grading groups
+    "course": 512,
+    # A whole course built with GradingGroup(tasks=int), per task
+    "course_per_task": 320,
+    # Peak while computing the summary records of a course, per task
+    "summary_peak_per_task": 64,
+    # Compiled evaluation plan of a course (Course.compile), per task
+    "plan_per_task": 256,
+    # Peak while plotting a task's effect on the course grade, including
+    # compiling the plan it evaluates, per task
+    "plot_peak_per_task": 320,
+}
+
+# Objects that are shared program state rather than part of a course
+_SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType)
+
+
+@dataclass
+class Allocation:
+    """Result of running a function under tracemalloc."""
+
+    result: Any
+    current: int  # Bytes still allocated when the function returned
+    peak: int  # Largest number of bytes allocated at once during the call
+
+
+def measure(func: Callable[[], Any]) -> Allocation:
+    """Run ``func`` and measure the memory it allocates.
+
+    Args:
+        func: Function to call with no arguments
+
+    Returns:
+        Allocation: The function's result, retained bytes and peak bytes
+    """
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start, _ = tracemalloc.get_traced_memory()
+    try:
+        result = func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+    return Allocation(result, current - start, peak - start)
+
+
+def deep_sizeof(obj: object, seen: set[int] | None = None) -> int:
+    """Add up the size of an object and everything it references.
+
+    Classes, modules and functions are treated as shared and are not counted.
+    Objects whose ids are already in ``seen`` are skipped. This lets
+    callers count shared objects (like default grading boundaries) only once.
+
+    Args:
+        obj: Object to measure
+        seen: Ids of objects already counted (updated in place)
+
+    Returns:
+        int: Size in bytes
+    """
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _SHARED_TYPES):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        if hasattr(item, "__dict__") and not isinstance(item, dict):
+            stack.append(item.__dict__)
+    return size
+
+
+def registry_footprint(courses: Iterable[Course]) -> Iterator[dict[str, Any]]:
+    """Yield the memory footprint of each course, split by object type.
+
+    Objects shared between courses are counted for the first course that
+    references them.
+
+    Args:
+        courses: Loaded courses
+
+    Yields:
+        dict: Course name, object counts and bytes for tasks, groups and the course itself
+    """
+    seen: set[int] = set()
+    for course in courses:
+        groups = course.grading_groups
+        tasks = [task for group in groups for task in group.tasks]
+        task_bytes = sum(deep_sizeof(task, seen) for task in tasks)
+        # Tasks and then groups are already in ``seen``, so each level excludes the one below
+        group_bytes = sum(deep_sizeof(group, seen) for group in groups)
+        course_bytes = deep_sizeof(course, seen)
+        yield {
+            "course": course.name,
+            "groups": len(groups),
+            "tasks": len(tasks),
+            "task_bytes": task_bytes,
+            "group_bytes": group_bytes,
+            "course_bytes": course_bytes,
+            "total_bytes": task_bytes + group_bytes + course_bytes,
+        }
+
+
+def render_cache_footprint() -> int:
+    """Bytes held by the render cache (see gf.classes.visualization)."""
+    return deep_sizeof(_render_cache)
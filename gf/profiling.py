@@ -0,0 +1,294 @@
+"""Opt-in timers and counters around the model, grading, config, rendering and plotting code.
+
+Nothing is instrumented until ``enable`` is called: it swaps the target methods
+and functions for timing wrappers and ``disable`` puts the originals back, so
+an unprofiled run executes exactly the code it would without this module.
+Each wrapper records calls, inclusive ("total") and exclusive ("self") time
+per stage, plus the stage stack it ran under for collapsed-stack output that
+flamegraph tools (flamegraph.pl, speedscope, inferno) can read directly.
+"""
+
+from collections import Counter
+from collections.abc import Callable, Iterator
+import contextlib
+import cProfile
+from dataclasses import dataclass
+import functools
+import importlib
+from pathlib import Path
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Union
+
+from rich import box
+from rich.table import Table
+
+if TYPE_CHECKING:
+    from gf.classes import GradingGroup
+
+# Seconds spent in one-off startup steps (e.g. importing the course configs).
+# Filled in unconditionally because each entry is a single timer, and shown
+# in the report when profiling is enabled.
+STARTUP: dict[str, float] = {}
+
+# Suffixes of --profile-output paths that get a cProfile dump instead of
+# collapsed stacks
+PSTATS_SUFFIXES = frozenset({".prof", ".pstats"})
+
+# Instrumented classes: (module, class name, stage prefix). Every ``get_*``
+# method of these classes is timed.
+MODEL_CLASSES = [
+    ("gf.classes.course", "Course", "Course"),
+    ("gf.classes.grading_group", "GradingGroup", "GradingGroup"),
+]
+
+# Instrumented functions: (module, attribute, stage). Modules that have not
+# been imported are skipped, so the profiler never loads anything itself.
+FUNCTIONS = [
+    ("gf.synthetic", "load_course_file", "config.load"),
+    ("gf.classes.visualization", "render_segments", "render.segments"),
+    ("gf.classes.visualization", "create_grading_group_display", "render.grading_group"),
+    ("gf.classes.course", "Course.create_display", "render.course"),
+    ("gf.cli.display", "create_course_details_panel", "render.course_details"),
+    ("gf.cli.display", "create_course_info_panel", "render.course_info"),
+    ("gf.cli.display", "create_course_summary_panel", "render.course_summary"),
+    ("gf.cli.display", "display_courses_table", "render.courses_table"),
+    ("gf.cli.display", "display_task_analysis", "render.task_analysis"),
+    ("gf.cli.plotting", "course_grade_sensitivity", "plot.sensitivity"),
+    ("gf.cli.plotting", "plot_course_grade_vs_grade", "plot.course_grade_vs_grade"),
+    ("rich.console", "Console.print", "render.print"),
+]
+
+# GradingGroup methods that only call one of the group's grading functions.
+# Their stage is named after the function, so custom grading functions show
+# up separately from the defaults.
+GRADING_METHODS = {
+    "get_raw_contribution": "grading_function",
+    "get_true_raw_contribution": "true_grading_function",
+}
+
+
+@dataclass
+class StageStats:
+    """Accumulated timings for one stage."""
+
+    calls: int = 0
+    total: float = 0.0
+    self_time: float = 0.0
+
+
+class Profiler:
+    """Collects stage timings and counters while enabled."""
+
+    def __init__(self, root: str = "grade-forecast", pstats_path: str | None = None) -> None:
+        self.root = root
+        self.pstats_path = pstats_path
+        self.cprofile = cProfile.Profile() if pstats_path else None
+        self.stages: dict[str, StageStats] = {}
+        self.counters: Counter[str] = Counter()
+        self.collapsed: Counter[str] = Counter()
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> list[list[Any]]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            # Each frame is [stage, start time, time spent in child stages]
+            stack = self._local.stack = [[self.root, time.perf_counter(), 0.0]]
+        return stack
+
+    def push(self, stage: str) -> None:
+        """Start timing a stage nested under the current one."""
+        self._stack().append([stage, time.perf_counter(), 0.0])
+
+    def pop(self) -> None:
+        """Stop timing the innermost stage."""
+        stack = self._stack()
+        stage, start, children = stack.pop()
+        elapsed = time.perf_counter() - start
+        stack[-1][2] += elapsed
+        path = ";".join(frame[0] for frame in stack) + ";" + stage
+        # Recursive stages only count their outermost call towards total time
+        recursive = any(frame[0] == stage for frame in stack)
+        with self._lock:
+            stats = self.stages.setdefault(stage, StageStats())
+            stats.calls += 1
+            if not recursive:
+                stats.total += elapsed
+            stats.self_time += elapsed - children
+            self.collapsed[path] += elapsed - children
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Increment a counter."""
+        with self._lock:
+            self.counters[name] += n
+
+    def stop(self) -> None:
+        """Stop the wall clock and attribute unaccounted time to the root stage."""
+        self.elapsed = time.perf_counter() - self.started
+        stack = self._stack()
+        self.collapsed[self.root] += max(0.0, self.elapsed - stack[0][2])
+
+    def write_collapsed(self, path: str | Path) -> None:
+        """Write stage stacks in the collapsed format ("a;b;c <microseconds>")."""
+        with Path(path).open("w") as f:
+            for stack, seconds in sorted(self.collapsed.items()):
+                micros = round(seconds * 1e6)
+                if micros > 0:
+                    f.write(f"{stack} {micros}\n")
+
+    def create_table(self) -> Table:
+        """Create a table of stages sorted by self time."""
+        table = Table(title=f"Profile: {self.root}", box=box.SIMPLE, show_footer=True)
+        table.add_column("Stage", style="cyan", overflow="fold", footer="Wall time")
+        table.add_column("Calls", justify="right", style="yellow")
+        table.add_column("Total (ms)", justify="right", style="green")
+        table.add_column(
+            "Self (ms)", justify="right", style="blue", footer=f"{self.elapsed * 1000:.2f}"
+        )
+        table.add_column("Self %", justify="right", style="magenta")
+
+        for name, seconds in STARTUP.items():
+            table.add_row(f"startup.{name}", "1", f"{seconds * 1000:.2f}", "", "")
+        stages = sorted(self.stages.items(), key=lambda item: item[1].self_time, reverse=True)
+        for name, stats in stages:
+            share = stats.self_time / self.elapsed * 100 if self.elapsed else 0
+            table.add_row(
+                name,
+                str(stats.calls),
+                f"{stats.total * 1000:.2f}",
+                f"{stats.self_time * 1000:.2f}",
+                f"{share:.1f}%",
+            )
+        for name, value in sorted(self.counters.items()):
+            table.add_row(f"[dim]counter[/dim] {name}", str(value), "", "", "")
+        return table
+
+
+_active: Profiler | None = None
+_patches: list[tuple[Any, str, Any]] = []
+
+
+def count(name: str, n: int = 1) -> None:
+    """Increment a counter on the active profiler (a no-op when profiling is off)."""
+    if _active is not None:
+        _active.count(name, n)
+
+
+@contextlib.contextmanager
+def startup_timer(name: str) -> Iterator[None]:
+    """Time a one-off startup step into STARTUP."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STARTUP[name] = time.perf_counter() - start
+
+
+def _timed(func: Callable, stage: Union[str, Callable[..., str]]) -> Callable:
+    """Wrap a function so calls are recorded as ``stage`` on the active profiler."""
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> object:
+        profiler = _active
+        if profiler is None:
+            return func(*args, **kwargs)
+        profiler.push(stage if isinstance(stage, str) else stage(*args))
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.pop()
+
+    wrapper.__gf_profiled__ = True
+    return wrapper
+
+
+def _grading_stage(attribute: str) -> Callable[..., str]:
+    def stage(group: "GradingGroup") -> str:
+        function = getattr(group, attribute)
+        return f"grading.{getattr(function, '__name__', type(function).__name__)}"
+
+    return stage
+
+
+def _patch(owner: type | ModuleType, name: str, wrapper: Callable) -> None:
+    _patches.append((owner, name, owner.__dict__[name]))
+    setattr(owner, name, wrapper)
+
+
+def _patch_function(module: ModuleType, name: str, stage: str) -> None:
+    """Wrap a module-level function, including references other gf modules imported."""
+    original = getattr(module, name)
+    wrapper = _timed(original, stage)
+    _patch(module, name, wrapper)
+    for other in list(sys.modules.values()):
+        other_name = getattr(other, "__name__", "")
+        if other is module or not other_name.startswith("gf."):
+            continue
+        for attr, value in list(vars(other).items()):
+            if value is original:
+                _patch(other, attr, wrapper)
+
+
+def enable(profiler: Profiler) -> None:
+    """Install the timing wrappers and make ``profiler`` the active profiler."""
+    global _active  # noqa: PLW0603 - a plain global keeps the disabled hot path cheap
+    if _active is not None:
+        msg = "Profiling is already enabled"
+        raise RuntimeError(msg)
+
+    for module_name, class_name, prefix in MODEL_CLASSES:
+        cls = getattr(importlib.import_module(module_name), class_name)
+        for name, value in list(vars(cls).items()):
+            if not name.startswith("get_") or not callable(value):
+                continue
+            if cls.__name__ == "GradingGroup" and name in GRADING_METHODS:
+                stage = _grading_stage(GRADING_METHODS[name])
+            else:
+                stage = f"{prefix}.{name}"
+            _patch(cls, name, _timed(value, stage))
+
+    for module_name, attribute, stage in FUNCTIONS:
+        module = sys.modules.get(module_name)
+        if module is None:
+            continue
+        if "." in attribute:
+            class_name, name = attribute.split(".")
+            cls = getattr(module, class_name)
+            _patch(cls, name, _timed(cls.__dict__[name], stage))
+        else:
+            _patch_function(module, attribute, stage)
+
+    _active = profiler
+    if profiler.cprofile is not None:
+        profiler.cprofile.enable()
+
+
+def disable() -> Profiler | None:
+    """Restore the original functions and return the profiler that was active."""
+    global _active
+    profiler, _active = _active, None
+    while _patches:
+        owner, name, original = _patches.pop()
+        setattr(owner, name, original)
+    if profiler is not None:
+        if profiler.cprofile is not None:
+            profiler.cprofile.disable()
+            profiler.cprofile.dump_stats(profiler.pstats_path)
+        profiler.stop()
+    return profiler
+
+
+@contextlib.contextmanager
+def profile(root: str = "grade-forecast", pstats_path: str | None = None) -> Iterator[Profiler]:
+    """Profile the enclosed block, optionally also running cProfile into ``pstats_path``."""
+    profiler = Profiler(root, pstats_path)
+    enable(profiler)
+    try:
+        yield profiler
+    finally:
+        disable()
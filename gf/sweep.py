@@ -0,0 +1,179 @@
+"""Vectorized sweeps over a course's grading group assumptions.
+
+Forecasts depend on the base and expected grades assumed for the ungraded
+tasks of each grading group. A sweep evaluates a course for every
+combination of values on a grid over several of these assumptions.
+
+Each group's contribution to the course grade only depends on its own
+assumptions, so the grade is separable: a sweep computes one 1-D vector
+of grade deltas per axis on the compiled plan and adds them together by
+broadcasting. An n x n x n sweep costs 3n evaluations instead of n^3
+recomputes, and never modifies the course.
+"""
+
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from gf.classes import Course
+from gf.classes.compiled import CompiledCourse
+from gf.cohort import letter_grades
+
+# Sweepable group assumptions, mapped to the outcome each one affects
+SWEEP_FIELDS = {"base_grade": "min_work_grade", "expected_grade": "expected_grade"}
+
+
+@dataclass(frozen=True)
+class SweepAxis:
+    """Values to try for one assumption of one grading group."""
+
+    group: str
+    field: str  # One of SWEEP_FIELDS
+    values: np.ndarray
+
+    @property
+    def label(self) -> str:
+        """Name of the axis, for tables and plots."""
+        return f"{self.group} {self.field}"
+
+
+def parse_axis(field: str, spec: str) -> SweepAxis:
+    """Parse a ``GROUP=START:STOP:N`` or ``GROUP=V1,V2,...`` sweep axis.
+
+    Args:
+        field: Assumption to sweep (one of SWEEP_FIELDS)
+        spec: Group name and values
+
+    Returns:
+        SweepAxis: The parsed axis
+    """
+    group, sep, values = spec.rpartition("=")
+    if not sep or not group:
+        msg = f"Expected GROUP=START:STOP:N or GROUP=V1,V2,..., got '{spec}'"
+        raise ValueError(msg)
+    try:
+        if ":" in values:
+            start, stop, n = values.split(":")
+            grid = np.linspace(float(start), float(stop), int(n))
+        else:
+            grid = np.array([float(value) for value in values.split(",")])
+    except ValueError:
+        msg = f"Invalid sweep values '{values}'"
+        raise ValueError(msg) from None
+    return SweepAxis(group, field, grid)
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    """Outcome tensors of a sweep, with one dimension per axis."""
+
+    course: Course
+    axes: tuple[SweepAxis, ...]
+    min_work_grade: np.ndarray
+    expected_grade: np.ndarray
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        """Number of values along each axis."""
+        return self.min_work_grade.shape
+
+    def letters(self, outcome: str = "min_work_grade") -> np.ndarray:
+        """Letter grade of every combination for an outcome."""
+        return letter_grades(self.course, getattr(self, outcome))
+
+    def records(self) -> Iterator[dict[str, Any]]:
+        """One record per combination, in C order."""
+        letters = self.letters()
+        for index in np.ndindex(self.shape):
+            record: dict[str, Any] = {
+                axis.label: float(axis.values[i]) for axis, i in zip(self.axes, index, strict=True)
+            }
+            record["min_work_grade"] = float(self.min_work_grade[index])
+            record["expected_grade"] = float(self.expected_grade[index])
+            record["letter_grade"] = str(letters[index])
+            yield record
+
+    def save(self, path: Path) -> None:
+        """Save the tensors and axis values to a ``.npz`` file."""
+        np.savez(
+            path,
+            min_work_grade=self.min_work_grade,
+            expected_grade=self.expected_grade,
+            letter_grade=self.letters(),
+            axes=np.array([axis.label for axis in self.axes]),
+            **{f"axis_{i}": axis.values for i, axis in enumerate(self.axes)},
+        )
+
+
+def _axis_deltas(
+    plan: CompiledCourse, grades: np.ndarray, tasks: slice, axis: SweepAxis
+) -> np.ndarray:
+    """Change in the axis' outcome for each of its values, relative to the course."""
+    ungraded = np.isnan(grades[tasks])
+    kernel = plan.kernel(tasks)
+    if axis.field == "expected_grade" and not (kernel and kernel.drop_lowest):
+        weights = plan.average_weights[tasks][ungraded]
+        return weights.sum() * axis.values - weights @ plan.expected[tasks][ungraded]
+    if kernel is None:
+        weights = plan.linear_weights[tasks][ungraded]
+        return weights.sum() * axis.values - weights @ plan.base[tasks][ungraded]
+
+    # Custom grading functions or dropped grades: one evaluation of the group per value
+    kind = "expected" if axis.field == "expected_grade" else "grade"
+    row = grades[np.newaxis, :]
+    baseline = kernel.evaluate(row, kind)[0]
+    deltas = []
+    for value in axis.values.tolist():
+        specs = tuple(
+            replace(spec, **{axis.field: value}) if is_ungraded else spec
+            for spec, is_ungraded in zip(kernel.specs, ungraded, strict=True)
+        )
+        deltas.append(replace(kernel, specs=specs).evaluate(row, kind)[0] - baseline)
+    return np.asarray(deltas)
+
+
+def sweep_assumptions(course: Course, axes: Sequence[SweepAxis]) -> SweepResult:
+    """Evaluate a course for every combination of grading group assumptions.
+
+    Args:
+        course: Course to evaluate (never modified)
+        axes: Assumptions to sweep; each applies to the ungraded tasks of its group
+
+    Returns:
+        SweepResult: Min-work and expected grade tensors, with one dimension per axis
+    """
+    plan = course.compile()
+    grades = plan.grades_of(course)
+    axes = tuple(axes)
+    shape = tuple(len(axis.values) for axis in axes)
+    outcomes = {
+        "min_work_grade": np.full(shape, plan.get_grade(grades)),
+        "expected_grade": np.full(shape, plan.get_expected_grade(grades)),
+    }
+
+    swept = set()
+    for k, axis in enumerate(axes):
+        if axis.field not in SWEEP_FIELDS:
+            msg = f"Cannot sweep '{axis.field}', expected one of {list(SWEEP_FIELDS)}"
+            raise ValueError(msg)
+        if (axis.group, axis.field) in swept:
+            msg = f"'{axis.label}' is swept more than once"
+            raise ValueError(msg)
+        swept.add((axis.group, axis.field))
+        tasks = plan.groups.get(axis.group)
+        if tasks is None:
+            msg = f"Grading group '{axis.group}' not in '{course.name}'"
+            raise ValueError(msg)
+        if np.any((axis.values < 0) | (axis.values > 1)):
+            msg = f"'{axis.label}' values must be between 0 and 1"
+            raise ValueError(msg)
+
+        deltas = _axis_deltas(plan, grades, tasks, axis)
+        broadcast = [1] * len(axes)
+        broadcast[k] = -1
+        outcomes[SWEEP_FIELDS[axis.field]] += deltas.reshape(broadcast)
+
+    return SweepResult(course, axes, **outcomes)
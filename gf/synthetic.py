@@ -0,0 +1,402 @@
+"""Synthetic courses for benchmarking and scale testing."""
+
+from collections.abc import Iterator, Sequence
+import csv
+from datetime import UTC, datetime
+from enum import StrEnum
+import heapq
+import json
+import math
+from pathlib import Path
+import random
+import re
+import runpy
+import tempfile
+from typing import Any, Union
+
+import numpy as np
+
+from gf.classes import Course, GradingGroup
+from gf.ledger import GradeEvent, GradeLedger
+
+
+def make_synthetic_course(
+    n_tasks: int,
+    n_groups: int = 5,
+    graded_fraction: float = 0.5,
+    seed: int | None = 0,
+    name: str | None = None,
+) -> Course:
+    """Build a course with ``n_tasks`` enumerated tasks spread over ``n_groups`` groups.
+
+    Groups are created with ``GradingGroup(tasks=int)`` and get equal weights.
+    A ``graded_fraction`` of each group's tasks (the earliest ones, as in a
+    semester in progress) receive random grades.
+
+    Args:
+        n_tasks: Total number of tasks
+        n_groups: Number of grading groups (capped at n_tasks)
+        graded_fraction: Fraction of tasks that have a grade
+        seed: Seed for the grade generator
+        name: Course name (defaults to one that includes the size)
+
+    Returns:
+        Course: The synthetic course
+    """
+    rng = random.Random(seed)  # noqa: S311 - reproducible test data, not security
+    n_groups = max(1, min(n_groups, n_tasks))
+    sizes = [n_tasks // n_groups + (1 if i < n_tasks % n_groups else 0) for i in range(n_groups)]
+
+    grading_groups = []
+    for i, size in enumerate(sizes):
+        group = GradingGroup(
+            name=f"Group {i + 1}",
+            weight=1 / n_groups,
+            tasks=size,
+            default_pst=rng.choice([1, 2, 5, 10, 20]),
+            base_grade=rng.choice([0, 0.25, 0.5]),
+            expected_grade=round(rng.uniform(0.6, 1.0), 2),
+        )
+        for task in group.tasks[: round(size * graded_fraction)]:
+            task.set_grade(round(rng.uniform(0.4, 1.0), 3))
+        grading_groups.append(group)
+
+    return Course(
+        name=name or f"Synthetic {n_tasks}",
+        care_factor=1,
+        grading_groups=grading_groups,
+    )
+
+
+# Students generated per block. Each block has its own seeded generator, so the
+# output for a seed does not depend on how the data is written out.
+STUDENT_BLOCK_SIZE = 4096
+
+# Fraction of due tasks a typical student never submits
+MISSING_RATE = 0.03
+
+# Semester that generated grade events are spread over (in UTC, so a seed gives
+# the same timestamps in every time zone)
+TERM_START = datetime(2025, 9, 3, tzinfo=UTC).timestamp()
+TERM_DAYS = 100
+
+# Grades of a task are posted up to this many days before it is due
+GRADING_SPREAD_DAYS = 3
+
+# A generated grade event, before it becomes a GradeEvent
+EVENT_DTYPE = np.dtype([("time", "f8"), ("student", "i8"), ("column", "i4"), ("grade", "f8")])
+
+# Events buffered at a time across all the sorted runs being merged
+EVENT_MERGE_BUFFER = 65536
+
+
+class DatasetFormat(StrEnum):
+    """On-disk formats for generated cohorts."""
+
+    columnar = "columnar"  # grades.npy matrix + tasks.json per course
+    jsonl = "jsonl"  # Gradebook rows (see gf.gradebook), one file per course
+    csv = "csv"
+    ledger = "ledger"  # Timestamped grade events (see gf.ledger), one ledger per course
+
+
+def load_course_file(path: Path) -> list[Course]:
+    """Execute a course config file and return the courses it defines.
+
+    Args:
+        path: Python file defining Course objects at module level
+
+    Returns:
+        list[Course]: The courses, in definition order
+    """
+    namespace = runpy.run_path(str(path))
+    return [value for value in namespace.values() if isinstance(value, Course)]
+
+
+def course_task_table(course: Course) -> list[dict[str, str]]:
+    """List a course's tasks in the column order used by grade matrices."""
+    return [
+        {"group": group.name, "task": task.name}
+        for group in course.grading_groups
+        for task in group.tasks
+    ]
+
+
+def due_fractions(course: Course) -> np.ndarray:
+    """When each task is due, as a fraction of the semester.
+
+    The tasks of a group are spread evenly over the semester.
+    """
+    return np.asarray(
+        [
+            (i + 1) / len(group.tasks)
+            for group in course.grading_groups
+            for i in range(len(group.tasks))
+        ],
+        dtype=np.float64,
+    )
+
+
+def iter_grade_blocks(
+    course: Course,
+    n_students: int,
+    seed: Union[int, Sequence[int]] = 0,
+    progress: float = 0.5,
+) -> Iterator[np.ndarray]:
+    """Generate a students x tasks grade matrix for a course, one block at a time.
+
+    Each student has an ability drawn from Beta(6, 2). A task's grade is
+    normal around the group's expected grade, shifted by the student's
+    ability. The shifted grade is clipped to [0, 1] and rounded to 0.1%.
+    Tasks in a group are spread evenly over the semester. Tasks due after
+    ``progress`` (the fraction of the semester that has elapsed) are
+    ungraded (NaN), and a few due tasks are missing.
+
+    Args:
+        course: Template course (only its structure and expected grades are used)
+        n_students: Number of students (rows)
+        seed: Seed (or sequence of seeds) for reproducible output
+        progress: Fraction of the semester that has elapsed, in [0, 1]
+
+    Yields:
+        np.ndarray: float32 blocks of at most STUDENT_BLOCK_SIZE rows
+    """
+    expected_arr = np.asarray(
+        [task.expected_grade for group in course.grading_groups for task in group.tasks],
+        dtype=np.float64,
+    )
+    is_due = due_fractions(course) <= progress
+
+    seeds = np.random.SeedSequence(seed).spawn(-(-n_students // STUDENT_BLOCK_SIZE) or 1)
+    for block, block_seed in enumerate(seeds):
+        rows = min(STUDENT_BLOCK_SIZE, n_students - block * STUDENT_BLOCK_SIZE)
+        if rows <= 0:
+            break
+        rng = np.random.default_rng(block_seed)
+        ability = rng.beta(6, 2, size=(rows, 1)) - 0.75
+        grades = rng.normal(expected_arr + ability, 0.08)
+        grades = np.round(np.clip(grades, 0, 1), 3)
+        submitted = is_due & (rng.random(grades.shape) >= MISSING_RATE)
+        yield np.where(submitted, grades, np.nan).astype(np.float32)
+
+
+def variant_courses(templates: list[Course], n_courses: int) -> Iterator[Course]:
+    """Yield ``n_courses`` courses cycling through templates, with numbered sections.
+
+    The variants share their template's grading groups and tasks rather than
+    copying them.
+    """
+    for i in range(n_courses):
+        template = templates[i % len(templates)]
+        section = i // len(templates) + 1
+        if n_courses <= len(templates):
+            yield template
+        else:
+            yield Course(
+                name=f"{template.name} (section {section})",
+                care_factor=template.care_factor,
+                grading_groups=template.grading_groups,
+                grading_boundaries=template.grading_boundaries,
+                grade_utils=template.grade_utils,
+                credits=template.credits,
+            )
+
+
+def write_columnar(course: Course, directory: Path, n_students: int, **kwargs: Any) -> Path:
+    """Write a course's generated grades as ``grades.npy`` plus ``tasks.json``.
+
+    The matrix is written block by block into a memory-mapped ``.npy`` file,
+    so memory use does not grow with the number of students.
+
+    Args:
+        course: Template course
+        directory: Directory to create the files in
+        n_students: Number of students (rows)
+        **kwargs: Passed to iter_grade_blocks
+
+    Returns:
+        Path: The grade matrix file
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    tasks = course_task_table(course)
+    (directory / "tasks.json").write_text(json.dumps({"course": course.name, "tasks": tasks}))
+
+    path = directory / "grades.npy"
+    matrix = np.lib.format.open_memmap(
+        path, mode="w+", dtype=np.float32, shape=(n_students, len(tasks))
+    )
+    start = 0
+    for block in iter_grade_blocks(course, n_students, **kwargs):
+        matrix[start : start + len(block)] = block
+        start += len(block)
+    matrix.flush()
+    del matrix
+    return path
+
+
+def iter_gradebook_rows(course: Course, n_students: int, **kwargs: Any) -> Iterator[dict[str, Any]]:
+    """Yield generated grades as gradebook rows (see gf.gradebook), skipping ungraded tasks.
+
+    Args:
+        course: Template course
+        n_students: Number of students
+        **kwargs: Passed to iter_grade_blocks
+
+    Yields:
+        dict: Rows with student, course, task and grade (0-100) keys
+    """
+    names = [entry["task"] for entry in course_task_table(course)]
+    student = 0
+    for block in iter_grade_blocks(course, n_students, **kwargs):
+        for row in block:
+            student += 1
+            for name, grade in zip(names, row.tolist(), strict=True):
+                if not math.isnan(grade):  # Skip ungraded tasks
+                    yield {
+                        "student": student,
+                        "course": course.name,
+                        "task": name,
+                        "grade": round(grade * 100, 1),
+                    }
+
+
+def _block_events(
+    block: np.ndarray, first_student: int, due: np.ndarray, rng: np.random.Generator
+) -> np.ndarray:
+    """A block's grades as an EVENT_DTYPE array in timestamp order (ties in student order)."""
+    rows, columns = np.nonzero(~np.isnan(block))
+    events = np.empty(len(rows), dtype=EVENT_DTYPE)
+    events["time"] = due[columns] - rng.uniform(0, GRADING_SPREAD_DAYS * 86400, size=len(rows))
+    events["student"] = rows + first_student
+    events["column"] = columns
+    events["grade"] = block[rows, columns]
+    return events[np.argsort(events["time"], kind="stable")]
+
+
+def _iter_run(events: np.ndarray, chunk_size: int) -> Iterator[tuple[float, int, int, float]]:
+    """Yield a sorted run of events as tuples, converting a chunk at a time."""
+    for start in range(0, len(events), chunk_size):
+        yield from events[start : start + chunk_size].tolist()
+
+
+def iter_grade_events(
+    course: Course,
+    n_students: int,
+    seed: Union[int, Sequence[int]] = 0,
+    progress: float = 0.5,
+    term_start: float = TERM_START,
+) -> Iterator[GradeEvent]:
+    """Generate a course's grades (see iter_grade_blocks) as timestamped grade events.
+
+    Each task is graded around its due date, over the ``TERM_DAYS`` days
+    after ``term_start``, with a random spread between students.
+
+    Each block of students becomes a run of events sorted by time. With more
+    than one block, the runs are spilled to temporary ``.npy`` files and
+    merged back from memory maps, so memory use is bounded by a block rather
+    than by the whole cohort.
+
+    Args:
+        course: Template course
+        n_students: Number of students (named "1", "2", ...)
+        seed: Seed (or sequence of seeds) for reproducible output
+        progress: Fraction of the semester that has elapsed
+        term_start: Start of the semester (seconds since the epoch)
+
+    Yields:
+        GradeEvent: The events, in timestamp order (ties in student order)
+    """
+    names = [entry["task"] for entry in course_task_table(course)]
+    due = term_start + due_fractions(course) * TERM_DAYS * 86400
+    # An extra child of the seed, distinct from the ones used for the grade blocks
+    n_blocks = -(-n_students // STUDENT_BLOCK_SIZE) or 1
+    rng = np.random.default_rng(np.random.SeedSequence(seed).spawn(n_blocks + 1)[-1])
+
+    with tempfile.TemporaryDirectory(prefix="gf-events-") as spill:
+        runs = []
+        first_student = 1
+        for i, block in enumerate(iter_grade_blocks(course, n_students, seed, progress)):
+            events = _block_events(block, first_student, due, rng)
+            first_student += len(block)
+            if not len(events):
+                continue
+            if n_blocks > 1:
+                path = Path(spill) / f"{i}.npy"
+                np.save(path, events)
+                del events
+                events = np.load(path, mmap_mode="r")
+            runs.append(events)
+
+        chunk_size = max(EVENT_MERGE_BUFFER // max(len(runs), 1), 256)
+        # Students are unique to a run, so tuples order like (time, student)
+        merged = heapq.merge(*(_iter_run(events, chunk_size) for events in runs))
+        for timestamp, student, column, grade in merged:
+            yield GradeEvent(timestamp, course.name, names[column], round(grade, 3), str(student))
+
+
+def write_gradebook(
+    course: Course, path: Path, n_students: int, fmt: DatasetFormat, **kwargs: Any
+) -> Path:
+    """Stream a course's generated grades to a CSV or JSON Lines gradebook file.
+
+    Args:
+        course: Template course
+        path: File to write
+        n_students: Number of students
+        fmt: DatasetFormat.csv or DatasetFormat.jsonl
+        **kwargs: Passed to iter_grade_blocks
+
+    Returns:
+        Path: The written file
+    """
+    rows = iter_gradebook_rows(course, n_students, **kwargs)
+    with path.open("w", newline="") as f:
+        if fmt == DatasetFormat.csv:
+            writer = csv.DictWriter(f, fieldnames=["student", "course", "task", "grade"])
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            for row in rows:
+                f.write(json.dumps(row))
+                f.write("\n")
+    return path
+
+
+def generate_dataset(
+    templates: list[Course],
+    output: Path,
+    n_courses: int,
+    n_students: int,
+    *,
+    fmt: DatasetFormat = DatasetFormat.columnar,
+    seed: int = 0,
+    progress: float = 0.5,
+) -> Iterator[Path]:
+    """Generate a cohort dataset course by course, yielding each path as it is written.
+
+    Course ``i`` is seeded with ``(seed, i)``, so any course can be regenerated
+    on its own and the dataset does not depend on the output format.
+
+    Args:
+        templates: Courses to build the dataset from
+        output: Directory to write into
+        n_courses: Number of courses (templates are reused as numbered sections)
+        n_students: Students per course
+        fmt: Output format
+        seed: Seed for the whole dataset
+        progress: Fraction of the semester that has elapsed
+
+    Yields:
+        Path: The file or directory written for each course
+    """
+    output.mkdir(parents=True, exist_ok=True)
+    for i, course in enumerate(variant_courses(templates, n_courses)):
+        slug = f"{i:05d}-" + re.sub(r"[^a-z0-9]+", "-", course.name.lower()).strip("-")
+        kwargs = {"seed": (seed, i), "progress": progress}
+        if fmt == DatasetFormat.columnar:
+            write_columnar(course, output / slug, n_students, **kwargs)
+            yield output / slug
+        elif fmt == DatasetFormat.ledger:
+            GradeLedger(output / slug).extend(iter_grade_events(course, n_students, **kwargs))
+            yield output / slug
+        else:
+            yield write_gradebook(course, output / f"{slug}.{fmt.value}", n_students, fmt, **kwargs)
@@ -0,0 +1 @@
+"""Tests for grade-forecast."""
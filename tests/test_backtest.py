@@ -0,0 +1,95 @@
+"""Tests for forecast backtests over grade ledgers."""
+
+import numpy as np
+import pytest
+
+from gf import synthetic
+from gf.backtest import group_records, load_timelines, replay_states, run_backtest
+from gf.ledger import GradeEvent, GradeLedger
+from gf.synthetic import iter_grade_events
+from tests.test_course import make_course
+
+
+def test_replay_states_matches_event_by_event_replay() -> None:
+    rng = np.random.default_rng(0)
+    n_students, n_tasks = 5, 4
+    student = rng.integers(0, n_students - 1, 60)  # The last student has no events
+    task = rng.integers(0, n_tasks, 60)
+    grade = np.where(rng.random(60) < 0.1, np.nan, rng.random(60).round(2))
+
+    expected = []
+    for s in range(n_students):
+        state = np.full(n_tasks, np.nan)
+        expected.append(state.copy())
+        for t, g in zip(task[student == s], grade[student == s], strict=True):
+            state[t] = g
+            expected.append(state.copy())
+
+    states, step_student = replay_states(n_tasks, student, task, grade, n_students)
+    assert np.array_equal(states, np.array(expected), equal_nan=True)
+    assert np.array_equal(
+        step_student,
+        np.repeat(np.arange(n_students), np.bincount(student, minlength=n_students) + 1),
+    )
+
+
+def test_chunked_and_parallel_backtests_add_up_to_the_serial_one(tmp_path) -> None:
+    course = make_course()
+    GradeLedger(tmp_path).extend(iter_grade_events(course, 40, seed=1, progress=1))
+    timelines, skipped = load_timelines([GradeLedger(tmp_path)], [course])
+    assert skipped == {}
+    assert len(timelines[course.name].students) == 40
+
+    (serial,) = run_backtest(timelines.values())
+    for chunked in (
+        run_backtest(timelines.values(), chunk_steps=7),
+        run_backtest(timelines.values(), jobs=2, chunk_steps=50),
+    ):
+        (result,) = chunked
+        assert result.students == serial.students == 40
+        assert np.allclose(result.errors, serial.errors)
+        assert np.allclose(result.calibration, serial.calibration)
+        assert np.array_equal(result.letter_hits, serial.letter_hits)
+    # One step per event, plus each student's step before their first event
+    assert serial.steps.sum() == len(timelines[course.name].student) + 40
+
+
+def test_group_records_compare_assumptions_with_final_grades(tmp_path) -> None:
+    course = make_course()
+    ledger = GradeLedger(tmp_path)
+    ledger.extend(
+        [
+            GradeEvent(1.0, course.name, "Pset 1", 0.5, student="ann"),
+            GradeEvent(2.0, course.name, "Pset 1", 0.7, student="ann"),  # Regrade
+            GradeEvent(3.0, course.name, "Pset 2", 1.0, student="bob"),
+            GradeEvent(4.0, course.name, "Unknown", 1.0, student="bob"),
+        ]
+    )
+    timelines, skipped = load_timelines([ledger], [course])
+    assert skipped == {f"{course.name}: Unknown": 1}
+
+    records = {
+        record["group"]: record for record in group_records(run_backtest(timelines.values()))
+    }
+    psets = records["Psets"]
+    assert psets["graded_tasks"] == 2
+    assert np.isclose(psets["mean_grade"], 0.85)
+    assert np.isclose(psets["bias"], 0.9 - 0.85)
+    assert records["Final"]["graded_tasks"] == 0
+    assert records["Final"]["bias"] is None
+
+
+@pytest.mark.parametrize("block_size", [None, 7])
+def test_grade_events_are_generated_lazily_in_timestamp_order(block_size, monkeypatch) -> None:
+    if block_size:
+        # Several blocks, whose sorted runs are spilled to disk and merged
+        monkeypatch.setattr(synthetic, "STUDENT_BLOCK_SIZE", block_size)
+    events = iter_grade_events(make_course(), 30, seed=2, progress=1)
+    assert iter(events) is events
+    events = list(events)
+    assert [event.timestamp for event in events] == sorted(event.timestamp for event in events)
+    by_student = {}
+    for event in events:
+        by_student.setdefault(event.student, []).append(event.task)
+    assert len(by_student) == 30
+    assert all(len(set(tasks)) == len(tasks) for tasks in by_student.values())
@@ -0,0 +1,41 @@
+"""Tests for bulk GradingGroup construction."""
+
+import pytest
+
+from gf.classes import GradingGroup, Task
+
+
+def test_from_records_matches_task_construction() -> None:
+    records = [
+        {"name": "HW 1", "grade": 0.9, "base_grade": 0.5, "pst": 3},
+        {"name": "HW 2", "base_grade": 0.5, "expected_grade": 0.7},
+    ]
+    bulk = GradingGroup.from_records("HW", 0.4, records, default_pst=4, expected_grade=0.8)
+    tasks = [
+        Task("HW 1", grade=0.9, base_grade=0.5, pst=3),
+        Task("HW 2", base_grade=0.5, expected_grade=0.7),
+    ]
+    group = GradingGroup("HW", 0.4, tasks=tasks, default_pst=4, expected_grade=0.8)
+
+    for method in ["get_contribution", "get_true_contribution", "get_expected_contribution"]:
+        assert getattr(bulk, method)() == pytest.approx(getattr(group, method)())
+    assert [task.pst for task in bulk.tasks] == [3, 4]
+    assert bulk.get_task("HW 2").grade is None
+
+    version = bulk.get_version()
+    bulk.get_task("HW 2").set_grade(1.0)
+    assert bulk.get_version() > version
+
+
+def test_from_arrays_reports_every_invalid_value() -> None:
+    with pytest.raises(ValueError, match="3 invalid values") as excinfo:
+        GradingGroup.from_arrays(
+            "Exams", 0.5, ["Midterm", "Final", 3], grades=[1.5, None, 0.5], psts=[2, -1, 1]
+        )
+    message = str(excinfo.value)
+    assert "'Midterm': grade 1.5" in message
+    assert "'Final': pst -1.0" in message
+    assert "task #3" in message
+
+    with pytest.raises(ValueError, match="grades has 1 values for 2 tasks"):
+        GradingGroup.from_arrays("Exams", 0.5, ["Midterm", "Final"], grades=[0.5])
@@ -0,0 +1,142 @@
+"""Tests for content hashes and the on-disk result cache."""
+
+import copy
+from functools import partial
+import os
+
+import pytest
+
+from gf.cache import (
+    ResultCache,
+    UncacheableError,
+    _function_token,
+    cache_key,
+    course_digest,
+    group_digest,
+)
+from gf.cli import records
+from tests.test_course import make_course
+
+
+def test_digests_are_stable_across_copies() -> None:
+    course = make_course()
+    clone = copy.deepcopy(course)
+    assert course_digest(course) == course_digest(clone)
+    assert course_digest(course) == course_digest(make_course())
+
+
+def test_task_change_only_invalidates_its_group() -> None:
+    course = make_course()
+    psets, final = course.grading_groups
+    before = (course_digest(course), group_digest(psets), group_digest(final))
+
+    psets.tasks[1].grade = 0.7
+    assert course_digest(course) != before[0]
+    assert group_digest(psets) != before[1]
+    assert group_digest(final) == before[2]
+
+    psets.tasks[1].grade = None
+    assert (course_digest(course), group_digest(psets), group_digest(final)) == before
+
+
+def test_group_settings_change_the_digest() -> None:
+    course = make_course()
+    before = course_digest(course)
+    course.grading_groups[0].base_grade = 0.6
+    assert course_digest(course) != before
+
+
+BONUS = 0.1
+# Default state of a grading function that can't be hashed
+OPAQUE_STATE = object()
+
+
+def bonus(tasks):
+    return BONUS
+
+
+def scaled(tasks, factor=1.0):
+    return factor * sum(task.get_effective_grade() for task in tasks) / len(tasks)
+
+
+def make_scaled(factor):
+    return lambda tasks: scaled(tasks, factor)
+
+
+def test_function_tokens_cover_the_state_functions_read(monkeypatch) -> None:
+    before = _function_token(bonus)
+    monkeypatch.setitem(bonus.__globals__, "BONUS", 0.2)
+    assert _function_token(bonus) != before
+
+    assert _function_token(make_scaled(1)) != _function_token(make_scaled(2))
+    assert _function_token(make_scaled(1)) == _function_token(make_scaled(1))
+    assert _function_token(partial(scaled, factor=1)) != _function_token(partial(scaled, factor=2))
+
+    class Weird:
+        def __call__(self, _tasks) -> float:
+            return 0.0
+
+    with pytest.raises(UncacheableError):
+        _function_token(Weird())
+
+
+def test_uncacheable_groups_have_no_cache_key(tmp_path) -> None:
+    course = make_course()
+    course.grading_groups[1].grading_function = lambda _tasks, _state=OPAQUE_STATE: 0.0
+    assert cache_key(course) is None
+    assert cache_key(course.grading_groups[0]) is not None
+
+    calls = []
+    cache = ResultCache(tmp_path)
+    for _ in range(2):
+        cache.get_or_compute("record", cache_key(course), lambda: calls.append(1))
+    assert len(calls) == 2
+
+
+def test_cache_key_includes_parts() -> None:
+    course = make_course()
+    assert cache_key(course, "panel", 80) == cache_key(course, "panel", 80)
+    assert cache_key(course, "panel", 80) != cache_key(course, "panel", 100)
+
+
+def test_result_cache_round_trip(tmp_path) -> None:
+    cache = ResultCache(tmp_path)
+    assert cache.get("record", "abc") is None
+    cache.put("record", "abc", {"grade": 0.5})
+    assert cache.get("record", "abc") == {"grade": 0.5}
+
+    calls = []
+    value = cache.get_or_compute("record", "abc", lambda: calls.append(1))
+    assert value == {"grade": 0.5}
+    assert not calls
+    assert cache.stats()["kinds"] == {"record": {"entries": 1, "bytes": 14}}
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path) -> None:
+    entry_size = len(b'"' + b"x" * 98 + b'"')
+    cache = ResultCache(tmp_path, max_bytes=3 * entry_size)
+    for i in range(3):
+        cache.put("text", str(i), "x" * 98)
+        os.utime(tmp_path / "text" / f"{i}.json", (i, i))
+    cache.get("text", "0")  # Now the most recently used
+
+    cache.put("text", "3", "x" * 98)  # Trims the cache to 80% of its maximum
+    assert cache.get("text", "1") is None
+    assert cache.get("text", "2") is None
+    assert cache.get("text", "0") is not None
+    assert cache.get("text", "3") is not None
+    assert cache.stats()["bytes"] <= 3 * entry_size
+
+    assert cache.clear() == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_cached_course_record_matches_course_record(tmp_path) -> None:
+    course = make_course()
+    cache = ResultCache(tmp_path)
+    assert records.cached_course_record(course, cache) == records.course_record(course)
+
+    course.grading_groups[1].tasks[0].grade = 0.9
+    assert records.cached_course_record(course, cache) == records.course_record(course)
+    # Only the changed group and the course were recomputed
+    assert cache.stats()["kinds"]["group"]["entries"] == 3
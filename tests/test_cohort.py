@@ -0,0 +1,67 @@
+"""Tests for out-of-core cohort evaluation."""
+
+from functools import partial
+import math
+
+import numpy as np
+import pytest
+
+from gf.cohort import evaluate_cohort, letter_distribution, resolve_cohort
+from gf.memory import measure
+from gf.synthetic import make_synthetic_course, write_columnar
+
+
+def test_cohort_results_match_course_methods(tmp_path) -> None:
+    course = make_synthetic_course(30, graded_fraction=0)
+    directory = write_columnar(course, tmp_path / "cohort", 500, seed=2).parent
+    matrix_path, columns = resolve_cohort(directory)
+    results = evaluate_cohort(course, matrix_path, tmp_path / "out.npy", columns, chunk_size=64)
+
+    grades = np.load(matrix_path)
+    for student in [0, 123, 499]:
+        scenario = course.scenario()
+        for name, grade in zip(columns, grades[student].tolist(), strict=True):
+            if not math.isnan(grade):
+                scenario.set_grade(name, grade)
+        row = results[student]
+        assert row["min_work_grade"] == pytest.approx(scenario.get_grade(), abs=1e-6)
+        assert row["expected_grade"] == pytest.approx(scenario.get_expected_grade(), abs=1e-6)
+        assert row["current_grade"] == pytest.approx(scenario.get_current_grade(), abs=1e-6)
+        assert row["letter_grade"] == scenario.get_letter_grade()
+    assert sum(letter_distribution(results).values()) == 500
+
+
+def test_cohort_reorders_columns(tmp_path) -> None:
+    course = make_synthetic_course(4, n_groups=2, graded_fraction=0)
+    names = [task.name for group in course.grading_groups for task in group.tasks]
+    np.save(tmp_path / "grades.npy", np.array([[1.0, 0.5, np.nan]], dtype=np.float32))
+    columns = [names[2], names[0], names[3]]
+
+    (row,) = evaluate_cohort(course, tmp_path / "grades.npy", tmp_path / "out.npy", columns)
+    scenario = course.scenario()
+    scenario.set_grade(names[2], 1.0)
+    scenario.set_grade(names[0], 0.5)
+    assert row["min_work_grade"] == pytest.approx(scenario.get_grade())
+
+    with pytest.raises(ValueError, match="Tasks not in"):
+        evaluate_cohort(course, tmp_path / "grades.npy", tmp_path / "out.npy", ["Nope"] * 3)
+
+
+def test_cohort_peak_memory_is_bounded_by_chunk_size(tmp_path) -> None:
+    course = make_synthetic_course(50)
+    peaks = []
+    for n_students in [2_000, 40_000]:
+        directory = write_columnar(course, tmp_path / str(n_students), n_students).parent
+        matrix_path, columns = resolve_cohort(directory)
+        allocation = measure(
+            partial(
+                evaluate_cohort,
+                course,
+                matrix_path,
+                tmp_path / f"{n_students}.npy",
+                columns,
+                chunk_size=1000,
+            )
+        )
+        peaks.append(allocation.peak)
+    assert peaks[1] < peaks[0] * 1.5
@@ -0,0 +1,68 @@
+"""Tests for compiled course evaluation plans."""
+
+import numpy as np
+import pytest
+
+from gf.classes import GradingGroup
+from gf.synthetic import make_synthetic_course
+from tests.test_course import make_course
+
+GRADE_METHODS = ["get_grade", "get_current_grade", "get_true_grade", "get_expected_grade"]
+
+
+def test_plan_matches_course_methods() -> None:
+    course = make_synthetic_course(200, graded_fraction=0.3)
+    course.grading_groups.append(
+        GradingGroup(
+            "Best of",
+            0.2,
+            tasks=3,
+            grading_function=lambda tasks: max(task.get_effective_grade() for task in tasks),
+        )
+    )
+    course.get_task("Best of #2").set_grade(0.7)
+    plan = course.compile()
+    grades = plan.grades_of(course)
+
+    assert len(plan.kernels) == 1
+    for method in GRADE_METHODS:
+        assert getattr(plan, method)(grades) == pytest.approx(getattr(course, method)())
+
+    # A matrix of grade vectors evaluates row by row
+    matrix = np.stack([grades, plan.grades_of(course, {"Group 1 #1": 0.0})])
+    assert plan.get_grade(matrix)[0] == pytest.approx(course.get_grade())
+
+
+def test_empty_groups_contribute_nothing() -> None:
+    course = make_course()
+    course.grading_groups.append(GradingGroup("Later", 0.2, tasks=[]))
+    course.grading_groups.append(GradingGroup("Dropped later", 0.1, tasks=[], drop_lowest=1))
+    plan = course.compile()
+    grades = plan.grades_of(course)
+
+    assert len(plan) == 3
+    assert plan.groups["Later"] == slice(3, 3)
+    for method in GRADE_METHODS:
+        assert getattr(plan, method)(grades) == pytest.approx(getattr(course, method)())
+
+
+def test_plan_is_reused_until_structure_changes() -> None:
+    course = make_course()
+    plan = course.compile()
+    course.get_task("Pset 2").set_grade(0.5)
+    assert course.compile() is plan
+
+    course.get_task("Pset 2").expected_grade = 0.1
+    assert course.compile() is not plan
+
+
+def test_sweep_matches_scenarios() -> None:
+    course = make_course()
+    plan = course.compile()
+    values = [0.0, 0.5, 1.0]
+    swept = plan.sweep(plan.grades_of(course), "Final #1", values)
+
+    for value, grade in zip(values, swept, strict=True):
+        scenario = course.scenario()
+        scenario.set_grade("Final #1", value)
+        assert grade == pytest.approx(scenario.get_grade())
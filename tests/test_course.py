@@ -0,0 +1,36 @@
+"""Tests for Course grade calculations."""
+
+from gf.classes import Course, GradingGroup, Task
+
+
+def make_course() -> Course:
+    return Course(
+        name="Test Course",
+        care_factor=1,
+        grading_groups=[
+            GradingGroup(
+                name="Psets",
+                weight=0.5,
+                tasks=[Task("Pset 1", grade=1.0), Task("Pset 2")],
+                base_grade=0.5,
+                expected_grade=0.9,
+            ),
+            GradingGroup(name="Final", weight=0.5, tasks=1, base_grade=0, expected_grade=0.8),
+        ],
+    )
+
+
+def test_letter_grade_uses_percent_boundaries() -> None:
+    course = make_course()
+    assert course.get_letter_grade(0.95) == "A"
+    assert course.get_letter_grade(0.85) == "B"
+    assert course.get_letter_grade(0.10) == "F"
+    # Min-work grade: 0.5 * (1.0 + 0.5) / 2 + 0 = 0.375
+    assert course.get_letter_grade() == "F"
+
+
+def test_current_grade_without_grades_is_a_float() -> None:
+    course = make_course()
+    course.get_task("Pset 1").grade = None
+    assert course.get_current_grade() == 0.0
+    assert isinstance(course.get_current_grade(), float)
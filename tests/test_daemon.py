@@ -0,0 +1,41 @@
+"""Tests for running CLI commands through the daemon."""
+
+import sys
+import types
+
+from rich.console import Console
+from rich.text import Text
+import typer
+
+from gf.classes.visualization import clear_render_cache
+from gf.cli import daemon, display
+from tests.test_course import make_course
+
+
+def test_cached_panels_render_at_the_client_width(monkeypatch) -> None:
+    course = make_course()
+    app = typer.Typer()
+
+    @app.callback()
+    def main() -> None:
+        pass
+
+    @app.command("course")
+    def show_course() -> None:
+        display.display_course_details(course)
+
+    # Stands in for the CLI module, whose course configs don't import here
+    cli = types.ModuleType("gf.cli.main")
+    cli.app, cli.console, cli.err_console = app, Console(), Console(stderr=True)
+    monkeypatch.setitem(sys.modules, "gf.cli.main", cli)
+
+    clear_render_cache()
+    for width in (137, 61, 137):
+        response = daemon.handle_request({"argv": ["course"], "width": width})
+        assert response["exit_code"] == 0, response["stderr"]
+        lines = response["stdout"].splitlines()
+        assert max(Text.from_ansi(line).cell_len for line in lines) == width
+
+    refused = daemon.handle_request({"argv": ["serve"]})
+    assert refused["exit_code"] == 2
+    assert "cannot be run" in refused["stderr"]
@@ -0,0 +1,140 @@
+"""Tests for grading groups that drop their lowest grades."""
+
+import copy
+import random
+
+import pytest
+
+from gf.classes import Course, CourseTemplate, GradingGroup, Task
+from gf.classes.grading_functions import drop_lowest_raw_grade
+from gf.classes.order_statistics import TopSum
+
+GRADE_METHODS = ["get_grade", "get_current_grade", "get_true_grade", "get_expected_grade"]
+
+
+def make_dropping_course(n: int = 8, drop: int = 2) -> Course:
+    return Course(
+        "Dropping",
+        1,
+        [
+            GradingGroup(
+                "Psets", 0.6, tasks=n, base_grade=0.3, expected_grade=0.8, drop_lowest=drop
+            ),
+            GradingGroup("Final", 0.4, tasks=1, base_grade=0, expected_grade=0.7),
+        ],
+    )
+
+
+def test_top_sum_matches_sorting() -> None:
+    rng = random.Random(0)
+    values: dict[int, float] = {}
+    top = TopSum(5)
+    for _ in range(2000):
+        key = rng.randrange(12)
+        if rng.random() < 0.2:
+            values.pop(key, None)
+            top.discard(key)
+        else:
+            values[key] = rng.random()
+            top.set(key, values[key])
+        assert top.total == pytest.approx(sum(sorted(values.values())[-5:]))
+    assert len(top) == len(values)
+
+
+def test_dropping_group_tracks_set_grade() -> None:
+    course = make_dropping_course()
+    psets = course.grading_groups[0]
+    order = psets._get_order()  # noqa: SLF001
+    rng = random.Random(1)
+    for _ in range(50):
+        task = rng.choice(psets.tasks)
+        task.set_grade(round(rng.random(), 2))
+        graded = [t.grade for t in psets.tasks if t.grade is not None]
+        effective = [t.grade if t.grade is not None else t.base_grade for t in psets.tasks]
+        assert psets.get_raw_contribution() == pytest.approx(drop_lowest_raw_grade(effective, 8, 2))
+        assert psets.get_current_contribution() == pytest.approx(
+            0.6 * drop_lowest_raw_grade(graded, 8, 2)
+        )
+    # Updated in place rather than rebuilt
+    assert psets._get_order() is order  # noqa: SLF001
+
+
+def test_dropping_group_notices_a_task_replaced_in_place() -> None:
+    course = make_dropping_course()
+    psets = course.grading_groups[0]
+    for task in psets.tasks:
+        task.set_grade(0.5)
+    assert psets.get_raw_contribution() == pytest.approx(0.5)
+
+    # Same number of tasks, and the group's own fields are untouched
+    replaced = psets.tasks[0]
+    psets.tasks[0] = Task("Psets #1", grade=1.0, base_grade=0.3, pst=5)
+    effective = [1.0] + [0.5] * 7
+    assert psets.get_raw_contribution() == pytest.approx(drop_lowest_raw_grade(effective, 8, 2))
+
+    # The replaced task no longer counts, the new one does
+    replaced.set_grade(0.0)
+    psets.tasks[0].set_grade(0.9)
+    effective[0] = 0.9
+    assert psets.get_raw_contribution() == pytest.approx(drop_lowest_raw_grade(effective, 8, 2))
+
+
+def test_plan_template_and_scenario_agree() -> None:
+    course = make_dropping_course()
+    for i, grade in enumerate([0.2, 1.0, 0.9], start=1):
+        course.get_task(f"Psets #{i}").set_grade(grade)
+    plan = course.compile()
+    student = CourseTemplate(course).instantiate(
+        {f"Psets #{i}": grade for i, grade in enumerate([0.2, 1.0, 0.9], start=1)}
+    )
+    for method in GRADE_METHODS:
+        expected = getattr(course, method)()
+        assert getattr(plan, method)(plan.grades_of(course)) == pytest.approx(expected)
+        assert getattr(student, method)() == pytest.approx(expected)
+
+    before = course.get_grade()
+    with course.scenario() as scenario:
+        scenario.set_grade("Psets #4", 0.0)
+        scenario.set_grade("Psets #5", 1.0)
+        assert course.get_grade() == before
+        assert scenario.get_grade() == pytest.approx(plan.get_grade(plan.grades_of(scenario)))
+    assert course.get_grade() == before
+
+
+def test_students_merge_touched_tasks_into_the_template_order() -> None:
+    rng = random.Random(2)
+
+    def make_course() -> Course:
+        tasks = [
+            Task(f"Pset {i}", base_grade=(i % 4) / 10, expected_grade=0.5 + (i % 3) / 10)
+            for i in range(12)
+        ]
+        return Course("Varied", 1, [GradingGroup("Psets", 1, tasks=tasks, drop_lowest=3)])
+
+    template = CourseTemplate(make_course())
+    for _ in range(30):
+        grades = {f"Pset {i}": rng.choice([0.0, 0.4, 0.8, 1.0]) for i in rng.sample(range(12), 5)}
+        student = template.instantiate(grades)
+        student.get_task(f"Pset {rng.randrange(12)}")  # Touched but not graded
+        course = make_course()
+        for name, grade in grades.items():
+            course.get_task(name).set_grade(grade)
+        for method in GRADE_METHODS:
+            assert getattr(student, method)() == pytest.approx(getattr(course, method)())
+        assert not student.is_materialized()
+
+
+def test_copies_track_their_own_tasks() -> None:
+    course = make_dropping_course(n=4, drop=1)
+    course.get_grade()
+    clone = copy.deepcopy(course)
+    clone.get_task("Psets #1").set_grade(1.0)
+    assert clone.get_grade() > course.get_grade()
+    assert Task("Alone")._listeners is None  # noqa: SLF001
+
+
+def test_drop_lowest_validation() -> None:
+    with pytest.raises(ValueError, match="non-negative"):
+        GradingGroup("Psets", 0.5, tasks=3, drop_lowest=-1)
+    with pytest.raises(ValueError, match="custom grading function"):
+        GradingGroup("Psets", 0.5, tasks=3, drop_lowest=1, grading_function=lambda _tasks: 1)
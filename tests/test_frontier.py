@@ -0,0 +1,55 @@
+"""Tests for the study hours versus grade frontier."""
+
+import pytest
+
+from gf.classes import build_frontier
+from tests.test_course import make_course
+
+
+def test_grade_frontier_works_on_best_mgph_first() -> None:
+    frontier = build_frontier([make_course()])
+    # Final: +0.5 in 5 hours, then Pset 2: +0.25 in 5 hours
+    assert [(point.hours, point.value) for point in frontier.points] == [
+        (0, pytest.approx(0.25)),
+        (5, pytest.approx(0.75)),
+        (10, pytest.approx(1.0)),
+    ]
+    assert [(segment.task, hours) for segment, hours in frontier.plan(7)] == [
+        ("Final #1", 5),
+        ("Pset 2", 2),
+    ]
+    assert frontier.at(7).value == pytest.approx(0.85)
+    assert frontier.at(100).value == pytest.approx(1.0)
+
+
+def test_gpa_frontier_points_at_boundary_crossings() -> None:
+    frontier = build_frontier([make_course()], metric="gpa")
+    assert [(point.hours, point.value) for point in frontier.points] == [
+        (0, 0),
+        (pytest.approx(3.5), 2),
+        (pytest.approx(4.5), 3),
+        (pytest.approx(6), 4),
+        (pytest.approx(8), 5),
+    ]
+    point = frontier.points[2]
+    assert frontier.step(point).task == "Final #1"
+    assert [hours for _, hours in frontier.plan(point)] == [pytest.approx(4.5)]
+
+    # Re-applying the plan to the course reaches the point's letter
+    course = make_course()
+    for segment, hours in frontier.plan(frontier.points[3]):
+        task = course.get_task(segment.task)
+        task.set_grade(task.base_grade + (1 - task.base_grade) * hours / task.pst)
+    assert course.get_letter_grade() == "B"
+
+
+def test_frontier_weights_courses_by_credits() -> None:
+    light, heavy = make_course(), make_course()
+    light.credits = 9
+    heavy.get_task("Final #1").set_grade(1.0)
+    frontier = build_frontier([heavy, light])
+    # Light's final gains 0.5 * 9 credits in 5 hours, heavy's Pset 2 only 0.25 * 12
+    assert [segment.course for segment in frontier.segments][:1] == [light]
+    assert frontier.points[-1].value == pytest.approx(1.0)
+    with pytest.raises(ValueError, match="happiness"):
+        build_frontier([light], metric="happiness")
@@ -0,0 +1,88 @@
+"""Tests for gradebook parsing and incremental watching."""
+
+import os
+
+import pytest
+
+from gf.gradebook import GradebookWatcher, apply_gradebook, read_gradebook
+from tests.test_course import make_course
+
+
+def test_read_gradebook_formats(tmp_path) -> None:
+    (tmp_path / "a.csv").write_text(
+        "course,task,grade\nTest Course,Pset 1,90\nTest Course,Pset 2,\n"
+    )
+    (tmp_path / "b.jsonl").write_text('{"course": "Test Course", "task": "Pset 1", "grade": 50}\n')
+
+    assert read_gradebook(tmp_path / "a.csv") == {
+        ("Test Course", "Pset 1"): 0.9,
+        ("Test Course", "Pset 2"): None,
+    }
+    assert read_gradebook(tmp_path / "b.jsonl") == {("Test Course", "Pset 1"): 0.5}
+
+
+def test_watcher_reports_only_changed_grades(tmp_path) -> None:
+    first = tmp_path / "first.csv"
+    second = tmp_path / "second.csv"
+    first.write_text("course,task,grade\nTest Course,Pset 1,90\n")
+    second.write_text("course,task,grade\nTest Course,Pset 2,80\n")
+
+    watcher = GradebookWatcher(tmp_path)
+    assert len(watcher.poll()) == 2
+    assert watcher.poll() == {}
+
+    first.write_text("course,task,grade\nTest Course,Pset 1,95\nTest Course,Final #1,\n")
+    stat = first.stat()
+    os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert watcher.poll() == {("Test Course", "Pset 1"): 0.95, ("Test Course", "Final #1"): None}
+
+
+def test_watcher_clears_removed_rows_and_deleted_files(tmp_path) -> None:
+    first = tmp_path / "first.csv"
+    second = tmp_path / "second.csv"
+    first.write_text("course,task,grade\nTest Course,Pset 1,90\nTest Course,Pset 2,80\n")
+    second.write_text("course,task,grade\nTest Course,Pset 2,70\nTest Course,Final #1,60\n")
+    watcher = GradebookWatcher(tmp_path)
+    watcher.poll()
+
+    first.write_text("course,task,grade\nTest Course,Pset 2,80\n")
+    stat = first.stat()
+    os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert watcher.poll() == {("Test Course", "Pset 1"): None}
+
+    # Pset 2 is still listed in the remaining file
+    first.unlink()
+    assert watcher.poll() == {("Test Course", "Pset 2"): 0.7}
+    second.unlink()
+    assert watcher.poll() == {("Test Course", "Pset 2"): None, ("Test Course", "Final #1"): None}
+
+
+def test_gradebooks_of_several_students_need_a_student(tmp_path) -> None:
+    path = tmp_path / "cohort.jsonl"
+    path.write_text(
+        '{"student": 1, "course": "Test Course", "task": "Pset 1", "grade": 50}\n'
+        '{"student": 2, "course": "Test Course", "task": "Pset 1", "grade": 90}\n'
+    )
+    with pytest.raises(ValueError, match="2 students"):
+        read_gradebook(path)
+    assert read_gradebook(path, student="2") == {("Test Course", "Pset 1"): 0.9}
+
+    assert GradebookWatcher(tmp_path).poll() == {}
+    assert GradebookWatcher(tmp_path, student="1").poll() == {("Test Course", "Pset 1"): 0.5}
+
+
+def test_apply_gradebook_only_touches_changed_courses() -> None:
+    course = make_course()
+    other = make_course()
+    other.name = "Other Course"
+    courses = {c.name: c for c in (course, other)}
+    other_version = other.get_version()
+
+    affected = apply_gradebook(
+        {("Test Course", "Pset 2"): 0.6, ("Test Course", "Pset 1"): 1.0}, courses.get
+    )
+
+    assert affected == [course]
+    assert course.get_task("Pset 2").grade == 0.6
+    assert other.get_version() == other_version
+    assert apply_gradebook({("Test Course", "Pset 2"): 0.6}, courses.get) == []
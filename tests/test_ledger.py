@@ -0,0 +1,103 @@
+"""Tests for the grade event ledger."""
+
+from itertools import pairwise
+import random
+import time
+
+import pytest
+
+from gf.ledger import GradeEvent, GradeLedger, apply_event, local_time
+from tests.test_course import make_course
+
+
+def random_events(n: int, seed: int = 0) -> list[GradeEvent]:
+    rng = random.Random(seed)
+    return [
+        GradeEvent(
+            timestamp=float(i // 2),  # Pairs of events share a timestamp
+            course=rng.choice(["A", "B"]),
+            task=f"Task {rng.randrange(5)}",
+            grade=None if rng.random() < 0.1 else round(rng.random(), 2),
+            student=rng.choice(["ann", "bob"]),
+        )
+        for i in range(n)
+    ]
+
+
+def replay(events: list[GradeEvent], until: float) -> dict:
+    state: dict = {}
+    for event in events:
+        if event.timestamp <= until:
+            apply_event(state, event)
+    return state
+
+
+def test_snapshots_match_full_replay(tmp_path) -> None:
+    events = random_events(100)
+    ledger = GradeLedger(tmp_path, snapshot_every=7)
+    for event in events[:60]:
+        ledger.append(event)
+    ledger.extend(events[60:])
+
+    # Snapshots are at least 7 events apart, and further once the state outgrows that
+    counts = [snapshot.events for snapshot in ledger.snapshots()]
+    assert counts
+    assert all(b - a >= 7 for a, b in pairwise([0, *counts]))
+    reopened = GradeLedger(tmp_path, snapshot_every=7)
+    assert reopened.state() == replay(events, float("inf"))
+    for until in [-1, 0, 3.5, 17, 30, 49, 60]:
+        assert reopened.state_at(until) == replay(events, until)
+    assert list(reopened.events(since=10, until=20)) == [
+        event for event in events if 10 < event.timestamp <= 20
+    ]
+
+
+def test_append_rejects_out_of_order_events(tmp_path) -> None:
+    ledger = GradeLedger(tmp_path)
+    ledger.append(GradeEvent(10.0, "A", "Task", 0.5))
+    with pytest.raises(ValueError, match="predates"):
+        ledger.append(GradeEvent(5.0, "A", "Task", 0.6))
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        ledger.append(GradeEvent(11.0, "A", "Task", 1.5))
+
+
+def test_truncated_event_is_ignored_and_overwritten(tmp_path) -> None:
+    ledger = GradeLedger(tmp_path)
+    ledger.append(GradeEvent(1.0, "A", "Task", 0.5))
+    with ledger.events_path.open("ab") as f:
+        f.write(b'{"timestamp": 2.0, "cou')  # Interrupted write
+
+    reopened = GradeLedger(tmp_path)
+    assert reopened.grades("A") == {"Task": 0.5}
+    reopened.append(GradeEvent(3.0, "A", "Task", 0.7))
+    assert GradeLedger(tmp_path).grades("A") == {"Task": 0.7}
+
+
+def test_course_at_reconstructs_grades_without_modifying_course(tmp_path) -> None:
+    course = make_course()
+    ledger = GradeLedger(tmp_path)
+    ledger.append(GradeEvent(1.0, course.name, "Pset 2", 0.8))
+    ledger.append(GradeEvent(2.0, course.name, "Final #1", 0.9))
+    ledger.append(GradeEvent(3.0, course.name, "Pset 2", None))
+
+    before = ledger.course_at(course, at=1.5)
+    assert before.get_task("Pset 2").grade == 0.8
+    assert before.get_task("Final #1").grade is None
+    now = ledger.course_at(course)
+    assert now.get_task("Pset 2").grade is None
+    assert now.get_task("Final #1").grade == 0.9
+    assert course.get_task("Final #1").grade is None
+
+
+def test_local_time_is_aware_and_keeps_the_instant(monkeypatch) -> None:
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        moment = local_time(1_700_000_000.5)
+        assert moment.utcoffset() is not None
+        assert moment.timestamp() == 1_700_000_000.5
+        assert moment.hour == 17  # 22:13 UTC
+        assert local_time().tzinfo is not None
+    finally:
+        monkeypatch.undo()
+        time.tzset()
@@ -0,0 +1,67 @@
+"""Tests for course config linting."""
+
+from gf import lint
+from gf.cache import ResultCache
+from gf.lint import Severity, check_course, lint_paths
+from tests.test_course import make_course
+
+GOOD_CONFIG = """
+from gf.classes import Course, GradingGroup
+
+course = Course("Good", 1, [GradingGroup("Psets", 0.4, tasks=2), GradingGroup("Final", 0.6, 1)])
+"""
+
+BAD_CONFIG = """
+from gf.classes import Course, GradingGroup
+
+course = Course("Bad", 1, [GradingGroup("Psets", 1.5, tasks=2)])
+"""
+
+
+def codes(issues: list[lint.LintIssue]) -> set[str]:
+    return {issue.code for issue in issues}
+
+
+def test_clean_course_has_no_issues() -> None:
+    assert check_course(make_course()) == []
+
+
+def test_weights_boundaries_and_fractions() -> None:
+    course = make_course()
+    course.grading_groups[0].weight = 0.6
+    course.grading_groups[1].expected_grade = 1.2
+    course.grading_boundaries = {**course.grading_boundaries, "B": (80, 89.9999)}
+
+    issues = check_course(course, "course.py")
+    assert codes(issues) == {"weights", "fraction", "boundary-gap"}
+    assert all(issue.severity == Severity.error for issue in issues)
+    gap = next(issue for issue in issues if issue.code == "boundary-gap")
+    assert "89.9999" in gap.message
+
+
+def test_lint_paths_reports_load_errors_and_uses_cache(tmp_path, monkeypatch) -> None:
+    configs = tmp_path / "configs"
+    configs.mkdir()
+    (configs / "good.py").write_text(GOOD_CONFIG)
+    (configs / "bad.py").write_text(BAD_CONFIG)
+    cache = ResultCache(tmp_path / "cache")
+
+    results = lint_paths([configs], cache=cache)
+    assert results[configs / "good.py"] == []
+    (load_error,) = results[configs / "bad.py"]
+    assert load_error.code == "load"
+    assert load_error.line == 4
+    assert "is_proper_fraction(weight)" in load_error.message
+
+    # Clean configs come from the cache, but ones that failed to load are loaded again
+    loaded = []
+    monkeypatch.setattr(lint, "lint_file", lambda path: loaded.append(path.name) or [])
+    again = lint_paths([configs], cache=cache)
+    assert loaded == ["bad.py"]
+    assert again[configs / "bad.py"] == []
+
+    # So is every config once gf itself changes
+    loaded.clear()
+    monkeypatch.setattr(lint, "_code_token", lambda: "changed")
+    lint_paths([configs], cache=cache)
+    assert sorted(loaded) == ["bad.py", "good.py"]
@@ -0,0 +1,65 @@
+"""Memory budgets for the course model (see gf.memory.MEMORY_BUDGETS)."""
+
+import pytest
+
+from gf.classes import Course, GradingGroup, Task
+from gf.classes.compiled import CompiledCourse
+from gf.cli import plotting, records
+from gf.memory import MEMORY_BUDGETS, deep_sizeof, measure, registry_footprint
+from gf.synthetic import make_synthetic_course
+
+SIZES = [100, 1_000, 10_000]
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_task_budget(n) -> None:
+    allocation = measure(lambda: [Task(f"Task {i}", base_grade=0.5, pst=2) for i in range(n)])
+    assert allocation.current / n <= MEMORY_BUDGETS["task"]
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_group_and_course_budgets(n) -> None:
+    groups = measure(lambda: [GradingGroup(f"Group {i}", 0.1, tasks=[]) for i in range(n)])
+    assert groups.current / n <= MEMORY_BUDGETS["group"]
+
+    courses = measure(lambda: [Course(f"Course {i}", 1, []) for i in range(n)])
+    assert courses.current / n <= MEMORY_BUDGETS["course"]
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_course_per_task_budget(n) -> None:
+    allocation = measure(lambda: make_synthetic_course(n))
+    assert allocation.current / n <= MEMORY_BUDGETS["course_per_task"]
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_compiled_plan_budget(n) -> None:
+    course = make_synthetic_course(n)
+    allocation = measure(lambda: CompiledCourse(course))
+    assert allocation.current / n <= MEMORY_BUDGETS["plan_per_task"]
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_summary_peak_budget(n) -> None:
+    course = make_synthetic_course(n)
+    allocation = measure(lambda: records.course_record(course))
+    assert allocation.peak / n <= MEMORY_BUDGETS["summary_peak_per_task"]
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_plot_peak_budget(n) -> None:
+    warm = make_synthetic_course(1)  # Lazy imports are not part of the budget
+    plotting.course_grade_sensitivity(warm, warm.grading_groups[0].tasks[0].name)
+    course = make_synthetic_course(n)
+    name = course.grading_groups[0].tasks[0].name
+    # The plan is compiled on the first plot, so its memory counts too
+    allocation = measure(lambda: plotting.course_grade_sensitivity(course, name))
+    assert allocation.peak / n <= MEMORY_BUDGETS["plot_peak_per_task"]
+
+
+def test_registry_footprint_counts_shared_objects_once() -> None:
+    course = make_synthetic_course(50)
+    (first, second) = registry_footprint([course, course])
+    assert first["tasks"] == 50
+    assert first["total_bytes"] == deep_sizeof(course)
+    assert second["total_bytes"] == 0
@@ -0,0 +1,27 @@
+"""Tests for the opt-in profiling hooks."""
+
+from gf import profiling
+from gf.classes import Course, GradingGroup
+from tests.test_course import make_course
+
+
+def test_profiling_records_stages_and_restores_methods() -> None:
+    original = Course.__dict__["get_grade"]
+    course = make_course()
+
+    with profiling.profile("test") as profiler:
+        assert Course.__dict__["get_grade"] is not original
+        grade = course.get_grade()
+
+    assert grade == make_course().get_grade()
+    assert Course.__dict__["get_grade"] is original
+    assert not any(
+        getattr(value, "__gf_profiled__", False) for value in vars(GradingGroup).values()
+    )
+
+    course_stats = profiler.stages["Course.get_grade"]
+    assert course_stats.calls == 1
+    assert profiler.stages["GradingGroup.get_contribution"].calls == 2
+    assert profiler.stages["grading.default_raw_grading_function"].calls == 2
+    assert course_stats.self_time <= course_stats.total
+    assert "test;Course.get_grade;GradingGroup.get_contribution" in " ".join(profiler.collapsed)
@@ -0,0 +1,52 @@
+"""Tests for what-if scenarios."""
+
+import pytest
+
+from gf.classes import compare_scenarios
+from tests.test_course import make_course
+
+
+def test_scenario_leaves_course_untouched() -> None:
+    course = make_course()
+    grade, version = course.get_grade(), course.get_version()
+
+    with course.scenario("Ace the final") as scenario:
+        scenario.set_grade("Final #1", 1.0)
+        assert scenario.get_grade() == pytest.approx(grade + 0.5)
+        assert scenario.deltas == {"Final #1": {"grade": 1.0}}
+
+    assert course.get_grade() == grade
+    assert course.get_version() == version
+    assert course.get_task("Final #1").grade is None
+    # Untouched groups are shared, touched ones are copied
+    assert scenario.grading_groups[0] is course.grading_groups[0]
+    assert scenario.grading_groups[1] is not course.grading_groups[1]
+
+
+def test_nested_scenarios_and_comparison() -> None:
+    course = make_course()
+    outer = course.scenario("Skip pset")
+    outer.set_grade("Pset 2", 0.0)
+    inner = outer.scenario("Skip pset, ace final")
+    inner.set_grade("Final #1", 1.0)
+    inner.update_task("Pset 1", grade=None)
+
+    assert outer.get_task("Final #1").grade is None
+    assert inner.deltas == {
+        "Pset 2": {"grade": 0.0},
+        "Final #1": {"grade": 1.0},
+        "Pset 1": {"grade": None},
+    }
+
+    records = compare_scenarios([course, outer, inner])
+    assert [record["scenario"] for record in records] == [
+        "Test Course",
+        "Skip pset",
+        "Skip pset, ace final",
+    ]
+    assert records[1]["min_work_grade"] == pytest.approx(0.25)
+    assert records[2]["min_work_grade"] == pytest.approx(0.5)
+    assert course.get_task("Pset 1").grade == 1.0
+
+    with pytest.raises(ValueError, match="Unknown task fields"):
+        inner.update_task("Pset 1", weight=1)
@@ -0,0 +1,89 @@
+"""Tests for deadline-aware study schedules."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from gf.classes import Course, CourseTemplate, GradingGroup, Task, build_schedule, schedule_courses
+from gf.classes.schedule import StudyItem, study_items
+
+MONDAY = date(2025, 9, 1)
+
+
+def make_course() -> Course:
+    return Course(
+        name="Scheduled",
+        care_factor=1,
+        grading_groups=[
+            GradingGroup(
+                "Psets",
+                0.4,
+                tasks=[
+                    Task("Pset 1", pst=3, due=MONDAY + timedelta(1)),
+                    Task("Pset 2", pst=3, due=MONDAY + timedelta(8), release=MONDAY + timedelta(3)),
+                    Task("Pset 3", grade=0.9, pst=3, due=MONDAY),
+                ],
+            ),
+            GradingGroup("Final", 0.6, tasks=[Task("Final", pst=6)]),
+        ],
+    )
+
+
+def test_earliest_due_date_first_within_daily_caps() -> None:
+    schedule = schedule_courses([make_course()], MONDAY, hours_per_day=2)
+
+    assert [(block.day - MONDAY).days for block in schedule.blocks[:4]] == [0, 1, 1, 2]
+    assert [block.item.task for block in schedule.blocks[:4]] == [
+        "Pset 1",
+        "Pset 1",
+        "Final",
+        "Final",
+    ]
+    assert all(hours <= 2 for hours in schedule.hours_by_day().values())
+    # Once released on Thursday, Pset 2 (due) goes before the final (not due)
+    finished = {item.task: day for item, day in schedule.finished.items()}
+    assert finished["Pset 1"] == MONDAY + timedelta(1)
+    assert finished["Pset 2"] == MONDAY + timedelta(4)
+    assert finished["Final"] == MONDAY + timedelta(5)
+    assert "Pset 3" not in finished  # Already graded
+    assert schedule.late == []
+    assert schedule.unscheduled == {}
+    assert sum(block.hours for block in schedule.blocks) == 12
+
+
+def test_ties_go_to_the_higher_marginal_grade_per_hour() -> None:
+    course = make_course()
+    (final,) = [item for item in study_items([course]) if item.task == "Final"]
+    due = MONDAY + timedelta(3)
+    cheap, dear = (
+        StudyItem(course, "Cheap", 1, rate=0.1, due=due),
+        StudyItem(course, "Dear", 1, rate=0.3, due=due),
+    )
+    schedule = build_schedule([final, cheap, dear], MONDAY, hours_per_day=1)
+    assert [block.item.task for block in schedule.blocks[:3]] == ["Dear", "Cheap", "Final"]
+
+
+def test_weekday_caps_days_off_and_late_tasks() -> None:
+    course = make_course()
+    # No work on weekends or on the first Tuesday
+    schedule = schedule_courses(
+        [course], MONDAY, [1, 1, 1, 1, 1, 0, 0], days_off={MONDAY + timedelta(1): 0}
+    )
+    worked = schedule.hours_by_day()
+    assert MONDAY + timedelta(1) not in worked
+    assert all(day.weekday() < 5 for day in worked)
+    assert [item.task for item in schedule.late] == ["Pset 1"]
+
+    short = schedule_courses([course], MONDAY, 1, until=MONDAY + timedelta(4))
+    assert sum(short.unscheduled.values()) == 12 - 5
+    with pytest.raises(ValueError, match="one per weekday"):
+        schedule_courses([course], MONDAY, [1, 1])
+    with pytest.raises(ValueError, match="some hours"):
+        schedule_courses([course], MONDAY, 0)
+
+
+def test_due_dates_survive_templates() -> None:
+    student = CourseTemplate(make_course()).instantiate()
+    assert student.get_task("Pset 2").due == MONDAY + timedelta(8)
+    assert student.get_task("Pset 2").release == MONDAY + timedelta(3)
+    assert Task("Untimed").due is None
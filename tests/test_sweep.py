@@ -0,0 +1,62 @@
+"""Tests for vectorized grading group assumption sweeps."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from gf.classes import GradingGroup
+from gf.sweep import SweepAxis, parse_axis, sweep_assumptions
+from tests.test_course import make_course
+
+
+def brute_force(course, axes, index):
+    """Evaluate one combination by updating the ungraded tasks of a scenario."""
+    scenario = course.scenario()
+    for axis, i in zip(axes, index, strict=True):
+        for task in course.compile().names:
+            group = course.get_parent(task)
+            if group.name == axis.group and course.get_task(task).grade is None:
+                scenario.update_task(task, **{axis.field: float(axis.values[i])})
+    return scenario
+
+
+def test_sweep_matches_scenarios() -> None:
+    course = make_course()
+    course.grading_groups.append(
+        GradingGroup(
+            "Best of",
+            0.1,
+            tasks=2,
+            grading_function=lambda tasks: max(task.get_effective_grade() for task in tasks),
+        )
+    )
+    course.grading_groups[1].weight = 0.4
+    axes = [
+        parse_axis("expected_grade", "Psets=0.5:1:3"),
+        parse_axis("expected_grade", "Final=0.2,0.9"),
+        parse_axis("base_grade", "Best of=0:1:4"),
+        parse_axis("base_grade", "Psets=0.25,0.75"),
+    ]
+    result = sweep_assumptions(course, axes)
+    assert result.shape == (3, 2, 4, 2)
+
+    for index in itertools.product(*(range(n) for n in result.shape)):
+        scenario = brute_force(course, axes, index)
+        assert result.min_work_grade[index] == pytest.approx(scenario.get_grade())
+        assert result.expected_grade[index] == pytest.approx(scenario.get_expected_grade())
+        assert result.letters()[index] == scenario.get_letter_grade()
+    assert len(list(result.records())) == 48
+
+
+def test_sweep_validates_axes() -> None:
+    course = make_course()
+    values = np.array([0.5])
+    with pytest.raises(ValueError, match="not in"):
+        sweep_assumptions(course, [SweepAxis("Labs", "base_grade", values)])
+    with pytest.raises(ValueError, match="more than once"):
+        sweep_assumptions(course, [SweepAxis("Psets", "base_grade", values)] * 2)
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        sweep_assumptions(course, [SweepAxis("Psets", "base_grade", np.array([2.0]))])
+    with pytest.raises(ValueError, match="Expected GROUP"):
+        parse_axis("base_grade", "0:1:3")
@@ -0,0 +1,49 @@
+"""Tests for synthetic course generation."""
+
+import csv
+
+import numpy as np
+
+from gf.gradebook import read_gradebook
+from gf.synthetic import DatasetFormat, generate_dataset, make_synthetic_course
+
+
+def test_synthetic_course_size_and_grades() -> None:
+    course = make_synthetic_course(103, n_groups=5, graded_fraction=0.5)
+
+    tasks = [task for group in course.grading_groups for task in group.tasks]
+    assert len(tasks) == 103
+    assert len(course.grading_groups) == 5
+    assert abs(sum(group.weight for group in course.grading_groups) - 1) < 1e-9
+    graded = sum(task.grade is not None for task in tasks)
+    assert 45 <= graded <= 58
+
+
+def test_synthetic_course_is_reproducible() -> None:
+    first = make_synthetic_course(50, seed=3)
+    second = make_synthetic_course(50, seed=3)
+    assert first.get_grade() == second.get_grade()
+    assert first.get_expected_grade() == second.get_expected_grade()
+
+
+def test_generated_dataset_is_reproducible_across_formats(tmp_path) -> None:
+    template = make_synthetic_course(20, n_groups=4)
+
+    columnar = list(generate_dataset([template], tmp_path / "npy", 3, 50, seed=7, progress=0.6))
+    again = list(generate_dataset([template], tmp_path / "again", 3, 50, seed=7, progress=0.6))
+    assert len(columnar) == 3
+    matrix = np.load(columnar[1] / "grades.npy")
+    assert matrix.shape == (50, 20)
+    assert np.array_equal(matrix, np.load(again[1] / "grades.npy"), equal_nan=True)
+    assert 0 < np.isnan(matrix).mean() < 1
+
+    (path, *_) = generate_dataset(
+        [template], tmp_path / "csv", 3, 50, fmt=DatasetFormat.csv, seed=7, progress=0.6
+    )
+    with path.open() as f:
+        rows = [row for row in csv.DictReader(f) if row["student"] == "1"]
+    first = np.load(columnar[0] / "grades.npy")[0]
+    assert [float(row["grade"]) for row in rows] == [
+        round(float(g) * 100, 1) for g in first if not np.isnan(g)
+    ]
+    assert len(read_gradebook(path, student="1")) == len(rows)
@@ -0,0 +1,68 @@
+"""Tests for shared course templates and per-student overlays."""
+
+import pytest
+
+from gf.classes import CourseTemplate, GradingGroup
+from gf.memory import measure
+from gf.synthetic import make_synthetic_course
+from tests.test_course import make_course
+
+GRADE_METHODS = ["get_grade", "get_current_grade", "get_true_grade", "get_expected_grade"]
+
+
+def test_student_course_matches_full_course() -> None:
+    template = CourseTemplate(make_course())
+    student = template.instantiate({"Pset 1": 1.0, "Pset 2": 0.7, "Final #1": 0.6})
+
+    course = make_course()
+    course.get_task("Pset 2").set_grade(0.7)
+    course.get_task("Final #1").set_grade(0.6)
+    for method in GRADE_METHODS:
+        assert getattr(student, method)() == pytest.approx(getattr(course, method)())
+    assert student.get_letter_grade() == course.get_letter_grade()
+
+    # Materializing (as the display code does) gives the same numbers
+    assert not student.is_materialized()
+    assert len(student.grading_groups) == 2
+    for method in GRADE_METHODS:
+        assert getattr(student, method)() == pytest.approx(getattr(course, method)())
+
+
+def test_students_do_not_share_grades() -> None:
+    template = CourseTemplate(make_synthetic_course(100, graded_fraction=0))
+    first = template.instantiate({"Group 1 #1": 1.0})
+    second = template.instantiate()
+    version = second.get_version()
+
+    first.get_task("Group 2 #3").set_grade(0.2)
+    assert second.get_grade() == pytest.approx(template.base_grade)
+    assert second.get_current_grade() == 0
+    assert second.get_version() == version
+    assert first.get_current_grade() > 0
+    assert len(first._tasks) == 2  # noqa: SLF001
+
+
+def test_custom_grading_function_falls_back_to_tasks() -> None:
+    course = make_course()
+    course.grading_groups.append(
+        GradingGroup(
+            "Best",
+            0.1,
+            tasks=2,
+            grading_function=lambda tasks: max(task.grade or 0 for task in tasks),
+        )
+    )
+    template = CourseTemplate(course)
+    student = template.instantiate({"Pset 1": 1.0, "Best #2": 0.9})
+    course.get_task("Best #2").set_grade(0.9)
+    assert student.get_grade() == pytest.approx(course.get_grade())
+    assert student.get_true_grade() == pytest.approx(course.get_true_grade())
+
+
+def test_students_are_much_smaller_than_copies() -> None:
+    template = CourseTemplate(make_synthetic_course(200, graded_fraction=0))
+    grades = {f"Group 1 #{i}": 0.8 for i in range(1, 6)}
+
+    students = measure(lambda: [template.instantiate(grades) for _ in range(200)])
+    copies = measure(lambda: [make_synthetic_course(200, graded_fraction=0) for _ in range(200)])
+    assert students.current * 10 < copies.current
@@ -0,0 +1,61 @@
+"""Tests for the term GPA engine."""
+
+import numpy as np
+import pytest
+
+from gf.classes import Term, get_cumulative_gpa
+from gf.cohort import RESULT_DTYPE, cohort_gpa
+from tests.test_course import make_course
+
+
+def test_term_gpa_weights_courses_by_credits() -> None:
+    light, heavy = make_course(), make_course()
+    light.credits = 6
+    heavy.get_task("Final #1").set_grade(1.0)
+    term = Term("Fall", [light, heavy])
+
+    assert term.get_letters(light) == {
+        "no_work": "F",
+        "current": "F",
+        "min_work": "F",
+        "expected": "B",
+    }
+    assert term.get_letters(heavy)["min_work"] == "C"
+    assert term.get_credits() == 18
+    gpa = term.get_gpa()
+    assert gpa["min_work"] == pytest.approx(12 * 3 / 18)
+    assert gpa["expected"] == pytest.approx((6 * 4 + 12 * 5) / 18)
+
+
+def test_term_only_recomputes_changed_courses() -> None:
+    courses = [make_course() for _ in range(3)]
+    term = Term("Fall", courses)
+    assert term.refresh() == 3
+    assert term.refresh() == 0
+
+    courses[1].get_task("Final #1").set_grade(1.0)
+    assert term.refresh() == 1
+    assert term.get_gpa()["min_work"] == pytest.approx(1.0)
+
+
+def test_cumulative_gpa_includes_prior_credits() -> None:
+    term = Term("Fall", [make_course()])
+    cumulative = get_cumulative_gpa([term], prior_credits=36, prior_gpa=5.0)
+    assert cumulative["min_work"] == pytest.approx(36 * 5 / 48)
+    assert cumulative["expected"] == pytest.approx((36 * 5 + 12 * 4) / 48)
+    assert get_cumulative_gpa([]) == dict.fromkeys(cumulative, 0.0)
+
+
+def test_cohort_gpa_matches_term(tmp_path) -> None:
+    first, second = make_course(), make_course()
+    second.credits = 6
+    results = [np.zeros(3, dtype=RESULT_DTYPE) for _ in range(2)]
+    for result, grades in zip(results, [[0.95, 0.85, 0.1], [0.85, 0.1, 0.95]], strict=True):
+        for field in ["current_grade", "expected_grade", "min_work_grade", "no_work_grade"]:
+            result[field] = grades
+
+    gpa = cohort_gpa([first, second], results, tmp_path / "gpa.npy", chunk_size=2)
+    np.testing.assert_allclose(gpa["min_work"], [(60 + 24) / 18, 48 / 18, 30 / 18])
+    np.testing.assert_array_equal(gpa["expected"], gpa["no_work"])
+    with pytest.raises(ValueError, match="one result array per course"):
+        cohort_gpa([first], results, tmp_path / "gpa.npy")
@@ -0,0 +1,51 @@
+"""Tests for model version stamps and the render cache."""
+
+from gf.classes import GradingGroup, Task
+from gf.classes.visualization import _render_cache, clear_render_cache
+from tests.test_course import make_course
+
+
+def test_set_grade_bumps_version_but_not_structure() -> None:
+    course = make_course()
+    version = course.get_version()
+    structure_version = course.get_structure_version()
+
+    course.get_task("Pset 2").set_grade(0.7)
+
+    assert course.get_version() > version
+    assert course.get_structure_version() == structure_version
+
+
+def test_structural_edits_bump_structure_version() -> None:
+    course = make_course()
+    group = course.grading_groups[0]
+    structure_version = course.get_structure_version()
+
+    group.add_task(Task("Pset 3"))
+    assert course.get_structure_version() > structure_version
+    assert group.get_task("Pset 3").pst == group.default_pst
+
+    structure_version = course.get_structure_version()
+    group.remove_task("Pset 3")
+    assert course.get_structure_version() > structure_version
+
+
+def test_render_cache_reuses_and_invalidates() -> None:
+    clear_render_cache()
+    course = make_course()
+
+    first = str(course)
+    assert str(course) == first
+    assert len(_render_cache) == 1
+
+    course.get_task("Pset 2").set_grade(1.0)
+    assert str(course) != first
+    assert len(_render_cache) == 2
+
+
+def test_group_string_is_cached() -> None:
+    clear_render_cache()
+    group = GradingGroup(name="Labs", weight=0.5, tasks=3)
+    str(group)
+    str(group)
+    assert len(_render_cache) == 1